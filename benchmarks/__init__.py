@@ -0,0 +1 @@
+"""FlowUnify telemetry benchmarks."""
@@ -0,0 +1,191 @@
+"""Signals emitted from an asyncio application, shipped to Loki by threads or by the event loop itself.
+
+Coroutines emit signals a few at a time while a ticker task measures how late the event loop wakes it up. Both the
+synchronous `LokiShipper` and the `AsyncLokiShipper` push to a local asyncio fake Loki speaking keep-alive HTTP/1.1.
+The benchmark reports the emission cost, the event loop lag, the pushes and connections, and checks that every line
+arrived.
+
+Usage:
+    PYTHONPATH=src python -m benchmarks.aio [signals] [tasks]
+"""
+
+import asyncio
+import gzip
+import json
+import sys
+import threading
+import time
+from typing import Any
+
+from benchmarks.common import report
+from benchmarks.suite import redirect_stdout
+from telemetry import AsyncSignals, LoggerLevel, Signals, SignalsConfig
+from telemetry.aio import AsyncLokiShipper
+from telemetry.shipping import BatchShipper, LokiShipper
+from telemetry.stats import Histogram
+
+TICK_SECONDS = 0.001
+SIGNALS_PER_WAIT = 5
+SHIPPER_OPTIONS: dict[str, Any] = {"queue_size": 100_000, "batch_size": 500, "flush_interval": 0.05}
+
+
+class AsyncFakeLoki:
+    """Loki push endpoint served by asyncio streams, recording the lines pushed to it.
+
+    It runs its own event loop on a thread, so that decoding the pushes does not count as lag of the application loop.
+    """
+
+    def __init__(self) -> None:
+        """Initializes the endpoint; `start` binds it to a free local port."""
+        self.lines: list[dict[str, Any]] = []
+        self.pushes = 0
+        self.connections = 0
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="async-fake-loki", daemon=True)
+        self._server: asyncio.Server | None = None
+        self._writers: set[asyncio.StreamWriter] = set()
+
+    @property
+    def url(self) -> str:
+        """Returns the push endpoint URL."""
+        if self._server is None:
+            msg = "The endpoint is not started."
+            raise RuntimeError(msg)
+        host, port = self._server.sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}/loki/api/v1/push"
+
+    def start(self) -> None:
+        """Starts serving."""
+        self._thread.start()
+        self._server = asyncio.run_coroutine_threadsafe(
+            asyncio.start_server(self._serve, "127.0.0.1", 0), self._loop
+        ).result()
+
+    def stop(self) -> None:
+        """Stops serving."""
+        asyncio.run_coroutine_threadsafe(self._close(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+    async def _close(self) -> None:
+        """Closes the server and its connections."""
+        if self._server is not None:
+            self._server.close()
+            for writer in self._writers:
+                writer.close()
+            await self._server.wait_closed()
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Answers the pushes of a connection until the client closes it."""
+        self.connections += 1
+        self._writers.add(writer)
+        try:
+            while request_line := await reader.readline():
+                headers: dict[str, str] = {}
+                while (line := await reader.readline()) not in {b"\r\n", b""}:
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", "0")))
+                if request_line.startswith(b"POST "):
+                    self.record(body)
+                writer.write(b"HTTP/1.1 204 No Content\r\n\r\n")
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+    def record(self, body: bytes) -> None:
+        """Records the lines of a push."""
+        self.pushes += 1
+        payload = json.loads(gzip.decompress(body) if body[:2] == b"\x1f\x8b" else body)
+        for stream in payload["streams"]:
+            self.lines.extend(json.loads(line) for _, line in stream["values"])
+
+
+async def tick(lag: Histogram, stop: asyncio.Event) -> None:
+    """Sleeps in short ticks, recording how late the event loop wakes the task up, in nanoseconds."""
+    while not stop.is_set():
+        expected = time.perf_counter_ns() + int(TICK_SECONDS * 1e9)
+        await asyncio.sleep(TICK_SECONDS)
+        lag.record(max(0, time.perf_counter_ns() - expected))
+
+
+async def emit(signals: Signals, task: int, count: int) -> None:
+    """Emits signals from a coroutine, a few at a time between short waits, as a request handler would."""
+    for index in range(count):
+        signals.info("Order processed.", task=task, index=index, payload="x" * 200)
+        if index % SIGNALS_PER_WAIT == SIGNALS_PER_WAIT - 1:
+            await asyncio.sleep(TICK_SECONDS)
+
+
+async def scenario(name: str, count: int, tasks: int) -> dict[str, float]:
+    """Emits `count` signals from `tasks` coroutines and ships them with the shipper of the scenario."""
+    loki = AsyncFakeLoki()
+    loki.start()
+    config = SignalsConfig(
+        app_name="benchmark",
+        environment="benchmark",
+        log_from_level=1_000,
+        loki_log_from_level=1_000,
+        use_singleton_design_pattern=False,
+    )
+    labels = {"application": "benchmark", "environment": "benchmark"}
+    with redirect_stdout():
+        signals = AsyncSignals(config) if name == "async" else Signals(config)
+    shipper: BatchShipper[Any]
+    if name == "async":
+        shipper = AsyncLokiShipper(loki.url, labels, ("level",), **SHIPPER_OPTIONS)
+    else:
+        # the synchronous shipper pushes from its worker thread through the Loki client, one connection per push
+        shipper = LokiShipper(loki.url, labels, ("level",), **SHIPPER_OPTIONS)
+    sink_id = signals.add_sink(shipper, level=LoggerLevel.INFO, format="{message}", catch=True)
+
+    lag = Histogram()
+    stop = asyncio.Event()
+    ticker = asyncio.create_task(tick(lag, stop))
+    await asyncio.sleep(0.05)
+    start = time.perf_counter()
+    await asyncio.gather(*(emit(signals, task, count // tasks) for task in range(tasks)))
+    emit_elapsed = time.perf_counter() - start
+    if isinstance(shipper, AsyncLokiShipper):
+        delivered = await shipper.drain_async(timeout=60)
+    else:
+        delivered = await asyncio.to_thread(shipper.drain, 60)
+    ship_elapsed = time.perf_counter() - start
+    stop.set()
+    await ticker
+    signals.remove_sink(sink_id)
+    if isinstance(shipper, AsyncLokiShipper):
+        await shipper.aclose()
+    if isinstance(signals, AsyncSignals):
+        await signals.aclose()
+    loki.stop()
+
+    lag_ms = lag.summary(1e-6)
+    emitted = count // tasks * tasks
+    return {
+        "emit us/signal": emit_elapsed / emitted * 1e6,
+        "emitted and shipped, ms": ship_elapsed * 1e3,
+        "loop lag p50, ms": lag_ms["p50"],
+        "loop lag p99, ms": lag_ms["p99"],
+        "loop lag max, ms": lag_ms["max"],
+        "pushes": loki.pushes,
+        "connections": loki.connections,
+        "lines delivered": len(loki.lines),
+        "delivered everything": float(delivered and len(loki.lines) == emitted),
+    }
+
+
+def main() -> None:
+    """Runs the benchmark."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    tasks = int(sys.argv[2]) if len(sys.argv) > 2 else 10  # noqa: PLR2004
+    for name, title in {"sync": "Signals + LokiShipper", "async": "AsyncSignals + AsyncLokiShipper"}.items():
+        report(f"{title}, {count:,} signals from {tasks} tasks", asyncio.run(scenario(name, count, tasks)), unit="")
+
+
+if __name__ == "__main__":
+    main()
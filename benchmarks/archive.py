@@ -0,0 +1,94 @@
+"""Columnar archive compared with JSON lines, for the size on disk and the time to scan two columns back.
+
+Usage:
+    PYTHONPATH=src python -m benchmarks.archive [signals]
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.common import report
+from telemetry import ArchiveFormat, LoggerLevel, Signals, SignalsConfig
+from telemetry.archive import ArchiveSink, read_archive
+
+LEVELS = ("info", "debug", "warning", "business")
+
+
+def build_signals() -> Signals:
+    """Builds a Signals instance whose own sinks discard everything."""
+    stdout = sys.stdout
+    with open(os.devnull, "w") as devnull:  # noqa: PTH123
+        sys.stdout = devnull
+        signals = Signals(
+            SignalsConfig(
+                app_name="benchmark", environment="benchmark", log_from_level=1_000, loki_log_from_level=1_000
+            )
+        )
+        sys.stdout = stdout
+    return signals
+
+
+def emit(signals: Signals, count: int) -> float:
+    """Emits `count` signals spread over a few steps and returns the elapsed time in seconds."""
+    start = time.perf_counter()
+    for index in range(count):
+        if index % 1_000 == 0:
+            signals.step(title=f"step {index // 1_000}")
+        getattr(signals, LEVELS[index % len(LEVELS)])("row processed", row=index, rows_per_second=index * 1.5)
+    return time.perf_counter() - start
+
+
+def directory_size(directory: Path) -> int:
+    """Returns the size, in bytes, of the files of a directory."""
+    return sum(path.stat().st_size for path in directory.iterdir())
+
+
+def main() -> None:
+    """Runs the benchmark."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    signals = build_signals()
+    results: dict[str, float] = {}
+    # every thousand signals a step is started, which emits one more signal
+    expected = count + (count + 999) // 1_000
+
+    with tempfile.TemporaryDirectory() as root:
+        json_lines = Path(root) / "signals.jsonl"
+        sink_id = signals.add_sink(
+            json_lines, level=LoggerLevel.DEBUG, serialize=True, enqueue=True, format="{message}"
+        )
+        elapsed = emit(signals, count)
+        signals.remove_sink(sink_id)
+        results["json lines: emit us/signal"] = elapsed / count * 1e6
+        results["json lines: MiB on disk"] = json_lines.stat().st_size / 2**20
+        start = time.perf_counter()
+        with json_lines.open() as lines:
+            scanned = [
+                (record["record"]["level"]["name"], record["record"]["extra"]["job_uuid"])
+                for record in map(json.loads, lines)
+            ]
+        results["json lines: scan level, job_uuid (ms)"] = (time.perf_counter() - start) * 1e3
+        assert len(scanned) == expected
+
+        for archive_format in ArchiveFormat:
+            directory = Path(root) / str(archive_format)
+            sink = ArchiveSink(directory, archive_format=archive_format, max_file_bytes=2 * 2**20)
+            sink_id = signals.add_sink(sink, level=LoggerLevel.DEBUG, format="{message}")
+            elapsed = emit(signals, count)
+            signals.remove_sink(sink_id)
+            results[f"{archive_format}: emit us/signal"] = elapsed / count * 1e6
+            results[f"{archive_format}: MiB on disk"] = directory_size(directory) / 2**20
+            results[f"{archive_format}: files"] = len(sink.files)
+            start = time.perf_counter()
+            frame = read_archive(directory, columns=["level", "job_uuid"])
+            results[f"{archive_format}: scan level, job_uuid (ms)"] = (time.perf_counter() - start) * 1e3
+            assert len(frame) == expected
+
+    report(f"Archive of {count:,} signals", results, unit="")
+
+
+if __name__ == "__main__":
+    main()
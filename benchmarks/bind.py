@@ -0,0 +1,54 @@
+"""Signals carrying the same context fields, passed on every call or bound once with `bind`.
+
+Usage:
+    PYTHONPATH=src python -m benchmarks.bind
+"""
+
+import os
+import sys
+from typing import TYPE_CHECKING
+
+from benchmarks.common import report, time_per_call
+from telemetry import LoggerLevel, Signals, SignalsConfig
+
+if TYPE_CHECKING:
+    from loguru import Message
+
+CONTEXT = {"dataset": "orders", "source": "warehouse", "partition": "2026-10-01", "tenant": "acme"}
+
+
+def main() -> None:
+    """Runs the benchmark."""
+    stdout = sys.stdout
+    with open(os.devnull, "w") as devnull:  # noqa: PTH123
+        sys.stdout = devnull
+        signals = Signals(
+            SignalsConfig(
+                app_name="benchmark", environment="benchmark", log_from_level=1_000, loki_log_from_level=1_000
+            )
+        )
+        sys.stdout = stdout
+
+    def discard(message: "Message") -> None:
+        pass
+
+    signals.add_sink(discard, level=LoggerLevel.INFO, format="{message}")
+    bound = signals.bind(**CONTEXT)
+    nested = signals.bind(dataset="orders", source="warehouse").bind(partition="2026-10-01", tenant="acme")
+
+    results = {
+        "bind() of 4 fields": time_per_call(lambda: signals.bind(**CONTEXT), number=10_000),
+        "bind() of 2 fields on a view": time_per_call(lambda: bound.bind(rows=1, batch=2), number=10_000),
+        "info() with 4 context kwargs": time_per_call(
+            lambda: signals.info("row", **CONTEXT, rows=10), number=2_000, repeat=15
+        ),
+        "info() on a bound view": time_per_call(lambda: bound.info("row", rows=10), number=2_000, repeat=15),
+        "info() on a nested bound view": time_per_call(lambda: nested.info("row", rows=10), number=2_000, repeat=15),
+        "filtered debug() with 4 context kwargs": time_per_call(lambda: signals.debug("row", **CONTEXT, rows=10)),
+        "filtered debug() on a bound view": time_per_call(lambda: bound.debug("row", rows=10)),
+    }
+    report("Context fields, per call or bound", results)
+
+
+if __name__ == "__main__":
+    main()
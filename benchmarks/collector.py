@@ -0,0 +1,80 @@
+"""Worker processes forwarding their signals to a collector owning the sinks of the parent process.
+
+Each worker emits the same number of signals under a step inherited from the parent. The benchmark reports the
+end-to-end throughput, from the pool start until the collector has emitted every signal, and checks that every
+signal kept the job and group of the parent.
+
+Usage:
+    PYTHONPATH=src python -m benchmarks.collector [signals per worker]
+"""
+
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, Any
+
+from benchmarks.common import report
+from telemetry import LoggerLevel, Signals, SignalsCollector, SignalsConfig, worker_signals
+
+if TYPE_CHECKING:
+    from loguru import Message
+
+WORKER_COUNTS = (1, 8, 32)
+
+
+def work(signals_per_worker: int) -> None:
+    """Emits signals from a worker process."""
+    signals = worker_signals()
+    for index in range(signals_per_worker):
+        signals.info("processing", index=index)
+
+
+def run(signals: Signals, workers: int, signals_per_worker: int) -> float:
+    """Runs a pool of workers and returns the elapsed time, in seconds, until every signal was collected."""
+    start = time.perf_counter()
+    with SignalsCollector(signals) as collector:
+        with ProcessPoolExecutor(workers, initializer=worker_signals, initargs=(collector.handle(),)) as pool:
+            list(pool.map(work, [signals_per_worker] * workers))
+        collector.stop(timeout=None)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    """Runs the benchmark."""
+    signals_per_worker = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+
+    stdout = sys.stdout
+    with open(os.devnull, "w") as devnull:  # noqa: PTH123
+        sys.stdout = devnull
+        signals = Signals(
+            SignalsConfig(
+                app_name="benchmark", environment="benchmark", log_from_level=1_000, loki_log_from_level=1_000
+            )
+        )
+        sys.stdout = stdout
+
+    records: list[dict[str, Any]] = []
+
+    def capture(message: "Message") -> None:
+        records.append(message.record["extra"])
+
+    signals.add_sink(capture, level=LoggerLevel.INFO, filter=lambda record: "worker_pid" in record["extra"])
+    with signals.step(title="collector benchmark"):
+        step_uuid = signals.step_uuid
+        results: dict[str, float] = {}
+        for workers in WORKER_COUNTS:
+            records.clear()
+            elapsed = run(signals, workers, signals_per_worker)
+            misattributed = sum(
+                extra["parent_uuid"] != step_uuid or extra["job_uuid"] != signals.job_uuid for extra in records
+            )
+            results[f"{workers:>2} workers: signals per second"] = len(records) / elapsed
+            results[f"{workers:>2} workers: signals collected"] = len(records)
+            results[f"{workers:>2} workers: misattributed signals"] = misattributed
+
+    report(f"Collector mode, {signals_per_worker:,} signals per worker on {os.cpu_count()} CPUs", results, unit="")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,24 @@
+"""Helpers shared by the benchmarks."""
+
+import sys
+import timeit
+from collections.abc import Callable
+
+
+def time_per_call(function: Callable[[], object], number: int = 100_000, repeat: int = 5) -> float:
+    """Returns the best observed time, in nanoseconds, of a single call to `function`.
+
+    Args:
+        function: Callable to measure.
+        number: Calls per measurement.
+        repeat: Number of measurements. The fastest one is kept to reduce scheduling noise.
+    """
+    return min(timeit.repeat(function, number=number, repeat=repeat)) / number * 1e9
+
+
+def report(title: str, results: dict[str, float], unit: str = "ns/call") -> None:
+    """Writes a benchmark result table to stdout."""
+    width = max(len(name) for name in results)
+    sys.stdout.write(f"\n{title}\n")
+    for name, value in results.items():
+        sys.stdout.write(f"  {name:<{width}}  {value:>12,.1f} {unit}\n")
@@ -0,0 +1,96 @@
+"""Thousands of asyncio tasks sharing one Signals instance, each with its own process/task/step hierarchy.
+
+Every coroutine starts a process, a task and a step, yielding to the event loop in between, then emits signals. The
+benchmark checks that every record is linked to the group started by its own coroutine and reports the throughput.
+
+Usage:
+    PYTHONPATH=src python -m benchmarks.concurrent_groups [coroutines]
+"""
+
+import asyncio
+import os
+import sys
+import time
+from typing import TYPE_CHECKING, Any
+
+from benchmarks.common import report
+from telemetry import LoggerLevel, Signals, SignalsConfig
+
+if TYPE_CHECKING:
+    from loguru import Message
+
+SIGNALS_PER_COROUTINE = 5
+
+
+async def pipeline(signals: Signals, worker: int) -> None:
+    """Starts a process/task/step hierarchy and emits signals under it."""
+    signals.process(title=f"process {worker}", summary="benchmark", worker=worker)
+    await asyncio.sleep(0)
+    signals.task(title=f"task {worker}", summary="benchmark", worker=worker)
+    await asyncio.sleep(0)
+    signals.step(title=f"step {worker}", worker=worker)
+    for index in range(SIGNALS_PER_COROUTINE):
+        await asyncio.sleep(0)
+        signals.info("processing", worker=worker, index=index)
+
+
+def check_hierarchy(records: list[dict[str, Any]], job_uuid: str) -> int:
+    """Returns the number of records whose parent is not the group started by their own coroutine."""
+    expected_parent: dict[int, str] = {}
+    errors = 0
+    for extra in records:
+        worker: int = extra["worker"]
+        parent = expected_parent.get(worker, job_uuid)
+        errors += extra["parent_uuid"] != parent
+        if "title" in extra:
+            expected_parent[worker] = extra["event_uuid"]
+    return errors
+
+
+async def run(signals: Signals, coroutines: int) -> float:
+    """Runs the coroutines concurrently and returns the elapsed time in seconds."""
+    start = time.perf_counter()
+    await asyncio.gather(*(pipeline(signals, worker) for worker in range(coroutines)))
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    """Runs the benchmark."""
+    coroutines = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000
+
+    stdout = sys.stdout
+    with open(os.devnull, "w") as devnull:  # noqa: PTH123
+        sys.stdout = devnull
+        signals = Signals(
+            SignalsConfig(
+                app_name="benchmark",
+                environment="benchmark",
+                log_from_level=LoggerLevel.INFO,
+                loki_log_from_level=1_000,
+            )
+        )
+        sys.stdout = stdout
+
+        records: list[dict[str, Any]] = []
+
+        def capture(message: "Message") -> None:
+            records.append(message.record["extra"])
+
+        signals.add_sink(capture, level=LoggerLevel.INFO, filter=lambda record: "worker" in record["extra"])
+        elapsed = asyncio.run(run(signals, coroutines))
+
+    total = coroutines * (3 + SIGNALS_PER_COROUTINE)
+    report(
+        f"{coroutines:,} concurrent coroutines sharing one Signals instance",
+        {
+            "signals emitted": len(records),
+            "misattributed signals": check_hierarchy(records, signals.job_uuid),
+            "signals per second": total / elapsed,
+            "microseconds per signal": elapsed / total * 1e6,
+        },
+        unit="",
+    )
+
+
+if __name__ == "__main__":
+    main()
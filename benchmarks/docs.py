@@ -0,0 +1,112 @@
+"""DOCS signals shipping a documentation tree run after run: signals, bytes and time per run.
+
+Each run is a new Signals instance sharing the record of shipped documents and the fingerprint cache, as successive
+jobs would, and shipping to a local fake Loki. Without a record, as before documents were content addressed, every
+document is shipped in full on every run.
+
+Usage:
+    PYTHONPATH=src python -m benchmarks.docs [documents] [runs]
+"""
+
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from loguru import logger
+
+from benchmarks.common import report
+from benchmarks.fake_loki import FakeLoki
+from benchmarks.suite import redirect_stdout
+from telemetry import LoggerLevel, Signals, SignalsConfig
+
+if TYPE_CHECKING:
+    from loguru import Message
+
+PARAGRAPH = "Orders are loaded from the warehouse every hour, deduplicated on their identifier and archived. " * 8
+LARGE_DOCUMENT_BYTES = 2 * 1024 * 1024
+
+
+class Shipped:
+    """Sink counting the signals and the bytes of their fields, as a Loki sink would ship them."""
+
+    def __init__(self) -> None:
+        """Initializes the counts."""
+        self.signals = 0
+        self.bytes = 0
+
+    def write(self, message: "Message") -> None:
+        """Counts a signal."""
+        record = message.record
+        self.signals += 1
+        self.bytes += len(json.dumps(record["extra"], default=str)) + len(record["message"])
+
+
+def write_tree(directory: Path, documents: int) -> None:
+    """Writes a tree of Markdown documents, with a large one."""
+    for index in range(documents):
+        path = directory / f"section-{index % 10}" / f"page-{index}.md"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(f"# Page {index}\n\n" + PARAGRAPH * 4)
+    (directory / "reference.md").write_text("# Reference\n\n" + "é" * (LARGE_DOCUMENT_BYTES // 2))
+
+
+def run(directory: Path, loki: FakeLoki, *, record: bool, paths: bool) -> tuple[Shipped, float]:
+    """Ships the documentation tree once, from a new Signals instance."""
+    config = SignalsConfig(
+        app_name="benchmark",
+        environment="benchmark",
+        log_from_level=1_000,
+        loki_url=loki.url,
+        use_singleton_design_pattern=False,
+        docs_directory=str(directory / ".shipped") if record else None,
+        fingerprint_cache_path=str(directory / ".fingerprints.json"),
+    )
+    with redirect_stdout():
+        signals = Signals(config)
+    shipped = Shipped()
+    sink_id = signals.add_sink(shipped, level=LoggerLevel.INFO, format="{message}")
+    documents = sorted(directory.glob("**/*.md"))
+    start = time.perf_counter()
+    if paths:
+        signals.docs("Documentation.", paths=str(directory / "**" / "*.md"))
+    else:
+        for path in documents:
+            signals.docs("Documentation.", path.read_text(), doc_path=str(path))
+    elapsed = (time.perf_counter() - start) * 1e3
+    signals.remove_sink(sink_id)
+    # documents count as shipped once pushed: the next run only finds them recorded after the flush
+    signals.flush(60)
+    # the loguru logger is shared: the Loki sink of this run must not ship the signals of the next one
+    logger.remove()
+    return shipped, elapsed
+
+
+def main() -> None:
+    """Runs the benchmark."""
+    documents = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 3  # noqa: PLR2004
+    modes = {
+        "docs(message, text) per file, no record": {"record": False, "paths": False},
+        "docs(message, text) per file": {"record": True, "paths": False},
+        "docs(message, paths=glob)": {"record": True, "paths": True},
+    }
+    for title, mode in modes.items():
+        with tempfile.TemporaryDirectory() as name, FakeLoki() as loki:
+            directory = Path(name)
+            write_tree(directory, documents)
+            # fingerprints of files modified in the last two seconds are not cached
+            time.sleep(2.1)
+            results: dict[str, float] = {}
+            for index in range(1, runs + 1):
+                shipped, elapsed = run(directory, loki, **mode)
+                results[f"run {index}: signals"] = shipped.signals
+                results[f"run {index}: KiB shipped"] = shipped.bytes / 1024
+                results[f"run {index}: ms"] = elapsed
+            report(f"{title}, {documents + 1} documents", results, unit="")
+
+
+if __name__ == "__main__":
+    main()
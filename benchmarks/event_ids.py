@@ -0,0 +1,21 @@
+"""Event identifier generation: `generate_uuid4` compared with `BufferedIdGenerator` formats.
+
+Usage:
+    PYTHONPATH=src python -m benchmarks.event_ids
+"""
+
+from benchmarks.common import report, time_per_call
+from tools.uuid import BufferedIdGenerator, IdFormat, generate_uuid4
+
+
+def main() -> None:
+    """Runs the benchmark."""
+    results = {"generate_uuid4()": time_per_call(generate_uuid4)}
+    for id_format in IdFormat:
+        generator = BufferedIdGenerator(id_format)
+        results[f"BufferedIdGenerator({id_format}).next_id()"] = time_per_call(generator.next_id)
+    report("Event identifiers", results)
+
+
+if __name__ == "__main__":
+    main()
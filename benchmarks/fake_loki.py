@@ -0,0 +1,128 @@
+"""Local fake Loki push endpoint that can be told to fail, stall or throttle.
+
+Usage:
+    with FakeLoki() as loki:
+        ...  # push to loki.url
+        loki.mode = FakeLokiMode.FAIL
+"""
+
+import gzip
+import json
+import threading
+import time
+from enum import IntEnum
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import TracebackType
+from typing import Any, Self
+
+
+class FakeLokiMode(IntEnum):
+    """Enumeration of the behaviours of the fake Loki endpoint.
+
+    Attributes:
+        ACCEPT (int): Pushes are accepted with a 204.
+        FAIL (int): Pushes are rejected with a 500.
+        STALL (int): Pushes are held for `stall_seconds` before being accepted.
+        THROTTLE (int): Pushes beyond `throttle_rate` per second are rejected with a 429.
+    """
+
+    ACCEPT = 1
+    FAIL = 2
+    STALL = 3
+    THROTTLE = 4
+
+    def __str__(self) -> str:
+        """Overwrites the __str__ method to retrieve the name.title() of the mode."""
+        return self.name.title()
+
+
+class FakeLoki:
+    """Threaded HTTP server recording the log lines pushed to it."""
+
+    def __init__(self, stall_seconds: float = 30.0, throttle_rate: float = 5.0) -> None:
+        """Initializes the server on a free local port.
+
+        Args:
+            stall_seconds: How long pushes are held in `FakeLokiMode.STALL`.
+            throttle_rate: Pushes accepted per second in `FakeLokiMode.THROTTLE`.
+        """
+        self.mode = FakeLokiMode.ACCEPT
+        self.stall_seconds = stall_seconds
+        self.throttle_rate = throttle_rate
+        self.lines: list[dict[str, Any]] = []
+        self.pushes: int = 0
+        self.rejected: int = 0
+        self.received_bytes: int = 0
+        self._lock = threading.Lock()
+        self._next_accepted_at = 0.0
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-loki", daemon=True)
+
+    @property
+    def url(self) -> str:
+        """Returns the push endpoint URL."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host!s}:{port}/loki/api/v1/push"
+
+    def _handler(self) -> type[BaseHTTPRequestHandler]:
+        """Returns the request handler class bound to this server."""
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self) -> None:  # noqa: N802
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                self.send_response(fake.answer(body))
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+                """Silences the request log."""
+
+        return Handler
+
+    def answer(self, body: bytes) -> int:
+        """Applies the current mode to a push and returns the HTTP status code."""
+        mode = self.mode
+        if mode is FakeLokiMode.STALL:
+            time.sleep(self.stall_seconds)
+        with self._lock:
+            if mode is FakeLokiMode.FAIL:
+                self.rejected += 1
+                return 500
+            if mode is FakeLokiMode.THROTTLE:
+                now = time.monotonic()
+                if now < self._next_accepted_at:
+                    self.rejected += 1
+                    return 429
+                self._next_accepted_at = now + 1 / self.throttle_rate
+
+            self.pushes += 1
+            self.received_bytes += len(body)
+            payload = json.loads(gzip.decompress(body) if body[:2] == b"\x1f\x8b" else body)
+            for stream in payload["streams"]:
+                self.lines.extend(json.loads(line) for _, line in stream["values"])
+            return 204
+
+    def start(self) -> Self:
+        """Starts serving."""
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stops serving."""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> Self:
+        """Starts serving."""
+        return self.start()
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Stops serving."""
+        self.stop()
@@ -0,0 +1,43 @@
+"""Cost of a Signals call filtered out by the level gate, compared with an emitted one.
+
+Usage:
+    PYTHONPATH=src python -m benchmarks.filtered_log
+"""
+
+import os
+import sys
+
+from benchmarks.common import report, time_per_call
+from telemetry import LoggerLevel, Signals, SignalsConfig
+
+
+def main() -> None:
+    """Runs the benchmark."""
+    stdout = sys.stdout
+    with open(os.devnull, "w") as devnull:  # noqa: PTH123
+        # the stdout sink writes to devnull, and nothing reaches the Loki shipper
+        sys.stdout = devnull
+        signals = Signals(
+            SignalsConfig(
+                app_name="benchmark",
+                environment="benchmark",
+                log_from_level=LoggerLevel.INFO,
+                loki_log_from_level=1_000,
+            )
+        )
+        sys.stdout = stdout
+
+        def noop() -> None:
+            pass
+
+        results = {
+            "empty function call": time_per_call(noop),
+            "filtered trace()": time_per_call(lambda: signals.trace("filtered", rows=10)),
+            "filtered debug()": time_per_call(lambda: signals.debug("filtered", rows=10)),
+            "emitted info()": time_per_call(lambda: signals.info("emitted", rows=10), number=5_000),
+        }
+    report("Signals level gate", results)
+
+
+if __name__ == "__main__":
+    main()
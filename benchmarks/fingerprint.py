@@ -0,0 +1,117 @@
+"""Content fingerprints of DATA_SOURCE files and DATASET frames: hashing throughput and the stat-based cache.
+
+Files are fingerprinted cold, again within the process, again from the persisted cache by a new fingerprinter, as a
+new run would, and after one of them changed. Frames are fingerprinted whole and in chunks, and compared with hashing
+them with `pandas.util.hash_pandas_object`.
+
+Usage:
+    PYTHONPATH=src python -m benchmarks.fingerprint [megabytes per file] [files] [rows]
+"""
+
+import hashlib
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+import pandas as pd  # pyright: ignore[reportMissingTypeStubs]
+
+from benchmarks.common import report
+from benchmarks.profiling import build
+from telemetry.fingerprint import Fingerprinter
+
+CHUNK_ROWS = 1_000_000
+
+
+def timed(function: Any) -> tuple[Any, float]:
+    """Returns the result of `function` and its duration in milliseconds."""
+    start = time.perf_counter()
+    result = function()
+    return result, (time.perf_counter() - start) * 1e3
+
+
+def write_files(directory: Path, megabytes: int, count: int) -> list[Path]:
+    """Writes files of random bytes, dated in the past so that their fingerprints can be cached."""
+    paths: list[Path] = []
+    past = time.time_ns() - 60_000_000_000
+    for index in range(count):
+        path = directory / f"source-{index}.bin"
+        with path.open("wb") as file:
+            for _ in range(megabytes):
+                file.write(os.urandom(1024 * 1024))
+        os.utime(path, ns=(past, past))
+        paths.append(path)
+    return paths
+
+
+def main() -> None:
+    """Runs the benchmark."""
+    megabytes = int(sys.argv[1]) if len(sys.argv) > 1 else 256
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 4  # noqa: PLR2004
+    rows = int(sys.argv[3]) if len(sys.argv) > 3 else 2_000_000  # noqa: PLR2004
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths = write_files(Path(directory), megabytes, count)
+        cache_path = Path(directory) / "fingerprints.json"
+        fingerprinter = Fingerprinter(cache_path=cache_path)
+        cold, cold_ms = timed(lambda: fingerprinter.files(paths))
+        _, warm_ms = timed(lambda: fingerprinter.files(paths))
+        fingerprinter.close()
+
+        next_run = Fingerprinter(cache_path=cache_path)
+        persisted, persisted_ms = timed(lambda: next_run.files(paths))
+        with paths[0].open("r+b") as file:
+            file.write(b"changed")
+        changed, changed_ms = timed(lambda: next_run.files(paths))
+        next_run.close()
+
+        _, sha_ms = timed(lambda: [hashlib.sha256(path.read_bytes()).hexdigest() for path in paths])
+        total = megabytes * count
+        report(
+            f"Fingerprinting {count} files of {megabytes} MiB",
+            {
+                "hashlib.sha256(read_bytes())": sha_ms,
+                "cold": cold_ms,
+                "again, same process": warm_ms,
+                "again, persisted cache": persisted_ms,
+                "one file changed": changed_ms,
+            },
+            unit="ms",
+        )
+        sys.stdout.write(f"  cold throughput: {total / cold_ms * 1e3:,.0f} MiB/s\n")
+        sys.stdout.write(f"  persisted fingerprints identical: {persisted == cold}\n")
+        differs = [changed[key] != cold[key] for key in cold]
+        sys.stdout.write(f"  only the changed file differs: {differs == [True] + [False] * (count - 1)}\n")
+
+    frame = build(rows)
+    fingerprinter = Fingerprinter()
+    whole, whole_ms = timed(lambda: fingerprinter.frame(frame))
+
+    def chunked() -> str:
+        digest = fingerprinter.frame_digest()
+        for start in range(0, rows, CHUNK_ROWS):
+            digest.update(frame.iloc[start : start + CHUNK_ROWS])
+        return digest.hexdigest()
+
+    in_chunks, chunked_ms = timed(chunked)
+    _, pandas_ms = timed(lambda: pd.util.hash_pandas_object(frame, index=False))
+    fingerprinter.close()
+    edited = frame.copy()
+    edited.loc[rows // 2, "customer"] = "someone else"
+    report(
+        f"Fingerprinting a frame of {rows:,} rows, {len(frame.columns)} columns",
+        {
+            "pandas.util.hash_pandas_object(frame)": pandas_ms,
+            "Fingerprinter.frame(frame)": whole_ms,
+            f"FrameDigest, {CHUNK_ROWS:,}-row chunks": chunked_ms,
+        },
+        unit="ms",
+    )
+    sys.stdout.write(f"  chunks fingerprint as the whole frame: {in_chunks == whole}\n")
+    sys.stdout.write(f"  an edited value changes the fingerprint: {Fingerprinter().frame(edited) != whole}\n")
+
+
+if __name__ == "__main__":
+    main()
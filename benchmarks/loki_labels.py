@@ -0,0 +1,110 @@
+"""Loki streams and payload size of pushes, per label policy.
+
+Several jobs run processes made of tasks and steps, as a scheduler running the same pipeline would, and their signals
+are encoded into pushes of `batch size` records. The previous policy promoted the job, group and parent identifiers
+to stream labels, so that every group of every job opened streams of its own; the default policy only keeps the
+level, and the identifiers stay in the lines or go to structured metadata.
+
+Usage:
+    PYTHONPATH=src python -m benchmarks.loki_labels [jobs] [batch size]
+"""
+
+import gzip
+import json
+import sys
+from typing import TYPE_CHECKING, Any
+
+from benchmarks.common import report
+from benchmarks.suite import redirect_stdout
+from telemetry import LoggerLevel, Signals, SignalsConfig
+from telemetry.shipping import LokiEncoder
+
+if TYPE_CHECKING:
+    from loguru import Message, Record
+
+LABELS = {"application": "benchmark", "environment": "benchmark"}
+PREVIOUS_LABEL_KEYS = ("job_uuid", "level", "parent_uuid", "signal_group_name")
+POLICIES: dict[str, dict[str, Any]] = {
+    "previous: job, level, parent and group labels": {"label_keys": PREVIOUS_LABEL_KEYS},
+    "previous labels, at most 100 values each": {"label_keys": PREVIOUS_LABEL_KEYS, "max_label_values": 100},
+    "level label": {"label_keys": ("level",)},
+    "level label, job and parent metadata": {"label_keys": ("level",), "metadata_keys": ("job_uuid", "parent_uuid")},
+}
+TASKS = 5
+STEPS = 4
+SIGNALS_PER_STEP = 20
+
+
+class Capture:
+    """Sink keeping the records, as the Loki shipper queues them."""
+
+    def __init__(self) -> None:
+        """Initializes the sink."""
+        self.records: list[Record] = []
+
+    def write(self, message: "Message") -> None:
+        """Keeps the record."""
+        self.records.append(message.record)
+
+
+def run_job(job: int, sink: Capture) -> None:
+    """Runs a job of a process, tasks and steps, each emitting signals."""
+    config = SignalsConfig(
+        app_name="benchmark",
+        environment="benchmark",
+        log_from_level=1_000,
+        loki_log_from_level=1_000,
+        use_singleton_design_pattern=False,
+    )
+    with redirect_stdout():
+        signals = Signals(config)
+    sink_id = signals.add_sink(sink, level=LoggerLevel.DEBUG, format="{message}")
+    with signals.process(title="Daily load", summary="benchmark", job=job):
+        for task in range(TASKS):
+            with signals.task(title=f"Table {task}", summary="benchmark"):
+                for step in range(STEPS):
+                    with signals.step(title=f"Step {step}"):
+                        for index in range(SIGNALS_PER_STEP):
+                            if index % 10 == 0:
+                                signals.debug("Batch read.", rows=index)
+                            else:
+                                signals.info("Rows loaded.", rows=index, table=f"table_{task}")
+                        signals.dataops("Step metrics.", rows=SIGNALS_PER_STEP)
+    signals.remove_sink(sink_id)
+
+
+def main() -> None:
+    """Runs the benchmark."""
+    jobs = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    batch_size = int(sys.argv[2]) if len(sys.argv) > 2 else 500  # noqa: PLR2004
+    sink = Capture()
+    for job in range(jobs):
+        run_job(job, sink)
+    records = sink.records
+    batches = [records[start : start + batch_size] for start in range(0, len(records), batch_size)]
+
+    for title, policy in POLICIES.items():
+        encoder = LokiEncoder(LABELS, **policy)
+        pushes = [encoder.encode(batch) for batch in batches]
+        decoded = [json.loads(push)["streams"] for push in pushes]
+        streams = [len(push) for push in decoded]
+        distinct = {tuple(sorted(stream["stream"].items())) for push in decoded for stream in push}
+        raw = sum(len(push.encode()) for push in pushes)
+        compressed = sum(len(gzip.compress(push.encode(), compresslevel=1)) for push in pushes)
+        report(
+            f"{title}: {len(records):,} records from {jobs} jobs, pushes of {batch_size}",
+            {
+                "push requests": len(pushes),
+                "distinct streams": len(distinct),
+                "streams per push, mean": sum(streams) / len(pushes),
+                "streams per push, max": max(streams),
+                "entries per stream": len(records) / sum(streams),
+                "payload KiB": raw / 1024,
+                "gzip payload KiB": compressed / 1024,
+            },
+            unit="",
+        )
+
+
+if __name__ == "__main__":
+    main()
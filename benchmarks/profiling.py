@@ -0,0 +1,106 @@
+"""Profiling of datasets given to `Signals.dataset`: time and accuracy, for a whole DataFrame and in chunks.
+
+Compares the sampled profile with computing the same statistics exactly with pandas (`nunique`, `min`/`max` and
+`memory_usage(deep=True)` over every row), and reports the error of the distinct estimates and of the memory usage.
+
+Usage:
+    PYTHONPATH=src python -m benchmarks.profiling [rows]
+"""
+
+import sys
+import time
+from typing import Any
+
+import numpy as np
+import pandas as pd  # pyright: ignore[reportMissingTypeStubs]
+
+from benchmarks.common import report
+from telemetry.profiling import DatasetProfiler, profile_dataset
+
+CHUNK_ROWS = 1_000_000
+NULL_RATE = 0.05
+FLAGGED_RATE = 0.01
+
+
+def build(rows: int) -> Any:
+    """Returns a frame with integer, float, string, datetime and boolean columns of various cardinalities."""
+    random = np.random.default_rng(7)
+    amount = random.normal(100, 25, rows)
+    amount[random.random(rows) < NULL_RATE] = np.nan
+    categories = np.array([f"category-{index}" for index in range(1_000)], dtype=object)
+    return pd.DataFrame(
+        {
+            "id": np.arange(rows, dtype=np.int64),
+            "amount": amount,
+            "category": categories[random.integers(0, len(categories), rows)],
+            "customer": random.integers(0, rows // 10 + 1, rows).astype(str).astype(object),
+            "created": pd.Timestamp("2026-01-01") + pd.to_timedelta(random.integers(0, 86_400 * 365, rows), unit="s"),
+            "flagged": random.random(rows) < FLAGGED_RATE,
+        }
+    )
+
+
+def exact(frame: Any) -> dict[str, Any]:
+    """Computes the statistics of the profile over every row with pandas."""
+    return {
+        "distinct": {name: int(frame[name].nunique()) for name in frame.columns},
+        "nulls": {name: int(frame[name].isna().sum()) for name in frame.columns},
+        "min": {name: frame[name].min() for name in frame.columns},
+        "memory_bytes": int(frame.memory_usage(index=False, deep=True).sum()),
+    }
+
+
+def timed(function: Any) -> tuple[Any, float]:
+    """Returns the result of `function` and its duration in milliseconds."""
+    start = time.perf_counter()
+    result = function()
+    return result, (time.perf_counter() - start) * 1e3
+
+
+def main() -> None:
+    """Runs the benchmark."""
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000_000
+    frame, built = timed(lambda: build(rows))
+    truth, exact_ms = timed(lambda: exact(frame))
+    profile, profile_ms = timed(lambda: profile_dataset(frame))
+
+    def chunked() -> dict[str, Any]:
+        profiler = DatasetProfiler()
+        for start in range(0, rows, CHUNK_ROWS):
+            profiler.update(frame.iloc[start : start + CHUNK_ROWS])
+        return profiler.profile()
+
+    chunked_profile, chunked_ms = timed(chunked)
+    report(
+        f"Profiling {rows:,} rows, {len(frame.columns)} columns",
+        {
+            "building the frame": built,
+            "exact statistics with pandas": exact_ms,
+            "profile_dataset(frame)": profile_ms,
+            f"DatasetProfiler, {CHUNK_ROWS:,}-row chunks": chunked_ms,
+        },
+        unit="ms",
+    )
+
+    for name, result in (("whole frame", profile), ("chunked", chunked_profile)):
+        columns = result["column_profiles"]
+        errors = {
+            f"{column}: distinct {truth['distinct'][column]:,} estimated {columns[column]['distinct']:,}, error %": abs(
+                columns[column]["distinct"] - truth["distinct"][column]
+            )
+            / truth["distinct"][column]
+            * 100
+            for column in frame.columns
+        }
+        errors["memory_bytes error %"] = (
+            abs(result["memory_bytes"] - truth["memory_bytes"]) / truth["memory_bytes"] * 100
+        )
+        report(f"Accuracy, {name}", errors, unit="")
+        same = result["rows"] == rows and all(
+            columns[column]["nulls"] == truth["nulls"][column] for column in frame.columns
+        )
+        sys.stdout.write(f"  rows and null counts exact: {same}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""Indexed queries over a large synthetic signals archive.
+
+Writes an archive of synthetic jobs, each a process of tasks of steps, straight into the archive schema, then measures
+building the indexes, loading them back and answering the usual questions: the list of jobs, the signals of a job,
+the errors of a time window and the tree of a job.
+
+Usage:
+    PYTHONPATH=src python -m benchmarks.query [signals]
+"""
+
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+from benchmarks.common import report
+from telemetry.archive import DICTIONARY_COLUMNS, archive_schema, import_pyarrow
+from telemetry.query import SignalsQuery
+
+TASKS_PER_JOB = 4
+STEPS_PER_TASK = 5
+SIGNALS_PER_STEP = 48
+JOBS_PER_FILE = 100
+ROW_GROUP_SIZE = 10_000
+# every 97th signal of a job is an error, and the last step of every task fails
+ERROR_EVERY = 97
+EPOCH = datetime(2026, 1, 1, tzinfo=UTC)
+
+
+def job_template() -> dict[str, list[Any]]:
+    """Returns the signals of one job, whose UUIDs are suffixes to append to the job UUID."""
+    template: dict[str, list[Any]] = {key: [] for key in ("level", "parent", "event", "extra_head", "extra_tail")}
+
+    def add(level: str, parent: str, event: str, extra_head: str | None = None, extra_tail: str = "") -> None:
+        template["level"].append(level)
+        template["parent"].append(parent)
+        template["event"].append(event)
+        template["extra_head"].append(extra_head)
+        template["extra_tail"].append(extra_tail)
+
+    def start(level: str, parent: str, group: str, title: str) -> None:
+        add(level, parent, group, f'{{"title": "{title}", "summary": ""}}')
+
+    def end(level: str, parent: str, group: str, *, failed: bool = False) -> None:
+        status = "failed" if failed else "finished"
+        add(level, parent, f"{group}e", '{"group_uuid": "', f'{group}", "status": "{status}", "elapsed_ms": 5.0}}')
+
+    start("PROCESS", "", "-p", "load")
+    for task in range(TASKS_PER_JOB):
+        task_uuid = f"-t{task}"
+        start("TASK", "-p", task_uuid, f"task {task}")
+        for step in range(STEPS_PER_TASK):
+            step_uuid = f"{task_uuid}s{step}"
+            start("STEP", task_uuid, step_uuid, f"step {step}")
+            for signal in range(SIGNALS_PER_STEP):
+                level = "ERROR" if (len(template["level"]) % ERROR_EVERY) == 0 else "INFO"
+                add(level, step_uuid, f"{step_uuid}-{signal}")
+            end("STEP", task_uuid, step_uuid, failed=step == STEPS_PER_TASK - 1)
+        end("TASK", "-p", task_uuid)
+    end("PROCESS", "", "-p")
+    return template
+
+
+def write_archive(directory: Path, count: int) -> int:
+    """Writes at least `count` signals of consecutive jobs into Parquet files and returns the number of jobs."""
+    pa = import_pyarrow()
+    pc = import_pyarrow("pyarrow.compute")
+    parquet = import_pyarrow("pyarrow.parquet")
+    schema = archive_schema()
+    template = {key: pa.array(values, pa.string()) for key, values in job_template().items()}
+    per_job = len(template["level"])
+    jobs = -(-count // per_job)
+
+    for first_job in range(0, jobs, JOBS_PER_FILE):
+        job_count = min(JOBS_PER_FILE, jobs - first_job)
+        rows = job_count * per_job
+        job_numbers = pa.array(range(first_job, first_job + job_count), pa.int64())
+        job_uuids = pc.utf8_lpad(job_numbers.cast(pa.string()), 36, "0")
+        # one job per second, one signal per millisecond: jobs are clustered in time
+        job_of_row = pc.divide(pa.array(range(rows), pa.int64()), per_job)
+        job_uuid = pc.take(job_uuids, job_of_row)
+        row_in_job = pc.subtract(pa.array(range(rows), pa.int64()), pc.multiply(job_of_row, per_job))
+        times = pc.add(pc.multiply(pc.add(job_of_row, first_job), 1_000_000_000), pc.multiply(row_in_job, 1_000_000))
+
+        def tiled(key: str, job_count: int = job_count) -> Any:
+            return pa.concat_arrays([template[key]] * job_count)
+
+        extra_head, extra_tail = tiled("extra_head"), tiled("extra_tail")
+        with_job = pc.not_equal(extra_tail, "")
+        extra = pc.if_else(with_job, pc.binary_join_element_wise(extra_head, job_uuid, extra_tail, ""), extra_head)
+        columns = {
+            "time": pc.add(times, int(EPOCH.timestamp() * 1e9)).cast(pa.timestamp("ns", tz="UTC")),
+            "level": tiled("level"),
+            "app_name": pa.array(["benchmark"] * rows, pa.string()),
+            "job_uuid": job_uuid,
+            "parent_uuid": pc.binary_join_element_wise(job_uuid, tiled("parent"), ""),
+            "signal_group_name": pa.array(["load"] * rows, pa.string()),
+            "event_uuid": pc.binary_join_element_wise(job_uuid, tiled("event"), ""),
+            "message_id": pa.nulls(rows, pa.int64()),
+            "message": pa.array(["row processed"] * rows, pa.string()),
+            "extra": extra,
+        }
+        arrays = [
+            (
+                pc.dictionary_encode(columns[field.name]).cast(field.type)
+                if field.name in DICTIONARY_COLUMNS
+                else columns[field.name]
+            )
+            for field in schema
+        ]
+        table = pa.Table.from_arrays(arrays, schema=schema)
+        parquet.write_table(
+            table, directory / f"signals-{first_job:08d}.parquet", row_group_size=ROW_GROUP_SIZE, compression="zstd"
+        )
+    return jobs
+
+
+def timed(function: Callable[[], Any]) -> tuple[float, Any]:
+    """Calls `function` and returns the elapsed time in milliseconds with its result."""
+    start = time.perf_counter()
+    result = function()
+    return (time.perf_counter() - start) * 1e3, result
+
+
+def main() -> None:
+    """Runs the benchmark."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+    results: dict[str, float] = {}
+
+    with tempfile.TemporaryDirectory() as root:
+        directory = Path(root)
+        results["write archive (s)"], jobs = timed(lambda: write_archive(directory, count))
+        results["write archive (s)"] /= 1e3
+        results["jobs"] = jobs
+        results["MiB on disk"] = sum(path.stat().st_size for path in directory.iterdir()) / 2**20
+
+        results["build indexes (s)"], query = timed(lambda: SignalsQuery(directory))
+        results["build indexes (s)"] /= 1e3
+        results["load persisted indexes (ms)"], query = timed(lambda: SignalsQuery(directory))
+
+        results["jobs() (ms)"], frame = timed(query.jobs)
+        assert len(frame) == jobs
+
+        job_uuid = frame["job_uuid"].iloc[jobs // 2]
+        results["signals(job_uuid) (ms)"], frame = timed(lambda: query.signals(job_uuid=job_uuid))
+        per_job = len(frame)
+
+        window_start = EPOCH + timedelta(seconds=jobs // 3)
+        results["signals(ERROR, 1 min window) (ms)"], frame = timed(
+            lambda: query.signals(levels=["ERROR"], start=window_start, end=window_start + timedelta(minutes=1))
+        )
+        assert len(frame) > 0
+
+        results["tree(job_uuid) (ms)"], frame = timed(lambda: query.tree(job_uuid))
+        assert len(frame) == 1 + TASKS_PER_JOB * (1 + STEPS_PER_TASK)
+        assert (frame["status"] != "open").all()
+
+    report(f"Queries over {jobs * per_job:,} archived signals", results, unit="")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Repeated Signals constructions, answered by the instance registry or building new instances.
+
+Usage:
+    PYTHONPATH=src python -m benchmarks.registry
+"""
+
+import os
+import sys
+
+from benchmarks.common import report, time_per_call
+from telemetry import Signals, SignalsConfig
+from telemetry.logger_handler import LoggerHandler
+
+UNREGISTERED_BUILDS = 20
+
+
+def config(*, registered: bool) -> SignalsConfig:
+    """Returns the configuration used by every construction."""
+    return SignalsConfig(
+        app_name="benchmark",
+        environment="benchmark",
+        log_from_level=1_000,
+        loki_log_from_level=1_000,
+        use_singleton_design_pattern=registered,
+    )
+
+
+def sink_count() -> int:
+    """Returns the number of sinks of the shared loguru logger."""
+    return len(LoggerHandler().logger._core.handlers)  # noqa: SLF001
+
+
+def main() -> None:
+    """Runs the benchmark."""
+    stdout = sys.stdout
+    with open(os.devnull, "w") as devnull:  # noqa: PTH123
+        sys.stdout = devnull
+        registered = config(registered=True)
+        first = Signals(registered)
+        sinks_before = sink_count()
+        results = {
+            "Signals(config), registered": time_per_call(lambda: Signals(registered)),
+            "Signals(equal config), registered": time_per_call(lambda: Signals(config(registered=True))),
+            "LoggerHandler(), singleton decorator": time_per_call(LoggerHandler),
+            "Signals(config), unregistered": time_per_call(
+                lambda: Signals(config(registered=False)), number=UNREGISTERED_BUILDS, repeat=1
+            ),
+        }
+        sys.stdout = stdout
+
+    assert Signals(config(registered=True)) is first
+    report("Signals constructions", results)
+    report(
+        "Sinks of the loguru logger",
+        {
+            "after the first construction": sinks_before,
+            f"after {UNREGISTERED_BUILDS} unregistered constructions": sink_count(),
+        },
+        unit="",
+    )
+
+
+if __name__ == "__main__":
+    main()
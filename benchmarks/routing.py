@@ -0,0 +1,108 @@
+"""Signals routed to a slow stdout and a file: emission cost and when each destination has everything.
+
+Without routes, stdout is written by the emitting thread, so a slow terminal or pipe slows every signal down and delays
+the other sinks with it. With routes, each sink writes from a queue and worker of its own. The routing table then sends
+TRACE and DEBUG to the file only; trace() is measured as well.
+
+Usage:
+    PYTHONPATH=src python -m benchmarks.routing [signals]
+"""
+
+import io
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from benchmarks.common import report, time_per_call
+from benchmarks.suite import redirect_stdout
+from telemetry import Signals, SignalsConfig, SignalsRoute
+
+WRITE_SECONDS = 0.001
+
+
+class SlowStream(io.StringIO):
+    """Text stream taking a millisecond per write, as a slow terminal or a full pipe would."""
+
+    def __init__(self) -> None:
+        """Initializes the stream."""
+        super().__init__()
+        self.lines = 0
+
+    def write(self, text: str) -> int:
+        """Writes text after a delay."""
+        time.sleep(WRITE_SECONDS)
+        self.lines += text.count("\n")
+        return super().write(text)
+
+
+def build(directory: Path, routes: tuple[SignalsRoute, ...] | None) -> tuple[Signals, SlowStream]:
+    """Builds a Signals instance writing to a slow stdout and to a file."""
+    config = SignalsConfig(
+        app_name="benchmark",
+        environment="benchmark",
+        use_singleton_design_pattern=False,
+        output_format="{message}",
+        file_sinks={"file": str(directory / "signals.log")},
+        routes=routes,
+    )
+    stream = SlowStream()
+    with redirect_stdout():
+        sys.stdout = stream
+        signals = Signals(config)
+    return signals, stream
+
+
+def wait_for(condition: Any, timeout: float = 120.0) -> float:
+    """Waits for `condition` to be true and returns when it became so, as a perf_counter reading."""
+    deadline = time.perf_counter() + timeout
+    while not condition() and time.perf_counter() < deadline:
+        time.sleep(0.001)
+    return time.perf_counter()
+
+
+def scenario(routes: tuple[SignalsRoute, ...] | None, count: int) -> dict[str, float]:
+    """Emits `count` signals and measures when stdout and the file received them."""
+    with tempfile.TemporaryDirectory() as name:
+        directory = Path(name)
+        signals, stream = build(directory, routes)
+        path = directory / "signals.log"
+        written_before = stream.lines
+        lines_before = path.read_text().count("\n") if path.exists() else 0
+        start = time.perf_counter()
+        for index in range(count):
+            signals.info("Order processed.", index=index)
+        emitted_at = time.perf_counter()
+        file_at = wait_for(lambda: path.exists() and path.read_text().count("\n") - lines_before >= count)
+        stdout_at = wait_for(lambda: stream.lines - written_before >= count)
+        unrouted = time_per_call(lambda: signals.trace("Unrouted."), number=2_000, repeat=5) / 1e3
+        signals.flush(5)
+        # the loguru logger is shared: the sinks of this scenario must not slow the next one down
+        logger.remove()
+        return {
+            "emit us/signal": (emitted_at - start) / count * 1e6,
+            "file complete, ms": (file_at - start) * 1e3,
+            "stdout complete, ms": (stdout_at - start) * 1e3,
+            "trace() us/signal": unrouted,
+        }
+
+
+def main() -> None:
+    """Runs the benchmark."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000
+    scenarios = {
+        "no routes: stdout written by the emitting thread": None,
+        "routes: one queue and worker per sink": (
+            SignalsRoute(sinks=("file",), levels=("TRACE", "DEBUG")),
+            SignalsRoute(sinks=("stdout", "file"), levels=("INFO", "WARNING", "ERROR", "CRITICAL")),
+        ),
+    }
+    for title, routes in scenarios.items():
+        report(f"{title}, {count:,} INFO signals", scenario(routes, count), unit="")
+
+
+if __name__ == "__main__":
+    main()
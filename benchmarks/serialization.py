@@ -0,0 +1,139 @@
+"""Serialization of signals for Loki: emitting-thread cost, encoding throughput and bytes per record.
+
+Compares the previous path, where loguru serialized every record for the sink and the worker formatted it again with
+`loki_logger_handler`, with the serializer rendering the shared fields once, using the standard library or orjson.
+
+Usage:
+    PYTHONPATH=src python -m benchmarks.serialization [records]
+"""
+
+import gzip
+import json
+import os
+import sys
+import time
+from typing import TYPE_CHECKING, Any
+
+from loki_logger_handler.formatters.loguru_formatter import LoguruFormatter  # pyright: ignore[reportMissingTypeStubs]
+
+from benchmarks.common import report, time_per_call
+from telemetry import LoggerLevel, Signals, SignalsConfig, serialization
+from telemetry.shipping import LokiShipper
+from tools import LazyTimestamp
+
+if TYPE_CHECKING:
+    from loguru import Message, Record
+
+CONTEXT = {"dataset": "orders", "source": "warehouse", "partition": "2026-10-01", "tenant": "acme"}
+LABELS = {"application": "benchmark", "environment": "benchmark"}
+LABEL_KEYS = ("job_uuid", "level", "parent_uuid", "signal_group_name")
+
+
+class Capture:
+    """Sink keeping the records, as the Loki shipper queues them."""
+
+    def __init__(self) -> None:
+        """Initializes the sink."""
+        self.records: list[Record] = []
+
+    def write(self, message: "Message") -> None:
+        """Keeps the record."""
+        self.records.append(message.record)
+
+
+def previous_encode(records: list["Record"]) -> str:
+    """Encodes a batch as the Loki shipper did before the serializer."""
+    formatter: Any = LoguruFormatter()
+    streams: dict[tuple[tuple[str, str], ...], dict[str, Any]] = {}
+    for record in records:
+        line, _ = formatter.format(record)
+        labels = dict(LABELS)
+        for key in LABEL_KEYS:
+            if key in line:
+                labels[key] = str(line[key])
+        stream_key = tuple(sorted(labels.items()))
+        stream = streams.get(stream_key)
+        if stream is None:
+            stream = streams[stream_key] = {"stream": labels, "values": []}
+        timestamp = record["extra"].get("signal_timestamp")
+        timestamp_ns = timestamp.ns if isinstance(timestamp, LazyTimestamp) else int(line["timestamp"] * 1e9)
+        stream["values"].append([str(timestamp_ns), json.dumps(line, ensure_ascii=False, default=str)])
+    return json.dumps({"streams": list(streams.values())}, ensure_ascii=False)
+
+
+def lines(payload: str) -> list[dict[str, Any]]:
+    """Returns the log lines of a payload, ordered by message id."""
+    decoded = [json.loads(line) for stream in json.loads(payload)["streams"] for _, line in stream["values"]]
+    return sorted(decoded, key=lambda line: line["message_id"])
+
+
+def main() -> None:
+    """Runs the benchmark."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000
+    stdout = sys.stdout
+    with open(os.devnull, "w") as devnull:  # noqa: PTH123
+        sys.stdout = devnull
+        signals = Signals(
+            SignalsConfig(
+                app_name="benchmark", environment="benchmark", log_from_level=1_000, loki_log_from_level=1_000
+            )
+        )
+        sys.stdout = stdout
+    bound = signals.bind(**CONTEXT)
+
+    # emitting thread: loguru serializing each record for the sink, or only handing the record over
+    serialized, plain = Capture(), Capture()
+    sink_id = signals.add_sink(serialized, level=LoggerLevel.INFO, format="{message}", serialize=True)
+    emit_serialized = time_per_call(lambda: bound.info("row", rows=10), number=2_000, repeat=15)
+    signals.remove_sink(sink_id)
+    sink_id = signals.add_sink(plain, level=LoggerLevel.INFO, format="{message}")
+    emit_plain = time_per_call(lambda: bound.info("row", rows=10), number=2_000, repeat=15)
+    report(
+        "Emitting thread, info() on a bound view",
+        {"Loki sink with serialize=True (previous)": emit_serialized, "Loki sink without serialize": emit_plain},
+    )
+
+    plain.records.clear()
+    for index in range(count):
+        if index % 50 == 0:
+            signals.error("failed", rows=index)
+        else:
+            bound.info("row", rows=index, status="loaded")
+    signals.remove_sink(sink_id)
+    records = plain.records
+
+    shipper = LokiShipper(
+        url="http://127.0.0.1:9/loki/api/v1/push",
+        labels=LABELS,
+        label_keys=LABEL_KEYS,
+        queue_size=count,
+        batch_size=count,
+        flush_interval=1.0,
+    )
+    orjson = serialization.orjson
+    payloads = {"previous": previous_encode(records)}
+    results: dict[str, float] = {}
+    sizes: dict[str, float] = {}
+    for name, module in (("previous", None), ("json", None), ("orjson", orjson)):
+        if name == "orjson" and orjson is None:
+            continue
+        serialization.orjson = module
+        encode = (lambda: previous_encode(records)) if name == "previous" else (lambda: shipper.encode(records))
+        start = time.perf_counter()
+        payloads[name] = encode()
+        for _ in range(4):
+            encode()
+        elapsed = (time.perf_counter() - start) / 5
+        results[f"{name}: records per second"] = count / elapsed
+        payload = payloads[name].encode()
+        sizes[f"{name}: bytes per record"] = len(payload) / count
+        sizes[f"{name}: gzip bytes per record"] = len(gzip.compress(payload)) / count
+    serialization.orjson = orjson
+
+    same = all(lines(payload) == lines(payloads["previous"]) for payload in payloads.values())
+    report(f"Encoding {count:,} records into a Loki push", results, unit="")
+    report("Payload size", {**sizes, "lines identical to the previous encoding": same}, unit="")
+
+
+if __name__ == "__main__":
+    main()
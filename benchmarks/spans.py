@@ -0,0 +1,42 @@
+"""Overhead of process/task/step spans.
+
+Group signals are filtered out by every sink, so the figures measure the span bookkeeping only: identifier, context
+frame, clock readings and the end callback.
+
+Usage:
+    PYTHONPATH=src python -m benchmarks.spans
+"""
+
+import os
+import sys
+
+from benchmarks.common import report, time_per_call
+from telemetry import Signals, SignalsConfig
+
+
+def main() -> None:
+    """Runs the benchmark."""
+    config = SignalsConfig(
+        app_name="benchmark", environment="benchmark", log_from_level=1_000, loki_log_from_level=1_000
+    )
+    stdout = sys.stdout
+    with open(os.devnull, "w") as devnull:  # noqa: PTH123
+        sys.stdout = devnull
+        signals = Signals(config)
+        sys.stdout = stdout
+
+    def open_span() -> None:
+        with signals.step(title="step"):
+            pass
+
+    results = {
+        "step() without end": time_per_call(lambda: signals.step(title="step"), number=20_000),
+        "with step(): ...": time_per_call(open_span, number=20_000),
+    }
+    config.span_cpu_time = config.span_memory = True
+    results["with step(): ... + cpu time and rss"] = time_per_call(open_span, number=20_000)
+    report("Span overhead", results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Signals shipped through the durable spool while the Loki endpoint fails, stalls, throttles and recovers.
+
+For each scenario, signals are emitted while the fake Loki endpoint misbehaves, then the endpoint recovers and the
+benchmark waits for the backlog to be replayed. It reports the emission cost during the outage, the replay time and
+checks that every signal was delivered and every spool segment deleted.
+
+Usage:
+    PYTHONPATH=src python -m benchmarks.spool_replay [signals per scenario]
+"""
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.common import report
+from benchmarks.fake_loki import FakeLoki, FakeLokiMode
+from telemetry import FsyncPolicy, LoggerLevel, Signals, SignalsConfig
+from telemetry.shipping import LokiShipper
+from telemetry.spool import Spool
+
+OUTAGE_SECONDS = 3.0
+
+
+def build_signals() -> Signals:
+    """Builds a Signals instance whose own sinks discard everything."""
+    stdout = sys.stdout
+    with open(os.devnull, "w") as devnull:  # noqa: PTH123
+        sys.stdout = devnull
+        signals = Signals(
+            SignalsConfig(
+                app_name="benchmark", environment="benchmark", log_from_level=1_000, loki_log_from_level=1_000
+            )
+        )
+        sys.stdout = stdout
+    return signals
+
+
+def run_scenario(signals: Signals, mode: FakeLokiMode, count: int, *, use_mmap: bool) -> dict[str, float]:
+    """Emits `count` signals while the endpoint is in `mode`, then lets it recover and waits for the replay."""
+    with FakeLoki(stall_seconds=OUTAGE_SECONDS, throttle_rate=5.0) as loki, tempfile.TemporaryDirectory() as directory:
+        spool = Spool(directory, segment_size=256 * 1024, fsync_policy=FsyncPolicy.SEGMENT, use_mmap=use_mmap)
+        shipper = LokiShipper(
+            url=loki.url,
+            labels={"application": "benchmark"},
+            label_keys=("level",),
+            spool=spool,
+            replay_rate=50.0,
+            push_timeout=1.0,
+            queue_size=count,
+            batch_size=100,
+            flush_interval=0.1,
+        )
+        sink_id = signals.add_sink(shipper, level=LoggerLevel.INFO, format="{message}", catch=True)
+
+        loki.mode = mode
+        start = time.perf_counter()
+        for index in range(count):
+            signals.info("spooled", scenario=str(mode), index=index)
+        emit_elapsed = time.perf_counter() - start
+        time.sleep(max(0.0, OUTAGE_SECONDS - emit_elapsed))
+
+        loki.mode = FakeLokiMode.ACCEPT
+        recovered_at = time.perf_counter()
+        delivered = shipper.drain(timeout=120)
+        replay_elapsed = time.perf_counter() - recovered_at
+        signals.remove_sink(sink_id)
+
+        replayer = shipper.replayer
+        return {
+            "emit us/signal during outage": emit_elapsed / count * 1e6,
+            "replay seconds after recovery": replay_elapsed,
+            "signals delivered": sum(line.get("scenario") == str(mode) for line in loki.lines),
+            "delivered everything": float(delivered),
+            "failed pushes": replayer.failed if replayer else 0,
+            "segments left": len(list(Path(directory).glob("*.spool"))) - 1,
+        }
+
+
+def main() -> None:
+    """Runs the benchmark."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000
+    signals = build_signals()
+    for use_mmap in (False, True):
+        for mode in (FakeLokiMode.FAIL, FakeLokiMode.STALL, FakeLokiMode.THROTTLE):
+            results = run_scenario(signals, mode, count, use_mmap=use_mmap)
+            report(f"{mode} endpoint, {count:,} signals, mmap={use_mmap}", results, unit="")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Import and startup time of a short-lived job, measured in fresh processes and checked against budgets.
+
+Each phase runs in a new interpreter, so nothing is already imported or built. The process exits with status 1 when
+the median of a phase is over its budget, or when the job imported an optional feature it does not use, so that
+regressions can be tracked in CI.
+
+Usage:
+    PYTHONPATH=src python -m benchmarks.startup [runs]
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+# budgets, in milliseconds, of the median of each phase
+BUDGETS: dict[str, float] = {
+    "import telemetry": 20.0,
+    "from telemetry import Signals, SignalsConfig": 250.0,
+    "Signals(config)": 60.0,
+    "first signal": 10.0,
+    "tiny job, whole process": 1_000.0,
+}
+
+# modules of the optional features, which the tiny job does not use
+OPTIONAL_MODULES = (
+    "telemetry.archive",
+    "telemetry.docs",
+    "telemetry.fingerprint",
+    "telemetry.metrics",
+    "telemetry.routing",
+    "telemetry.spool",
+)
+
+PHASES = """
+import json, sys, time
+start = time.perf_counter()
+import telemetry
+imported = time.perf_counter()
+from telemetry import Signals, SignalsConfig
+resolved = time.perf_counter()
+signals = Signals(SignalsConfig(app_name="benchmark", environment="benchmark", log_from_level=1_000))
+built = time.perf_counter()
+signals.info("first signal", rows=1)
+emitted = time.perf_counter()
+phases = [imported - start, resolved - imported, built - resolved, emitted - built]
+sys.stderr.write(f"\\nphases {json.dumps(phases)}\\n")
+sys.stderr.write(f"\\nmodules {json.dumps(sorted(sys.modules))}\\n")
+"""
+
+
+def run_job() -> tuple[list[float], float, set[str]]:
+    """Runs a tiny job in a fresh process, returning the duration of its phases and of the whole process.
+
+    The modules imported by the job are returned as well.
+    """
+    environment = {**os.environ, "PYTHONPATH": "src"}
+    start = time.perf_counter()
+    completed = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", PHASES], env=environment, capture_output=True, check=True, text=True
+    )
+    elapsed = time.perf_counter() - start
+    lines = completed.stderr.splitlines()
+    phases = next(line for line in lines if line.startswith("phases "))
+    modules = next(line for line in lines if line.startswith("modules "))
+    return json.loads(phases.removeprefix("phases ")), elapsed, set(json.loads(modules.removeprefix("modules ")))
+
+
+def main() -> None:
+    """Runs the benchmark."""
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 7
+    samples: dict[str, list[float]] = {name: [] for name in BUDGETS}
+    imported: set[str] = set()
+    for _ in range(runs):
+        phases, elapsed, modules = run_job()
+        imported |= modules.intersection(OPTIONAL_MODULES)
+        for name, seconds in zip(BUDGETS, [*phases, elapsed], strict=True):
+            samples[name].append(seconds * 1e3)
+
+    width = max(len(name) for name in BUDGETS)
+    sys.stdout.write(f"\nStartup of a tiny job, median of {runs} fresh processes\n")
+    over = []
+    for name, budget in BUDGETS.items():
+        median = statistics.median(samples[name])
+        status = "ok" if median <= budget else "OVER BUDGET"
+        if median > budget:
+            over.append(name)
+        sys.stdout.write(f"  {name:<{width}}  {median:>9,.1f} ms  (budget {budget:,.0f} ms)  {status}\n")
+    for name in sorted(imported):
+        sys.stdout.write(f"  {name} imported by a job not using it\n")
+    if over or imported:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
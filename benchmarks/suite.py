@@ -0,0 +1,316 @@
+"""Benchmark suite of the telemetry hot paths, with machine-readable results to compare across commits.
+
+Cases:
+    - emit: `info()` throughput for each combination of stdout, Loki and file sinks. Loki is the bundled fake Loki
+      server, which counts the pushes and the bytes received;
+    - filtered: calls discarded by the level gate;
+    - groups: `process`/`task`/`step` transitions;
+    - ids: identifier and timestamp generation of `tools.uuid` and `tools.timestamp`;
+    - threads: concurrent `info()` calls from several threads;
+    - stats: self-instrumentation, counting a signal and reading `Signals.stats()`;
+    - metrics: measurements aggregated with `count`/`observe`, compared with one `dataops()` signal each.
+
+Results are written as JSON, keyed by `<case>/<metric>`, with the commit and the interpreter they were measured on.
+Given a baseline, metrics slower than it by more than the threshold are reported and the exit status is 1.
+
+Usage:
+    PYTHONPATH=src python -m benchmarks.suite [--output results.json] [--baseline previous.json] [--threshold 0.2]
+        [--case emit] [--quick]
+"""
+
+import argparse
+import contextlib
+import itertools
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections.abc import Callable, Iterator
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from benchmarks.common import time_per_call
+from benchmarks.fake_loki import FakeLoki
+from telemetry import LoggerLevel, Signals, SignalsConfig, SignalsLevel
+from telemetry.shipping import LokiShipper
+from telemetry.stats import Histogram, LevelCounter
+from tools import BufferedIdGenerator, IdFormat, LazyTimestamp, generate_uuid4, sortable_id
+
+if TYPE_CHECKING:
+    from loguru import Message
+
+SINKS = ("stdout", "loki", "file")
+FORMAT = "{time:YYYY-MM-DD HH:mm:ss.SSS} | {level: <8} | {message} | {extra}"
+THREADS = 8
+
+
+class Metric(NamedTuple):
+    """Measured value of a benchmark metric.
+
+    Attributes:
+        value: The measured value.
+        unit: Unit of the value.
+        higher_is_better: Whether a higher value is an improvement, e.g. a throughput; otherwise it is a cost.
+    """
+
+    value: float
+    unit: str
+    higher_is_better: bool = False
+
+
+class Suite:
+    """Runs the benchmark cases on a Signals instance whose own sinks discard everything."""
+
+    def __init__(self, *, quick: bool) -> None:
+        """Initializes the suite.
+
+        Args:
+            quick: Runs fewer iterations, for a smoke run.
+        """
+        self.calls = 2_000 if quick else 10_000
+        self.repeat = 3 if quick else 7
+        with redirect_stdout():
+            self.signals = Signals(
+                SignalsConfig(
+                    app_name="benchmark", environment="benchmark", log_from_level=1_000, loki_log_from_level=1_000
+                )
+            )
+
+    def timed(self, function: Callable[[], object], number: int | None = None) -> Metric:
+        """Returns the best time per call of `function`."""
+        return Metric(time_per_call(function, number=number or self.calls, repeat=self.repeat), "ns/call")
+
+    def emit(self) -> dict[str, Metric]:
+        """Measures `info()` for every combination of sinks."""
+        results: dict[str, Metric] = {}
+        combinations = [
+            combination for size in range(1, len(SINKS) + 1) for combination in itertools.combinations(SINKS, size)
+        ]
+        for combination in combinations:
+            name = "+".join(combination)
+            with FakeLoki() as loki, self.sinks(combination, loki.url) as shipper:
+                results[name] = self.timed(lambda: self.signals.info("row loaded", rows=10, table="orders"))
+                if shipper is not None:
+                    shipper.drain(timeout=60)
+                    emitted = self.calls * self.repeat
+                    results[f"{name}: Loki requests per 1k signals"] = Metric(loki.pushes / emitted * 1e3, "requests")
+                    results[f"{name}: Loki bytes per signal"] = Metric(loki.received_bytes / emitted, "bytes")
+        return results
+
+    @contextlib.contextmanager
+    def sinks(self, names: tuple[str, ...], loki_url: str) -> Iterator[LokiShipper | None]:
+        """Adds the named sinks to the instance while the block runs, yielding the Loki shipper if any."""
+        sink_ids: list[int] = []
+        shipper = None
+        with tempfile.TemporaryDirectory() as directory, open(os.devnull, "w") as devnull:  # noqa: PTH123
+            if "stdout" in names:
+                sink_ids.append(self.signals.add_sink(devnull, level=LoggerLevel.INFO, format=FORMAT, colorize=True))
+            if "loki" in names:
+                shipper = LokiShipper(
+                    url=loki_url,
+                    labels={"application": "benchmark"},
+                    label_keys=("job_uuid", "level", "parent_uuid", "signal_group_name"),
+                    queue_size=self.calls * self.repeat,
+                    batch_size=500,
+                    flush_interval=1.0,
+                )
+                sink_ids.append(self.signals.add_sink(shipper, level=LoggerLevel.INFO, format="{message}"))
+            if "file" in names:
+                path = Path(directory) / "signals.log"
+                sink_ids.append(self.signals.add_sink(str(path), level=LoggerLevel.INFO, format=FORMAT))
+            try:
+                yield shipper
+            finally:
+                for sink_id in sink_ids:
+                    self.signals.remove_sink(sink_id)
+
+    def filtered(self) -> dict[str, Metric]:
+        """Measures calls discarded by the level gate."""
+        signals = self.signals
+        return {
+            "debug() below every sink": self.timed(lambda: signals.debug("row", rows=10), number=self.calls * 10),
+            "is_enabled_for()": self.timed(lambda: signals.is_enabled_for("DEBUG"), number=self.calls * 10),
+        }
+
+    def groups(self) -> dict[str, Metric]:
+        """Measures group transitions; group signals are filtered out, so only the bookkeeping is measured."""
+        signals = self.signals
+
+        def step() -> None:
+            with signals.step(title="step"):
+                pass
+
+        def transitions() -> None:
+            with signals.process(title="process", summary="p"), signals.task(title="task", summary="t"):
+                step()
+
+        return {
+            "with step()": self.timed(step),
+            "process/task/step nested": self.timed(transitions),
+        }
+
+    def ids(self) -> dict[str, Metric]:
+        """Measures identifier and timestamp generation."""
+        results = {
+            "generate_uuid4()": self.timed(generate_uuid4, number=self.calls * 10),
+            "sortable_id()": self.timed(sortable_id, number=self.calls * 10),
+            "LazyTimestamp.now()": self.timed(LazyTimestamp.now, number=self.calls * 10),
+            "str(LazyTimestamp.now())": self.timed(lambda: str(LazyTimestamp.now()), number=self.calls * 10),
+        }
+        for id_format in IdFormat:
+            results[f"BufferedIdGenerator({id_format}).next_id()"] = self.timed(
+                BufferedIdGenerator(id_format).next_id, number=self.calls * 10
+            )
+        return results
+
+    def threads(self) -> dict[str, Metric]:
+        """Measures `info()` called concurrently by several threads, reaching a sink that discards the records."""
+        received = itertools.count()
+
+        def discard(message: "Message") -> None:  # noqa: ARG001
+            next(received)
+
+        def work() -> None:
+            for _ in range(self.calls):
+                self.signals.info("row loaded", rows=10)
+
+        sink_id = self.signals.add_sink(discard, level=LoggerLevel.INFO, format="{message}")
+        workers = [threading.Thread(target=work) for _ in range(THREADS)]
+        start = time.perf_counter()
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        elapsed = time.perf_counter() - start
+        self.signals.remove_sink(sink_id)
+        return {
+            f"{THREADS} threads signals per second": Metric(
+                THREADS * self.calls / elapsed, "signals/s", higher_is_better=True
+            ),
+            f"{THREADS} threads signals lost": Metric(THREADS * self.calls - next(received), "signals"),
+        }
+
+    def stats(self) -> dict[str, Metric]:
+        """Measures the self-instrumentation: what each signal pays to be counted, and reading the counters."""
+        counter = LevelCounter()
+        histogram = Histogram()
+        return {
+            "LevelCounter.add()": self.timed(lambda: counter.add("INFO"), number=self.calls * 10),
+            "Histogram.record()": self.timed(lambda: histogram.record(1_234_567), number=self.calls * 10),
+            "Signals.stats()": self.timed(self.signals.stats, number=self.calls // 10),
+        }
+
+    def metrics(self) -> dict[str, Metric]:
+        """Measures metrics aggregated in memory, compared with emitting each measurement as a signal."""
+        signals = self.signals
+        received = itertools.count()
+
+        def discard(message: "Message") -> None:  # noqa: ARG001
+            next(received)
+
+        sink_id = signals.add_sink(discard, level=SignalsLevel.DATAOPS, format="{message}")
+        results = {
+            "dataops() per measurement": self.timed(lambda: signals.dataops("batch loaded", latency_ms=12.5)),
+            "observe()": self.timed(lambda: signals.observe("latency_ms", 12.5), number=self.calls * 10),
+            "count()": self.timed(lambda: signals.count("rows", 500), number=self.calls * 10),
+        }
+        signals.flush_metrics()
+        signals.remove_sink(sink_id)
+        return results
+
+    def cases(self) -> dict[str, Callable[[], dict[str, Metric]]]:
+        """Returns the benchmark cases by name."""
+        return {
+            "emit": self.emit,
+            "filtered": self.filtered,
+            "groups": self.groups,
+            "ids": self.ids,
+            "threads": self.threads,
+            "stats": self.stats,
+            "metrics": self.metrics,
+        }
+
+
+@contextlib.contextmanager
+def redirect_stdout() -> Iterator[None]:
+    """Sends stdout to devnull while the block runs, e.g. for the stdout sink of a Signals being built."""
+    stdout = sys.stdout
+    with open(os.devnull, "w") as devnull:  # noqa: PTH123
+        sys.stdout = devnull
+        try:
+            yield
+        finally:
+            sys.stdout = stdout
+
+
+def environment() -> dict[str, Any]:
+    """Returns what the results were measured on."""
+    try:
+        commit = subprocess.run(  # noqa: S603
+            ["git", "rev-parse", "HEAD"], capture_output=True, check=True, text=True  # noqa: S607
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "platform": platform.platform(),
+        "measured_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+    }
+
+
+def regressions(results: dict[str, Any], baseline: dict[str, Any], threshold: float) -> list[str]:
+    """Returns the metrics worse than the baseline by more than `threshold`, as a fraction of the baseline."""
+    found: list[str] = []
+    for name, metric in results["metrics"].items():
+        previous = baseline["metrics"].get(name)
+        if previous is None or not previous["value"]:
+            continue
+        change = (metric["value"] - previous["value"]) / previous["value"]
+        if metric["higher_is_better"]:
+            change = -change
+        if change > threshold:
+            found.append(f"{name}: {previous['value']:,.1f} -> {metric['value']:,.1f} {metric['unit']} ({change:+.0%})")
+    return found
+
+
+def main() -> None:
+    """Runs the suite."""
+    parser = argparse.ArgumentParser(description="Benchmark suite of the telemetry hot paths.")
+    parser.add_argument("--output", type=Path, help="Writes the results as JSON to this file.")
+    parser.add_argument("--baseline", type=Path, help="Results of a previous run to compare with.")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Tolerated slowdown, as a fraction.")
+    parser.add_argument("--case", action="append", help="Runs only this case; can be repeated.")
+    parser.add_argument("--quick", action="store_true", help="Runs fewer iterations, for a smoke run.")
+    arguments = parser.parse_args()
+
+    suite = Suite(quick=arguments.quick)
+    metrics: dict[str, dict[str, Any]] = {}
+    for case, run in suite.cases().items():
+        if arguments.case and case not in arguments.case:
+            continue
+        for name, metric in run().items():
+            key = f"{case}/{name}"
+            metrics[key] = metric._asdict()
+            sys.stdout.write(f"  {key:<64}  {metric.value:>14,.1f} {metric.unit}\n")
+
+    results = {"environment": environment(), "metrics": metrics}
+    if arguments.output:
+        arguments.output.parent.mkdir(parents=True, exist_ok=True)
+        arguments.output.write_text(json.dumps(results, indent=2))
+
+    if arguments.baseline:
+        found = regressions(results, json.loads(arguments.baseline.read_text()), arguments.threshold)
+        for regression in found:
+            sys.stdout.write(f"REGRESSION {regression}\n")
+        if found:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
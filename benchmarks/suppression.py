@@ -0,0 +1,76 @@
+"""Cost of a log storm with and without the suppression stage, and how many signals reach the sinks.
+
+The storm is the same `error()` call, with the same fields, repeated as fast as possible. Each scenario runs in its
+own process, since the suppression settings are read when Signals is built.
+
+Usage:
+    PYTHONPATH=src python -m benchmarks.suppression [calls]
+"""
+
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, Any
+
+from benchmarks.common import report
+from telemetry import LoggerLevel, Signals, SignalsConfig
+
+if TYPE_CHECKING:
+    from loguru import Message
+
+SCENARIOS: dict[str, dict[str, Any]] = {
+    "no suppression": {},
+    "dedup window 1 s": {"suppression_window": 1.0},
+    "rate 100/s per message": {"suppression_rate": 100.0},
+    "dedup window 1 s and rate 100/s": {"suppression_window": 1.0, "suppression_rate": 100.0},
+}
+
+
+def storm(options: dict[str, Any], calls: int) -> dict[str, float]:
+    """Emits the storm with the given suppression options and returns its cost and what reached the sink."""
+    stdout = sys.stdout
+    with open(os.devnull, "w") as devnull:  # noqa: PTH123
+        sys.stdout = devnull
+        signals = Signals(
+            SignalsConfig(
+                app_name="benchmark",
+                environment="benchmark",
+                log_from_level=1_000,
+                loki_log_from_level=1_000,
+                **options,
+            )
+        )
+        sys.stdout = stdout
+
+    records: list[dict[str, Any]] = []
+
+    def capture(message: "Message") -> None:
+        records.append(message.record["extra"])
+
+    signals.add_sink(capture, level=LoggerLevel.ERROR, format="{message}")
+    start = time.perf_counter()
+    for _ in range(calls):
+        signals.error("source unavailable", source="warehouse", attempt=1)
+    elapsed = time.perf_counter() - start
+    signals.flush()
+
+    return {
+        "ns/call": elapsed / calls * 1e9,
+        "signals reaching the sink": len(records),
+        "repeats reported": sum(record.get("repeat_count", 0) for record in records),
+        "rate limited reported": sum(record.get("rate_limited_count", 0) for record in records),
+    }
+
+
+def main() -> None:
+    """Runs the benchmark."""
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    for name, options in SCENARIOS.items():
+        with ProcessPoolExecutor(1) as pool:
+            results = pool.submit(storm, options, calls).result()
+        report(f"{calls:,} identical error() calls, {name}", results, unit="")
+
+
+if __name__ == "__main__":
+    main()
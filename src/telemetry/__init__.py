@@ -1,16 +1,89 @@
-"""Tracker library tools and functionalities."""
+"""Tracker library tools and functionalities.
 
-from telemetry.config import SignalsConfig
-from telemetry.constants import Constants
-from telemetry.enums import Handler, LoggerLevel, SignalsGroup, SignalsLevel
-from telemetry.signals import Signals
+Public names are imported on first access (PEP 562), so that importing the package does not pull in loguru or the
+Loki client before they are needed. Importing `Signals` does import loguru, and multiprocessing with it; the optional
+features, such as the archive, the spool, routing, metrics and fingerprints, are only imported by the instances
+using them.
+"""
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from telemetry.aio import AsyncSignals
+    from telemetry.collector import CollectorHandle, SignalsCollector
+    from telemetry.config import SignalsConfig, SignalsRoute
+    from telemetry.constants import Constants
+    from telemetry.enums import (
+        ArchiveFormat,
+        FsyncPolicy,
+        Handler,
+        LoggerLevel,
+        MetricKind,
+        OverflowPolicy,
+        SignalsGroup,
+        SignalsLevel,
+    )
+    from telemetry.fingerprint import Fingerprinter, FrameDigest
+    from telemetry.profiling import DatasetProfiler
+    from telemetry.signals import Signals, worker_signals
+
+_LAZY_IMPORTS: dict[str, str] = {
+    "ArchiveFormat": "telemetry.enums",
+    "AsyncSignals": "telemetry.aio",
+    "CollectorHandle": "telemetry.collector",
+    "Constants": "telemetry.constants",
+    "DatasetProfiler": "telemetry.profiling",
+    "Fingerprinter": "telemetry.fingerprint",
+    "FrameDigest": "telemetry.fingerprint",
+    "FsyncPolicy": "telemetry.enums",
+    "Handler": "telemetry.enums",
+    "LoggerLevel": "telemetry.enums",
+    "MetricKind": "telemetry.enums",
+    "OverflowPolicy": "telemetry.enums",
+    "Signals": "telemetry.signals",
+    "SignalsCollector": "telemetry.collector",
+    "SignalsConfig": "telemetry.config",
+    "SignalsGroup": "telemetry.enums",
+    "SignalsLevel": "telemetry.enums",
+    "SignalsRoute": "telemetry.config",
+    "worker_signals": "telemetry.signals",
+}
 
 __all__ = [
+    "ArchiveFormat",
+    "AsyncSignals",
+    "CollectorHandle",
     "Constants",
+    "DatasetProfiler",
+    "Fingerprinter",
+    "FrameDigest",
+    "FsyncPolicy",
     "Handler",
     "LoggerLevel",
+    "MetricKind",
+    "OverflowPolicy",
     "Signals",
+    "SignalsCollector",
     "SignalsConfig",
     "SignalsGroup",
     "SignalsLevel",
+    "SignalsRoute",
+    "worker_signals",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    """Imports a public name from its module on first access and caches it in the package."""
+    module = _LAZY_IMPORTS.get(name)
+    if module is None:
+        msg = f"module {__name__!r} has no attribute {name!r}"
+        raise AttributeError(msg)
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    """Lists the public names, imported or not."""
+    return sorted({*globals(), *__all__})
@@ -0,0 +1,588 @@
+"""Signals for asyncio applications: emitting is an enqueue and the sinks ship from tasks of the event loop."""
+
+import asyncio
+import base64
+import contextlib
+import gzip
+import sys
+import threading
+import time
+import urllib.parse
+from collections.abc import Awaitable, Callable, Mapping
+from typing import TYPE_CHECKING, Any, TextIO
+
+from telemetry.config import SignalsConfig
+from telemetry.enums import OverflowPolicy
+from telemetry.shipping import BatchShipper, LokiEncoder, message_level, record_level
+from telemetry.signals import Signals
+from telemetry.stats import Histogram
+
+if TYPE_CHECKING:
+    from collections.abc import Hashable
+
+    from loguru import Message, Record
+
+    from telemetry.spool import Spool
+
+type _Connection = tuple[asyncio.StreamReader, asyncio.StreamWriter]
+
+_CHUNKED_END = b"0\r\n"
+
+
+class AsyncHttpClient:
+    """HTTP/1.1 client posting over persistent keep-alive connections, built on asyncio streams.
+
+    Each connection carries one request at a time, so at most `max_connections` requests are in flight; idle
+    connections are reused. A request failing on a reused connection, which the server may have closed while it was
+    idle, is retried once on a new connection.
+    """
+
+    def __init__(self, url: str, *, max_connections: int = 2, timeout: float = 10.0) -> None:
+        """Initializes the client; connections are opened by the first requests.
+
+        Args:
+            url: URL requests are posted to, http or https, with optional basic authentication credentials.
+            max_connections: Maximum number of requests in flight.
+            timeout: Maximum time, in seconds, to connect, send a request and read its response.
+
+        Raises:
+            ValueError: If the URL is not an http or https URL.
+        """
+        parts = urllib.parse.urlsplit(url)
+        if parts.scheme not in {"http", "https"} or not parts.hostname:
+            msg = f"Unsupported URL: {url!r}."
+            raise ValueError(msg)
+        self._host = parts.hostname
+        self._port = parts.port or (443 if parts.scheme == "https" else 80)
+        self._tls = parts.scheme == "https"
+        self._timeout = timeout
+        target = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        head = f"POST {target} HTTP/1.1\r\nHost: {parts.netloc.rpartition('@')[2]}\r\nConnection: keep-alive\r\n"
+        if parts.username is not None:
+            credentials = f"{urllib.parse.unquote(parts.username)}:{urllib.parse.unquote(parts.password or '')}"
+            head += f"Authorization: Basic {base64.b64encode(credentials.encode()).decode()}\r\n"
+        self._head = head
+        self._slots = asyncio.Semaphore(max(1, max_connections))
+        self._idle: list[_Connection] = []
+        self.connections_opened = 0
+
+    async def post(self, body: bytes, headers: Mapping[str, str] | None = None) -> tuple[int, bytes]:
+        """Posts a request body and returns the response status code and body.
+
+        Raises:
+            OSError: If the connection fails.
+            TimeoutError: If the server does not answer within the timeout.
+        """
+        async with self._slots:
+            request = self._request(body, headers or {})
+            while True:
+                reused = bool(self._idle)
+                connection = self._idle.pop() if reused else None
+                try:
+                    async with asyncio.timeout(self._timeout):
+                        if connection is None:
+                            connection = await self._open()
+                        status, response, keep_alive = await self._exchange(connection, request)
+                except (OSError, asyncio.IncompleteReadError, TimeoutError) as error:
+                    if connection is not None:
+                        connection[1].close()
+                    if reused and not isinstance(error, TimeoutError):
+                        continue
+                    raise
+                if keep_alive:
+                    self._idle.append(connection)
+                else:
+                    connection[1].close()
+                return status, response
+
+    async def close(self) -> None:
+        """Closes the idle connections."""
+        idle, self._idle = self._idle, []
+        for _, writer in idle:
+            writer.close()
+        for _, writer in idle:
+            with contextlib.suppress(OSError):
+                await writer.wait_closed()
+
+    def _request(self, body: bytes, headers: Mapping[str, str]) -> bytes:
+        """Returns the bytes of a request."""
+        fields = "".join(f"{name}: {value}\r\n" for name, value in headers.items())
+        return f"{self._head}{fields}Content-Length: {len(body)}\r\n\r\n".encode("latin-1") + body
+
+    async def _open(self) -> _Connection:
+        """Opens a connection to the server."""
+        ssl: Any = None
+        if self._tls:
+            import ssl as ssl_module  # only imported by https clients
+
+            ssl = ssl_module.create_default_context()
+        connection = await asyncio.open_connection(self._host, self._port, ssl=ssl)
+        self.connections_opened += 1
+        return connection
+
+    @staticmethod
+    async def _exchange(connection: _Connection, request: bytes) -> tuple[int, bytes, bool]:
+        """Sends a request and reads its response: status code, body and whether the connection can be reused."""
+        reader, writer = connection
+        writer.write(request)
+        await writer.drain()
+        status_line = await reader.readline()
+        if not status_line:
+            msg = "Connection closed by the server."
+            raise ConnectionResetError(msg)
+        version, _, rest = status_line.decode("latin-1").partition(" ")
+        status = int(rest[:3])
+        headers: dict[str, str] = {}
+        while (line := await reader.readline()) not in {b"\r\n", b"\n", b""}:
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks: list[bytes] = []
+            while (size_line := await reader.readline()) != _CHUNKED_END:
+                chunks.append(await reader.readexactly(int(size_line.split(b";")[0], 16)))
+                await reader.readexactly(2)
+            while await reader.readline() not in {b"\r\n", b"\n", b""}:
+                pass
+            body = b"".join(chunks)
+        elif "content-length" in headers:
+            body = await reader.readexactly(int(headers["content-length"]))
+        elif status in {204, 304} or status < 200:  # noqa: PLR2004
+            body = b""
+        else:
+            body = await reader.read()
+            keep_alive = False
+        return status, body, keep_alive
+
+
+class AsyncBatchShipper[T](BatchShipper[T]):
+    """Batch shipper whose worker is a task of an event loop, shipping batches with a coroutine.
+
+    Items can be queued from any thread; only the loop thread pays no more than an enqueue, the others also schedule a
+    wake-up of the task. Up to `max_in_flight` batches are shipped concurrently. The BLOCK overflow policy would stall
+    the event loop and is not supported.
+    """
+
+    def __init__(
+        self,
+        ship: Callable[[list[T]], Awaitable[None]],
+        *,
+        max_in_flight: int = 1,
+        name: str = "signals-shipper",
+        **kwargs: Any,
+    ) -> None:
+        """Initializes the queue; the worker task is started by the first item.
+
+        Must be called from a coroutine running on the event loop the worker task runs on.
+
+        Args:
+            ship: Coroutine function receiving each batch. Its errors are counted, not raised.
+            max_in_flight: Maximum number of batches shipped concurrently.
+            name: Name of the worker task.
+            **kwargs: Queue options forwarded to `BatchShipper`.
+
+        Raises:
+            ValueError: If the overflow policy is BLOCK.
+            RuntimeError: If no event loop is running.
+        """
+        if kwargs.get("overflow_policy") is OverflowPolicy.BLOCK:
+            msg = "The BLOCK overflow policy would stall the event loop."
+            raise ValueError(msg)
+        super().__init__(None, name=name, **kwargs)
+        self._ship_batch = ship
+        self._task_name = name
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        self._max_in_flight = max(1, max_in_flight)
+        self._wakeup = asyncio.Event()
+        self._shipped_event = asyncio.Event()
+        self._task: asyncio.Task[None] | None = None
+
+    def _start(self) -> None:
+        """Starts the worker task. Must be called with the lock held."""
+        self._started = True
+        self._call_soon(self._spawn)
+
+    def _spawn(self) -> None:
+        """Creates the worker task, on the loop thread."""
+        self._task = self._loop.create_task(self._run_async(), name=self._task_name)
+
+    def _queued(self, size: int) -> None:
+        """Wakes the worker task up when the first item or a full batch is queued. Must be called with the lock held."""
+        super()._queued(size)
+        if size in {1, self._batch_size}:
+            self._call_soon(self._wakeup.set)
+
+    def _call_soon(self, callback: Callable[[], None]) -> None:
+        """Runs `callback` on the loop thread: right away from it, at the next loop iteration from other threads."""
+        if threading.get_ident() == self._loop_thread:
+            callback()
+            return
+        # once the loop is closed, what is queued is no longer shipped
+        with contextlib.suppress(RuntimeError):
+            self._loop.call_soon_threadsafe(callback)
+
+    async def _next_batch_async(self) -> list[T] | None:
+        """Waits for a batch to be ready and takes it from the queue. Returns None once closed and drained."""
+        while True:
+            with self._lock:
+                size = len(self._queue)
+                if not size and self._closed:
+                    return None
+                remaining = self._queued_at[0] + self._flush_interval - time.monotonic() if size else None
+                ready = size >= self._batch_size or self._closed or self._flush_requested
+                if size and (ready or remaining is None or remaining <= 0):
+                    batch = self._take(min(self._batch_size, size))
+                    self._in_flight += len(batch)
+                    return batch
+                self._wakeup.clear()
+            try:
+                async with asyncio.timeout(remaining):
+                    await self._wakeup.wait()
+            except TimeoutError:
+                pass
+
+    async def _run_async(self) -> None:
+        """Worker task: ships batches until the shipper is closed and the queue is drained."""
+        slots = asyncio.Semaphore(self._max_in_flight)
+        shipping: set[asyncio.Task[None]] = set()
+        while True:
+            # waiting for a free slot first lets the items queued meanwhile join the next batch
+            await slots.acquire()
+            batch = await self._next_batch_async()
+            if batch is None:
+                slots.release()
+                break
+            task = asyncio.create_task(self._ship_async(batch, slots))
+            shipping.add(task)
+            task.add_done_callback(shipping.discard)
+        if shipping:
+            await asyncio.gather(*shipping)
+        with self._lock:
+            self._idle.notify_all()
+        self._shipped_event.set()
+
+    async def _ship_async(self, batch: list[T], slots: asyncio.Semaphore) -> None:
+        """Ships a batch, counting its items as shipped or failed."""
+        self._batch_sizes.record(len(batch))
+        started_at = time.perf_counter_ns()
+        try:
+            await self._ship_batch(batch)
+        except Exception as error:  # noqa: BLE001
+            self._failed += len(batch)
+            self._last_error = error
+        else:
+            self._shipped += len(batch)
+            self._notify_shipped(batch)
+        finally:
+            self._ship_latency.record(time.perf_counter_ns() - started_at)
+            slots.release()
+            with self._lock:
+                self._in_flight -= len(batch)
+                if not self._queue and not self._in_flight:
+                    self._flush_requested = False
+                    self._idle.notify_all()
+            self._shipped_event.set()
+
+    async def drain_async(self, timeout: float | None = None) -> bool:  # noqa: ASYNC109
+        """Ships everything queued so far without waiting for the flush interval.
+
+        Args:
+            timeout: Maximum time, in seconds, to wait for the queue to be shipped. None waits indefinitely.
+
+        Returns:
+            True if the queue was fully shipped, False if the timeout expired first.
+        """
+        with self._lock:
+            if not self._started:
+                return not self._queue
+            self._flush_requested = True
+        self._wakeup.set()
+        try:
+            async with asyncio.timeout(timeout):
+                while True:
+                    with self._lock:
+                        if not self._queue and not self._in_flight:
+                            return True
+                    self._shipped_event.clear()
+                    await self._shipped_event.wait()
+        except TimeoutError:
+            return False
+
+    async def complete(self) -> None:
+        """Loguru hook awaited by `logger.complete()`: ships everything queued so far."""
+        await self.drain_async()
+
+    def drain(self, timeout: float | None = None) -> bool:
+        """Ships everything queued so far, waiting from a thread other than the loop thread; see `drain_async`.
+
+        Raises:
+            RuntimeError: If called from the loop thread, which would wait for itself.
+        """
+        if threading.get_ident() == self._loop_thread:
+            msg = "drain() would block the event loop: await drain_async() instead."
+            raise RuntimeError(msg)
+        with self._lock:
+            if not self._started:
+                return not self._queue
+            self._flush_requested = True
+        self._call_soon(self._wakeup.set)
+        with self._lock:
+            return self._idle.wait_for(lambda: not self._queue and not self._in_flight, timeout)
+
+    def stop(self, timeout: float | None = 5.0) -> None:  # noqa: ARG002
+        """Stops accepting items; the worker task ships what is still queued and ends.
+
+        Loguru calls this method when the sink is removed. It does not wait for the worker task: `aclose` does.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._not_full.notify_all()
+        self._call_soon(self._wakeup.set)
+
+    async def aclose(self, timeout: float | None = 5.0) -> None:  # noqa: ASYNC109
+        """Stops accepting items and waits for the worker task to ship what is still queued.
+
+        Args:
+            timeout: Maximum time, in seconds, to wait for the worker task.
+        """
+        self.stop()
+        if self._task is not None:
+            try:
+                async with asyncio.timeout(timeout):
+                    await asyncio.shield(self._task)
+            except TimeoutError:
+                pass
+
+
+class AsyncLokiShipper(AsyncBatchShipper["Record"]):
+    """Loguru sink that ships records to Loki in batches from a task of the event loop.
+
+    Batches are encoded and compressed on a worker thread, so that large batches do not hold the loop, and pushed over
+    persistent keep-alive connections, at most `max_in_flight` at a time.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        labels: dict[str, str],
+        label_keys: "tuple[str, ...]",
+        metadata_keys: "tuple[str, ...]" = (),
+        max_label_values: int | None = None,
+        push_timeout: float = 10.0,
+        max_in_flight: int = 2,
+        **kwargs: Any,
+    ) -> None:
+        """Initializes the Loki shipper.
+
+        Args:
+            url: Loki push endpoint.
+            labels: Static labels added to every stream.
+            label_keys: Record fields promoted to stream labels.
+            metadata_keys: Record fields attached to each line as structured metadata.
+            max_label_values: Maximum number of distinct values of each label; see `LokiEncoder`.
+            push_timeout: Maximum time, in seconds, to wait for Loki to answer a push.
+            max_in_flight: Maximum number of pushes in flight, each on its own connection.
+            **kwargs: Queue options forwarded to `BatchShipper`.
+        """
+        self._encoder = LokiEncoder(labels, label_keys, metadata_keys, max_label_values)
+        self._client = AsyncHttpClient(url, max_connections=max_in_flight, timeout=push_timeout)
+        self._serialize_latency = Histogram()
+        self._push_latency = Histogram()
+        super().__init__(
+            self._push, max_in_flight=max_in_flight, level_of=record_level, name="signals-loki-shipper", **kwargs
+        )
+
+    def write(self, message: "Message") -> None:
+        """Loguru sink entry point: queues the record behind the formatted message."""
+        self.put(message.record)
+
+    def stats(self) -> dict[str, Any]:
+        """Returns the counters of the shipper, with the serialization and push times, in milliseconds.
+
+        Returns:
+            The counters of `BatchShipper.stats`, plus `serialize_ms` and `push_ms` summaries and the number of
+            `connections_opened`.
+        """
+        stats = super().stats()
+        stats["serialize_ms"] = self._serialize_latency.summary(1e-6)
+        stats["push_ms"] = self._push_latency.summary(1e-6)
+        stats["connections_opened"] = self._client.connections_opened
+        return stats
+
+    def _encode(self, records: list["Record"]) -> tuple[bytes, int]:
+        """Returns the compressed push payload of a batch and the time taken to build it, in nanoseconds."""
+        started_at = time.perf_counter_ns()
+        body = gzip.compress(self._encoder.encode(records).encode(), compresslevel=1)
+        return body, time.perf_counter_ns() - started_at
+
+    async def _push(self, records: list["Record"]) -> None:
+        """Sends a batch of records to Loki."""
+        body, encode_ns = await asyncio.to_thread(self._encode, records)
+        self._serialize_latency.record(encode_ns)
+        started_at = time.perf_counter_ns()
+        try:
+            status, response = await self._client.post(
+                body, {"Content-Type": "application/json", "Content-Encoding": "gzip"}
+            )
+        finally:
+            self._push_latency.record(time.perf_counter_ns() - started_at)
+        if not 200 <= status < 300:  # noqa: PLR2004
+            msg = f"Loki rejected the push with HTTP {status}: {response[:200]!r}"
+            raise RuntimeError(msg)
+
+    async def aclose(self, timeout: float | None = 5.0) -> None:  # noqa: ASYNC109
+        """Stops accepting records, waits for the queued ones to be pushed and closes the connections."""
+        await super().aclose(timeout)
+        await self._client.close()
+
+
+class AsyncStreamSink(AsyncBatchShipper["Message"]):
+    """Loguru sink writing the formatted messages to a text stream, such as stdout or a file, from the event loop.
+
+    The lines queued while a write is in progress are written together by the next one, from a worker thread, so
+    that a slow terminal, a full pipe or a slow disk does not hold the loop.
+    """
+
+    def __init__(self, stream: TextIO, *, close: bool = False, **kwargs: Any) -> None:
+        """Initializes the sink.
+
+        Args:
+            stream: Text stream the messages are written to.
+            close: Closes the stream when the sink is closed, e.g. for a file opened for the sink.
+            **kwargs: Queue options forwarded to `BatchShipper`.
+        """
+        self._stream = stream
+        self._close = close
+        super().__init__(self._write_lines, level_of=message_level, name="signals-stream-sink", **kwargs)
+
+    def write(self, message: "Message") -> None:
+        """Loguru sink entry point: queues the formatted message."""
+        self.put(message)
+
+    async def _write_lines(self, messages: list["Message"]) -> None:
+        """Writes a batch of messages."""
+        await asyncio.to_thread(self._write, "".join(messages))
+
+    def _write(self, text: str) -> None:
+        """Writes text to the stream and flushes it."""
+        self._stream.write(text)
+        self._stream.flush()
+
+    async def aclose(self, timeout: float | None = 5.0) -> None:  # noqa: ASYNC109
+        """Stops accepting messages, waits for the queued ones to be written and closes the stream if it owns it."""
+        await super().aclose(timeout)
+        if self._close and not self._stream.closed:
+            self._stream.close()
+
+
+class AsyncSignals(Signals):
+    """Signals for asyncio applications, shipping to stdout and Loki from tasks of the event loop.
+
+    Emitting a signal formats it and queues it, without any blocking write or network call on the loop. Loki batches
+    are pushed over keep-alive connections built on asyncio streams, at most `loki_max_in_flight` at a time. With a
+    spool directory, Loki batches go through the threaded `LokiShipper`, whose disk writes already happen off the
+    loop. Instances are bound to the loop they are created on, so they are never shared through the registry.
+
+    Example:
+        async with AsyncSignals(config) as signals:
+            signals.info("Ingestion started.")
+            await ingest()
+    """
+
+    @classmethod
+    def registry_key(cls, *args: Any, **kwargs: Any) -> "Hashable | None":  # noqa: ARG003
+        """Instances are bound to their event loop and never registered."""
+        return None
+
+    def __init__(self, config: SignalsConfig, **kwargs: Any) -> None:
+        """Initializes the instance on the running event loop.
+
+        Args:
+            config: Signals configuration. The BLOCK overflow policy is not supported.
+            **kwargs: Additional options of the stdout sink.
+
+        Raises:
+            RuntimeError: If no event loop is running.
+        """
+        asyncio.get_running_loop()
+        super().__init__(config, **kwargs)
+
+    def _loki_shipper(self, url: str, spool: "Spool | None") -> BatchShipper[Any]:
+        """Returns the Loki sink: pushing from the event loop, or through the threaded shipper with a spool."""
+        if spool is not None:
+            return super()._loki_shipper(url, spool)
+        config = self.config
+        return AsyncLokiShipper(
+            url=url,
+            labels={"application": config.app_name, "environment": config.environment},
+            label_keys=config.loki_label_keys,
+            metadata_keys=config.loki_metadata_keys,
+            max_label_values=config.loki_max_label_values,
+            push_timeout=config.loki_push_timeout,
+            max_in_flight=config.loki_max_in_flight,
+            queue_size=config.loki_queue_size,
+            batch_size=config.loki_batch_size,
+            flush_interval=config.loki_flush_interval,
+            overflow_policy=config.loki_overflow_policy,
+            overflow_level=config.loki_overflow_level,
+        )
+
+    def _stdout_sink(self) -> Any:
+        """Returns the stdout sink, writing from the event loop."""
+        return self._text_sink(sys.stdout)
+
+    def _text_sink(self, stream: TextIO, *, close: bool = False) -> Any:
+        """Returns a sink writing the signals to a text stream from the event loop."""
+        return AsyncStreamSink(
+            stream,
+            close=close,
+            queue_size=self.config.loki_queue_size,
+            batch_size=1_000,
+            flush_interval=0,
+            overflow_policy=self.config.loki_overflow_policy,
+            overflow_level=self.config.loki_overflow_level,
+        )
+
+    async def aflush(self, timeout: float | None = None) -> bool:  # noqa: ASYNC109
+        """Ships every queued signal without waiting for the flush interval; see `Signals.flush`."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        self.flush_metrics()
+        if self._suppressor is not None:
+            self._suppressor.flush()
+        shipped = True
+        for queue in self._queues().values():
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            if isinstance(queue, AsyncBatchShipper):
+                shipped = await queue.drain_async(remaining) and shipped
+            else:
+                # the threaded sinks, such as the archive or the Loki shipper of a spool
+                shipped = await asyncio.to_thread(queue.drain, remaining) and shipped
+        return shipped
+
+    async def aclose(self, timeout: float | None = 5.0) -> None:  # noqa: ASYNC109
+        """Ships every queued signal, then removes the sinks from loguru and closes them.
+
+        The signals emitted afterwards are dropped.
+
+        Args:
+            timeout: Maximum time, in seconds, to wait for each sink.
+        """
+        await self.aflush(timeout)
+        self._remove_sinks()
+        for queue in self._queues().values():
+            if isinstance(queue, AsyncBatchShipper):
+                await queue.aclose(timeout)
+            else:
+                await asyncio.to_thread(queue.stop, timeout)
+
+    async def __aenter__(self) -> "AsyncSignals":
+        """Returns the instance."""
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        """Ships every queued signal and closes the sinks."""
+        await self.aclose()
@@ -0,0 +1,299 @@
+"""Columnar on-disk archive of signals.
+
+Requires pyarrow, installed with the `archive` extra.
+"""
+
+import importlib
+import json
+import os
+import time
+from collections.abc import Iterable, Sequence
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from telemetry.enums import ArchiveFormat
+from telemetry.shipping import BatchShipper
+from tools.timestamp import LazyTimestamp
+
+if TYPE_CHECKING:
+    from loguru import Message, Record
+    from pandas import DataFrame  # pyright: ignore[reportMissingTypeStubs]
+
+# fields stored in their own column, or not at all; every other field is kept as JSON in the `extra` column
+DICTIONARY_COLUMNS: tuple[str, ...] = ("level", "app_name", "job_uuid", "signal_group_name")
+ARCHIVE_COLUMNS: tuple[str, ...] = (
+    "time",
+    "level",
+    "app_name",
+    "job_uuid",
+    "parent_uuid",
+    "signal_group_name",
+    "event_uuid",
+    "message_id",
+    "message",
+    "extra",
+)
+_COLUMN_FIELDS = frozenset((*ARCHIVE_COLUMNS, "signal_timestamp"))
+
+_EXTENSIONS = {ArchiveFormat.PARQUET: ".parquet", ArchiveFormat.ARROW: ".arrow"}
+_PART_SUFFIX = ".part"
+
+
+def import_pyarrow(module: str = "pyarrow") -> Any:
+    """Imports pyarrow, or one of its modules, an optional dependency of the archive."""
+    try:
+        return importlib.import_module(module)
+    except ImportError as error:
+        msg = "The signals archive requires pyarrow; install it with the `archive` extra."
+        raise ImportError(msg) from error
+
+
+def archive_schema() -> Any:
+    """Returns the Arrow schema of the archive files."""
+    pa = import_pyarrow()
+    text_dictionary = pa.dictionary(pa.int32(), pa.string())
+    types = {"time": pa.timestamp("ns", tz="UTC"), "message_id": pa.int64()}
+    return pa.schema(
+        [
+            (column, text_dictionary if column in DICTIONARY_COLUMNS else types.get(column, pa.string()))
+            for column in ARCHIVE_COLUMNS
+        ]
+    )
+
+
+class _FileDictionaries:
+    """Dictionaries of the dictionary-encoded columns of the Arrow IPC file being written.
+
+    Arrow IPC files allow a single dictionary per column, only extended by deltas, so values are only ever appended
+    and each batch carries a dictionary extending the previous one. The columns take few values: the dictionary array
+    is only rebuilt by the batches adding some.
+    """
+
+    def __init__(self, pa: Any) -> None:
+        """Initializes empty dictionaries.
+
+        Args:
+            pa: The pyarrow module.
+        """
+        self._pa = pa
+        self.indexes: dict[str, dict[str, int]] = {column: {} for column in DICTIONARY_COLUMNS}
+        self._arrays: dict[str, Any] = {}
+
+    def encode(self, column: str, values: Iterable[str]) -> tuple[list[int], Any]:
+        """Returns the dictionary indices of `values` and the dictionary of the column, as an Arrow array."""
+        index = self.indexes[column]
+        indices = [index.setdefault(value, len(index)) for value in values]
+        dictionary = self._arrays.get(column)
+        if dictionary is None or len(dictionary) != len(index):
+            dictionary = self._arrays[column] = self._pa.array(list(index), self._pa.string())
+        return indices, dictionary
+
+
+class ArchiveSink(BatchShipper["Record"]):
+    """Loguru sink archiving records into Parquet or Arrow IPC files.
+
+    Records are queued on the emitting thread and written by a background worker, one row group or record batch per
+    `row_group_size` records. Low-cardinality fields are dictionary-encoded, with a dictionary per row group in
+    Parquet files and a single one extended by each batch in Arrow files. A file is written under a `.part` name
+    and renamed once complete, when it reaches `max_file_bytes` or has been open for `max_file_seconds`.
+    """
+
+    def __init__(
+        self,
+        directory: str | os.PathLike[str],
+        *,
+        archive_format: ArchiveFormat = ArchiveFormat.PARQUET,
+        row_group_size: int = 10_000,
+        flush_interval: float = 5.0,
+        max_file_bytes: int = 128 * 1024 * 1024,
+        max_file_seconds: float = 3600.0,
+        **kwargs: Any,
+    ) -> None:
+        """Initializes the archive sink.
+
+        Args:
+            directory: Directory receiving the archive files. It is created if missing.
+            archive_format: File format of the archive.
+            row_group_size: Number of records per row group or record batch.
+            flush_interval: Maximum time, in seconds, a record waits before being written.
+            max_file_bytes: Size at which a file is completed and a new one is started.
+            max_file_seconds: Age at which a file is completed and a new one is started.
+            **kwargs: Queue options forwarded to `BatchShipper`.
+        """
+        self._pa = import_pyarrow()
+        self._schema = archive_schema()
+        self._directory = Path(directory)
+        self._directory.mkdir(parents=True, exist_ok=True)
+        self._format = archive_format
+        self._max_file_bytes = max_file_bytes
+        self._max_file_seconds = max_file_seconds
+
+        self._path: Path | None = None
+        self._writer: Any = None
+        self._sink: Any = None
+        self._opened_at: float = 0.0
+        self._dictionaries = _FileDictionaries(self._pa)
+        self._files: list[Path] = []
+
+        kwargs.setdefault("queue_size", 10 * row_group_size)
+        super().__init__(
+            self._write_batch,
+            batch_size=row_group_size,
+            flush_interval=flush_interval,
+            level_of=lambda record: record["level"].no,
+            name="signals-archive-writer",
+            **kwargs,
+        )
+
+    @property
+    def files(self) -> list[Path]:
+        """Returns the files completed by this sink."""
+        return list(self._files)
+
+    def write(self, message: "Message") -> None:
+        """Loguru sink entry point: queues the record behind the formatted message."""
+        self.put(message.record)
+
+    def record_batch(self, records: Sequence["Record"]) -> Any:
+        """Converts records into an Arrow record batch of the archive schema."""
+        pa = self._pa
+        times: list[int] = []
+        columns: dict[str, list[Any]] = {column: [] for column in ARCHIVE_COLUMNS if column != "time"}
+        for record in records:
+            extra = record["extra"]
+            timestamp = extra.get("signal_timestamp")
+            times.append(
+                timestamp.ns if isinstance(timestamp, LazyTimestamp) else int(record["time"].timestamp() * 1e9)
+            )
+            columns["level"].append(record["level"].name)
+            columns["message"].append(record["message"])
+            for column in ("app_name", "job_uuid", "parent_uuid", "signal_group_name", "event_uuid"):
+                columns[column].append(str(extra.get(column) or ""))
+            columns["message_id"].append(extra.get("message_id") or None)
+            rest = {key: value for key, value in extra.items() if key not in _COLUMN_FIELDS}
+            columns["extra"].append(json.dumps(rest, ensure_ascii=False, default=str) if rest else None)
+
+        arrays: list[Any] = [pa.array(times, pa.timestamp("ns", tz="UTC"))]
+        for field in self._schema:
+            if field.name in DICTIONARY_COLUMNS:
+                arrays.append(self._dictionary_array(field.name, columns[field.name]))
+            elif field.name != "time":
+                arrays.append(pa.array(columns[field.name], field.type))
+        return pa.RecordBatch.from_arrays(arrays, schema=self._schema)
+
+    def _dictionary_array(self, column: str, values: list[str]) -> Any:
+        """Returns the dictionary-encoded array of a column."""
+        pa = self._pa
+        if self._format is ArchiveFormat.PARQUET:
+            # Parquet stores a dictionary per row group, encoded from the values of the batch alone
+            return pa.array(values, pa.string()).dictionary_encode()
+        indices, dictionary = self._dictionaries.encode(column, values)
+        return pa.DictionaryArray.from_arrays(pa.array(indices, pa.int32()), dictionary)
+
+    def _open(self) -> Any:
+        """Starts a new archive file and returns its writer."""
+        stamp = datetime.now(UTC).strftime("%Y%m%dT%H%M%S%fZ")
+        self._path = self._directory / f"signals-{stamp}-{os.getpid()}{_EXTENSIONS[self._format]}"
+        part = self._path.with_name(self._path.name + _PART_SUFFIX)
+        self._dictionaries = _FileDictionaries(self._pa)
+        self._opened_at = time.monotonic()
+        if self._format is ArchiveFormat.PARQUET:
+            parquet = import_pyarrow("pyarrow.parquet")
+            self._writer = parquet.ParquetWriter(part, self._schema, compression="zstd")
+        else:
+            ipc = import_pyarrow("pyarrow.ipc")
+            self._sink = self._pa.OSFile(str(part), "wb")
+            options = ipc.IpcWriteOptions(emit_dictionary_deltas=True)
+            self._writer = ipc.new_file(self._sink, self._schema, options=options)
+        return self._writer
+
+    def _close(self) -> None:
+        """Completes the current archive file."""
+        if self._writer is None or self._path is None:
+            return
+        self._writer.close()
+        if self._sink is not None:
+            self._sink.close()
+            self._sink = None
+        self._writer = None
+        self._path.with_name(self._path.name + _PART_SUFFIX).replace(self._path)
+        self._files.append(self._path)
+        self._path = None
+
+    def _write_batch(self, records: list["Record"]) -> None:
+        """Writes a batch of records as one row group, rolling the file over on size or age."""
+        if self._writer is not None and time.monotonic() - self._opened_at >= self._max_file_seconds:
+            self._close()
+        writer = self._writer if self._writer is not None else self._open()
+
+        batch = self.record_batch(records)
+        if self._format is ArchiveFormat.PARQUET:
+            writer.write_batch(batch, row_group_size=len(records))
+        else:
+            writer.write_batch(batch)
+
+        if self._path is not None and self._path.with_name(self._path.name + _PART_SUFFIX).stat().st_size >= (
+            self._max_file_bytes
+        ):
+            self._close()
+
+    def stop(self, timeout: float | None = 5.0) -> None:
+        """Writes what is still queued, completes the current file and stops the worker.
+
+        Args:
+            timeout: Maximum time, in seconds, to wait for the worker to finish.
+        """
+        super().stop(timeout)
+        self._close()
+
+
+def archive_files(directory: str | os.PathLike[str]) -> list[Path]:
+    """Returns the completed archive files of a directory, oldest first."""
+    paths = (path for path in Path(directory).iterdir() if path.suffix in _EXTENSIONS.values())
+    return sorted(paths, key=lambda path: path.name)
+
+
+def read_archive(
+    directory: str | os.PathLike[str] | Iterable[Path],
+    columns: Sequence[str] | None = None,
+    start: datetime | None = None,
+    end: datetime | None = None,
+) -> "DataFrame":
+    """Loads archived signals into a pandas DataFrame.
+
+    Only the requested columns are read: Parquet files are read column by column, skipping the row groups outside
+    the time range, and Arrow files are memory-mapped. Dictionary-encoded columns are loaded as categoricals.
+
+    Args:
+        directory: Archive directory, or the archive files to read.
+        columns: Columns to load, among `ARCHIVE_COLUMNS`. None loads every column.
+        start: Only loads signals emitted at or after this time.
+        end: Only loads signals emitted before this time.
+
+    Returns:
+        A DataFrame with one row per signal.
+    """
+    pa = import_pyarrow()
+    dataset = import_pyarrow("pyarrow.dataset")
+    paths = archive_files(directory) if isinstance(directory, str | os.PathLike) else list(directory)
+
+    condition = None
+    if start is not None:
+        condition = dataset.field("time") >= pa.scalar(start, pa.timestamp("ns", tz="UTC"))
+    if end is not None:
+        before_end = dataset.field("time") < pa.scalar(end, pa.timestamp("ns", tz="UTC"))
+        condition = before_end if condition is None else condition & before_end
+
+    selected = list(columns) if columns is not None else list(ARCHIVE_COLUMNS)
+    tables: list[Any] = []
+    for archive_format, extension in _EXTENSIONS.items():
+        files = [str(path) for path in paths if path.suffix == extension]
+        if files:
+            file_format = "parquet" if archive_format is ArchiveFormat.PARQUET else "ipc"
+            source = dataset.dataset(files, schema=archive_schema(), format=file_format)
+            tables.append(source.to_table(columns=selected, filter=condition))
+
+    if not tables:
+        return archive_schema().empty_table().select(selected).to_pandas()
+    return pa.concat_tables(tables).to_pandas()
@@ -0,0 +1,189 @@
+"""Collection of the signals emitted by worker processes."""
+
+import multiprocessing
+import os
+import pickle
+import threading
+from multiprocessing.util import Finalize
+from types import TracebackType
+from typing import TYPE_CHECKING, Any, NamedTuple, Self
+
+from telemetry.config import SignalsConfig
+from telemetry.context import GroupFrame
+from telemetry.shipping import BatchShipper
+
+if TYPE_CHECKING:
+    from multiprocessing.context import BaseContext
+    from multiprocessing.queues import Queue
+
+    from telemetry.signals import Signals
+
+type ForwardedRecord = tuple[str, str, dict[str, Any]]
+"""Level, message and fields of a signal emitted by a worker process."""
+
+type ForwardedBatch = tuple[int, bytes] | None
+"""Process id of the worker and pickled list of `ForwardedRecord`; None stops the collector."""
+
+
+class CollectorHandle(NamedTuple):
+    """Everything a worker process needs to forward its signals to a `SignalsCollector`.
+
+    Handles hold a multiprocessing queue: they must reach the workers when the processes are started, as `Process`
+    arguments or `ProcessPoolExecutor` initializer arguments, not as task arguments. They are pickled with the
+    configuration, whose `event_id_factory` and route predicates must therefore be picklable.
+    """
+
+    queue: "Queue[ForwardedBatch]"
+    config: SignalsConfig
+    job_uuid: str
+    group: GroupFrame | None
+    min_level: float
+
+
+class RecordForwarder(BatchShipper[ForwardedRecord]):
+    """Stands in for the logger of a worker process Signals instance, forwarding its records to the collector.
+
+    Records are batched like the Loki shipper does and each batch is pickled on the background worker, so emitting a
+    signal in a worker process costs an enqueue.
+    """
+
+    def __init__(self, queue: "Queue[ForwardedBatch]", level_numbers: dict[str, int], **kwargs: Any) -> None:
+        """Initializes the forwarder.
+
+        Args:
+            queue: Collector queue receiving the batches.
+            level_numbers: Severity number of each level name, used by the overflow policy.
+            **kwargs: Queue options forwarded to `BatchShipper`.
+        """
+        self._collector_queue = queue
+        super().__init__(
+            self._send,
+            level_of=lambda record: level_numbers.get(record[0], 0),
+            name="signals-record-forwarder",
+            **kwargs,
+        )
+        # worker processes leave through multiprocessing finalizers, which run before the queue is flushed; sending to
+        # the collector never blocks, so the last batches are waited for without a timeout
+        Finalize(self, self.stop, args=(None,), exitpriority=10)
+
+    def log(self, level: str, message: str, **fields: Any) -> None:
+        """Queues a record, with the same signature as the loguru `log` method."""
+        self.put((level, message, fields))
+
+    def _send(self, records: list[ForwardedRecord]) -> None:
+        """Pickles a batch of records and sends it to the collector."""
+        try:
+            payload = pickle.dumps(records, pickle.HIGHEST_PROTOCOL)
+        except Exception:  # noqa: BLE001
+            payload = pickle.dumps([_picklable(record) for record in records], pickle.HIGHEST_PROTOCOL)
+        self._collector_queue.put((os.getpid(), payload))
+
+
+class SignalsCollector:
+    """Receives the signals forwarded by worker processes and emits them through the sinks of a Signals instance.
+
+    The parent process owns every sink and shipper; workers get a forwarding Signals instance from `worker_signals`,
+    which inherits the job UUID and the group that was current when the handle was taken.
+
+    Example:
+        >>> with SignalsCollector(signals) as collector, ProcessPoolExecutor(
+        ...     initializer=worker_signals, initargs=(collector.handle(),)
+        ... ) as pool:
+        ...     pool.map(work, items)
+    """
+
+    def __init__(self, signals: "Signals", context: "BaseContext | None" = None) -> None:
+        """Initializes the collector and starts its listener thread.
+
+        Args:
+            signals: Instance whose sinks receive the forwarded signals.
+            context: Multiprocessing context used by the workers. Defaults to the current start method.
+        """
+        self._signals = signals
+        self._queue: Queue[ForwardedBatch] = (context or multiprocessing.get_context()).Queue()
+        self._received: int = 0
+        self._failed: int = 0
+        self._last_error: BaseException | None = None
+        self._listener = threading.Thread(target=self._run, name="signals-collector", daemon=True)
+        self._listener.start()
+
+    @property
+    def received(self) -> int:
+        """Returns the number of signals received from the workers."""
+        return self._received
+
+    @property
+    def failed(self) -> int:
+        """Returns the number of forwarded batches that could not be unpickled or emitted, in whole or in part."""
+        return self._failed
+
+    @property
+    def last_error(self) -> BaseException | None:
+        """Returns the last error raised while unpickling or emitting a forwarded batch, if any."""
+        return self._last_error
+
+    def handle(self) -> CollectorHandle:
+        """Returns a handle for the workers, inheriting the group current in the calling thread or task."""
+        return CollectorHandle(
+            queue=self._queue,
+            config=self._signals.config,
+            job_uuid=self._signals.job_uuid,
+            group=self._signals.current_group,
+            min_level=self._signals.min_level,
+        )
+
+    def _run(self) -> None:
+        """Listener loop: emits the forwarded signals until the collector is stopped.
+
+        A batch that cannot be unpickled or emitted is counted as failed, and the loop goes on with the next one.
+        """
+        emit = self._signals.emit_forwarded
+        while (batch := self._queue.get()) is not None:
+            pid, payload = batch
+            try:
+                records: list[ForwardedRecord] = pickle.loads(payload)  # noqa: S301
+                for level, message, fields in records:
+                    emit(level, message, fields, worker_pid=pid)
+                    self._received += 1
+            except Exception as error:  # noqa: BLE001
+                self._failed += 1
+                self._last_error = error
+
+    def stop(self, timeout: float | None = 5.0) -> None:
+        """Emits the signals sent so far and stops the listener.
+
+        Workers must have exited, or flushed their Signals instance, for their last signals to be collected.
+
+        Args:
+            timeout: Maximum time, in seconds, to wait for the listener to finish.
+        """
+        if self._listener.is_alive():
+            self._queue.put(None)
+            self._listener.join(timeout)
+
+    def __enter__(self) -> Self:
+        """Returns the collector."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Stops the collector."""
+        self.stop()
+
+
+def _picklable(record: ForwardedRecord) -> ForwardedRecord:
+    """Replaces the fields of a record that cannot be pickled by their representation."""
+    level, message, fields = record
+    safe: dict[str, Any] = {}
+    for key, value in fields.items():
+        try:
+            pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        except Exception:  # noqa: BLE001
+            safe[key] = repr(value)
+        else:
+            safe[key] = value
+    return level, message, safe
@@ -1,11 +1,123 @@
 """Sets the configuration to use Telemetry module."""
 
+from collections.abc import Callable
 from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from telemetry.enums import ArchiveFormat, FsyncPolicy, LoggerLevel, OverflowPolicy
+from tools.uuid import IdFormat
+
+if TYPE_CHECKING:
+    from enum import IntEnum
+
+    from loguru import Record
+
+
+@dataclass(frozen=True)
+class SignalsRoute:
+    """Entry of the routing table: the signals it matches and the named sinks they go to.
+
+    A signal matches when its level is one of `levels`, it was emitted in one of `groups` and `predicate` returns True
+    for its record; an empty criterion matches every signal. A signal goes to the sinks of every route it matches.
+
+    Example:
+        routes=(
+            SignalsRoute(sinks=("debug_file",), levels=("TRACE", "DEBUG")),
+            SignalsRoute(sinks=("loki", "archive"), levels=(SignalsLevel.BUSINESS, SignalsLevel.DATASET)),
+            SignalsRoute(sinks=("stdout", "debug_file", "loki", "archive"), levels=("ERROR", "CRITICAL")),
+        )
+
+    Attributes:
+        sinks (tuple[str, ...]): Names of the sinks: `stdout`, `loki`, `archive` or a key of `SignalsConfig.file_sinks`.
+        levels (tuple[str | IntEnum, ...]): Level names or members, such as `"DEBUG"` or `SignalsLevel.DATASET`.
+        groups (tuple[str, ...]): Titles of the processes, tasks or steps the signals are emitted in, compared
+            case-insensitively with the innermost group.
+        predicate (Callable[[Record], bool] | None): Called with the loguru record of the signals matching the other
+            criteria.
+    """
+
+    sinks: tuple[str, ...]
+    levels: "tuple[str | IntEnum, ...]" = ()
+    groups: tuple[str, ...] = ()
+    predicate: "Callable[[Record], bool] | None" = None
 
 
 @dataclass
 class SignalsConfig:
-    """Telemetry."""
+    """Telemetry.
+
+    Configurations reach the worker processes of a `SignalsCollector` pickled, in its handle: they must then be
+    picklable, so `event_id_factory` and the route predicates must be module-level functions, not lambdas or closures.
+
+    Attributes:
+        loki_url (str | None): Loki push endpoint. None reads the `LOKI_URL` environment variable, and ships nothing to
+            Loki when it is not set either.
+        loki_log_from_level (int): Minimum level shipped to Loki.
+        loki_queue_size (int): Maximum number of records waiting to be shipped to Loki.
+        loki_batch_size (int): Number of records that triggers a push to Loki.
+        loki_flush_interval (float): Maximum age, in seconds, of a queued record before it is pushed to Loki.
+        loki_overflow_policy (OverflowPolicy): What to do with new records when the Loki queue is full.
+        loki_overflow_level (int): Level used by `OverflowPolicy.DROP_BELOW_LEVEL` to decide what can be dropped.
+        loki_push_timeout (float): Maximum time, in seconds, to wait for Loki to answer a push.
+        loki_label_keys (tuple[str, ...]): Record fields promoted to Loki stream labels, next to the application and
+            environment. Each distinct combination of values is a stream, so only low-cardinality fields belong here;
+            identifiers such as `job_uuid` or `parent_uuid` stay in the line, where `| json` extracts them.
+        loki_metadata_keys (tuple[str, ...]): Record fields also attached to each line as Loki structured metadata,
+            filterable without parsing the line. Requires Loki 2.9 or later with structured metadata allowed.
+        loki_max_label_values (int | None): Maximum number of distinct values of each stream label; the next values
+            are replaced by `__overflow__` in the label and kept in the line. None does not limit them.
+        loki_max_in_flight (int): Maximum number of concurrent pushes to Loki from `AsyncSignals`, each on its own
+            keep-alive connection.
+        loki_spool_directory (str | None): Directory of the write-ahead spool keeping the batches until Loki
+            acknowledges them. None pushes the batches directly and loses them when Loki is unavailable.
+        loki_spool_segment_size (int): Size, in bytes, of each spool segment file.
+        loki_spool_max_bytes (int | None): Maximum size of the spool; the oldest segments are dropped beyond it.
+        loki_spool_fsync (FsyncPolicy): When spooled batches are forced to disk.
+        loki_spool_mmap (bool): Writes the active spool segment through a memory map.
+        loki_replay_rate (float): Maximum number of spooled batches pushed per second while replaying a backlog.
+        archive_directory (str | None): Directory of the columnar archive of signals. None disables the archive, which
+            requires pyarrow.
+        archive_format (ArchiveFormat): File format of the archive.
+        archive_log_from_level (int): Minimum level archived.
+        archive_row_group_size (int): Number of signals per row group.
+        archive_flush_interval (float): Maximum time, in seconds, a signal waits before being archived.
+        archive_max_file_bytes (int): Size, in bytes, at which an archive file is completed.
+        archive_max_file_seconds (float): Age, in seconds, at which an archive file is completed.
+        suppression_rate (float | None): Signals per second let through for each level and message template, i.e. the
+            message with its quoted values and the words holding a digit masked; the others are dropped and counted on
+            the next one let through. None disables rate limiting.
+        suppression_level_rates (dict[str, float] | None): Rates overriding `suppression_rate` for some levels, by
+            level name.
+        suppression_burst (int): Signals of the same level and message template let through at once before the rate
+            applies.
+        suppression_window (float): Window, in seconds, during which signals identical to an emitted one are only
+            counted, then emitted once with their repeat count and first and last seen times. Zero disables it.
+        event_id_format (IdFormat): Format of the job, group and event identifiers.
+        event_id_factory (Callable[[], str] | None): Custom identifier generator, replacing `event_id_format`.
+        span_cpu_time (bool): Adds the CPU time of the current thread to the end signal of processes, tasks and steps.
+        span_memory (bool): Adds the resident memory variation to the end signal of processes, tasks and steps.
+        stats_interval (float): Interval, in seconds, at which `Signals.stats` is emitted as a DEVOPS signal. Zero
+            disables it.
+        metrics_flush_interval (float): Interval, in seconds, at which the metrics aggregated in every group are
+            emitted and reset. Zero only emits them when their group ends and on flush.
+        dataset_profile_sample_size (int | None): Number of rows sampled to profile the datasets given to
+            `Signals.dataset`, for distinct estimates, non-numeric ranges and deep memory usage. None uses every row.
+        dataset_profile_max_columns (int): Maximum number of columns profiled per dataset.
+        fingerprint_datasets (bool): Adds the content fingerprint of the datasets given to `Signals.dataset`.
+        fingerprint_cache_path (str | None): File caching the fingerprints of the files given to
+            `Signals.data_source` across runs, by path, size and modification time. None caches them in memory only.
+        fingerprint_chunk_size (int): Size, in bytes, of the chunks files are hashed in.
+        fingerprint_workers (int): Number of threads hashing file chunks and DataFrame columns.
+        docs_directory (str | None): Directory recording the documents shipped to Loki by `Signals.docs`, per
+            application, environment and Loki URL, so that they are only sent once across runs. None only deduplicates
+            them within the process.
+        docs_chunk_size (int): Size, in bytes, above which a document is shipped in several signals.
+        file_sinks (dict[str, str] | None): Files the signals are written to, in the stdout format, by sink name.
+        routes (tuple[SignalsRoute, ...] | None): Routing table of the signals to the named sinks: `stdout`, `loki`
+            when a Loki URL is set, `archive` when an archive directory is set, and the `file_sinks`. Each sink then
+            only receives the signals routed to it, whatever its `*_log_from_level`, and writes them from a queue and
+            worker of its own. None sends every signal to every sink, from its `*_log_from_level`.
+    """
 
     environment: str
     app_name: str
@@ -13,3 +125,48 @@ class SignalsConfig:
     log_from_level: int = 0
     parent_uuid: str | None = None
     use_singleton_design_pattern: bool = True
+    loki_url: str | None = None
+    loki_log_from_level: int = LoggerLevel.DEBUG
+    loki_queue_size: int = 10_000
+    loki_batch_size: int = 500
+    loki_flush_interval: float = 1.0
+    loki_overflow_policy: OverflowPolicy = OverflowPolicy.DROP_OLDEST
+    loki_overflow_level: int = LoggerLevel.WARNING
+    loki_push_timeout: float = 10.0
+    loki_label_keys: tuple[str, ...] = ("level",)
+    loki_metadata_keys: tuple[str, ...] = ()
+    loki_max_label_values: int | None = 100
+    loki_max_in_flight: int = 2
+    loki_spool_directory: str | None = None
+    loki_spool_segment_size: int = 16 * 1024 * 1024
+    loki_spool_max_bytes: int | None = 1024 * 1024 * 1024
+    loki_spool_fsync: FsyncPolicy = FsyncPolicy.SEGMENT
+    loki_spool_mmap: bool = False
+    loki_replay_rate: float = 10.0
+    archive_directory: str | None = None
+    archive_format: ArchiveFormat = ArchiveFormat.PARQUET
+    archive_log_from_level: int = LoggerLevel.DEBUG
+    archive_row_group_size: int = 10_000
+    archive_flush_interval: float = 5.0
+    archive_max_file_bytes: int = 128 * 1024 * 1024
+    archive_max_file_seconds: float = 3600.0
+    suppression_rate: float | None = None
+    suppression_level_rates: dict[str, float] | None = None
+    suppression_burst: int = 10
+    suppression_window: float = 0.0
+    event_id_format: IdFormat = IdFormat.UUID
+    event_id_factory: Callable[[], str] | None = None
+    span_cpu_time: bool = False
+    span_memory: bool = False
+    stats_interval: float = 0.0
+    metrics_flush_interval: float = 0.0
+    dataset_profile_sample_size: int | None = 100_000
+    dataset_profile_max_columns: int = 100
+    fingerprint_datasets: bool = True
+    fingerprint_cache_path: str | None = None
+    fingerprint_chunk_size: int = 8 * 1024 * 1024
+    fingerprint_workers: int = 4
+    docs_directory: str | None = None
+    docs_chunk_size: int = 64 * 1024
+    file_sinks: dict[str, str] | None = None
+    routes: tuple[SignalsRoute, ...] | None = None
@@ -0,0 +1,80 @@
+"""Context-local group hierarchy."""
+
+from contextvars import ContextVar
+from typing import NamedTuple
+
+from telemetry.enums import SignalsGroup
+
+
+class GroupFrame(NamedTuple):
+    """A started process, task or step, linked to the group that was current when it started.
+
+    Frames are immutable: starting a group pushes a new frame on top of the current one, so every thread and asyncio
+    task holding its own context sees its own hierarchy.
+    """
+
+    uuid: str | None
+    name: str | None
+    group: SignalsGroup | None = None
+    parent: "GroupFrame | None" = None
+
+
+class GroupContext:
+    """Keeps the current `GroupFrame` of a Signals instance in a `ContextVar`.
+
+    Threads start with an empty hierarchy and asyncio tasks inherit the frame that was current when they were created;
+    groups started afterwards are only visible to the thread or task that started them. A thread runs under the current
+    frame when its target runs in a copy of the current context, e.g.
+    `threading.Thread(target=contextvars.copy_context().run, args=(target,))`.
+    """
+
+    def __init__(self, name: str, root: GroupFrame | None = None) -> None:
+        """Initializes the context variable.
+
+        Args:
+            name: Name of the underlying context variable.
+            root: Frame current in every context where no group was started, e.g. a group inherited from another
+                process.
+        """
+        self._root = root
+        self._current: ContextVar[GroupFrame | None] = ContextVar(name, default=root)
+        # frames whose `with` block is running, by id, in every context; they are never replaced
+        self._entered: dict[int, GroupFrame] = {}
+
+    @property
+    def current(self) -> GroupFrame | None:
+        """Returns the current frame, or None when no group was started in this context."""
+        return self._current.get()
+
+    def push(self, group: SignalsGroup | None, uuid: str | None, name: str | None) -> GroupFrame:
+        """Makes a new frame the current frame.
+
+        The new frame is a child of the current one, unless a group of the same kind, started without a `with` block
+        or already ended, is in the current hierarchy: the new frame then takes its place, under the same parent.
+        Groups started without a `with` block are never ended, so that each of them replaces the previous one of its
+        kind instead of nesting under it, and the hierarchy stays as deep as there are kinds of groups. Groups whose
+        `with` block is running, see `enter`, and the root frame are never replaced: groups of their kind nest under
+        them.
+        """
+        parent = frame = self._current.get()
+        while group is not None and frame is not None and frame is not self._root:
+            if frame.group is group:
+                if id(frame) not in self._entered:
+                    parent = frame.parent
+                break
+            frame = frame.parent
+        frame = GroupFrame(uuid=uuid, name=name, group=group, parent=parent)
+        self._current.set(frame)
+        return frame
+
+    def enter(self, frame: GroupFrame) -> None:
+        """Marks a frame as entered by a `with` block, until `exit`: groups of its kind then nest under it."""
+        self._entered[id(frame)] = frame
+
+    def exit(self, frame: GroupFrame) -> None:
+        """Marks a frame as ended."""
+        self._entered.pop(id(frame), None)
+
+    def replace(self, frame: GroupFrame | None) -> None:
+        """Makes `frame` the current frame."""
+        self._current.set(frame)
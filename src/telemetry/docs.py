@@ -0,0 +1,125 @@
+"""Documents emitted by DOCS signals: file and glob expansion, chunking, and the record of what was shipped.
+
+Documents are content addressed by their fingerprint. A document already shipped to Loki for the application and
+environment is emitted as a reference to its fingerprint rather than in full, so unchanged documentation is sent once,
+not on every run. A document only counts as shipped once every signal carrying it was pushed.
+"""
+
+import codecs
+import glob
+import os
+import threading
+import urllib.parse
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import BinaryIO
+
+_GLOB_CHARACTERS = frozenset("*?[")
+
+
+def expand_paths(paths: "str | os.PathLike[str] | Iterable[str | os.PathLike[str]]") -> list[Path]:
+    """Returns the files named by paths and glob patterns, such as `docs/**/*.md`, in order and without duplicates.
+
+    Raises:
+        FileNotFoundError: If a path that is not a pattern does not exist.
+    """
+    files: dict[Path, None] = {}
+    for path in [paths] if isinstance(paths, str | os.PathLike) else paths:
+        name = os.fspath(path)
+        if _GLOB_CHARACTERS.isdisjoint(name):
+            if not Path(name).is_file():
+                msg = f"No such document: {name!r}"
+                raise FileNotFoundError(msg)
+            files[Path(name)] = None
+        else:
+            matches = glob.glob(name, recursive=True)  # noqa: PTH207
+            files.update(dict.fromkeys(Path(match) for match in sorted(matches)))
+    return [file for file in files if file.is_file()]
+
+
+def text_chunks(stream: BinaryIO, chunk_size: int) -> Iterator[str]:
+    """Reads a UTF-8 document in chunks of `chunk_size` bytes, never splitting a character.
+
+    A document of `size` bytes yields `max(1, ceil(size / chunk_size))` chunks, an empty one included. Undecodable
+    bytes are replaced, so that any file can be shipped as text.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    data = stream.read(chunk_size)
+    while True:
+        following = stream.read(chunk_size) if data else b""
+        yield decoder.decode(data, final=not following)
+        if not following:
+            return
+        data = following
+
+
+class ShippedDocs:
+    """Fingerprints of the documents already shipped to a destination for an application and environment.
+
+    With a directory, each shipped document is recorded as an empty file named after its fingerprint, under
+    `<directory>/<app_name>/<environment>/<destination>`, which concurrent processes can create and test safely; the
+    record then spans runs. Without one, documents are only deduplicated for the lifetime of the process. Without a
+    destination, nothing is recorded and every document is emitted in full.
+    """
+
+    def __init__(
+        self, directory: str | os.PathLike[str] | None, app_name: str, environment: str, destination: str | None
+    ) -> None:
+        """Initializes the record.
+
+        Args:
+            directory: Directory of the record. None keeps it in memory.
+            app_name: Application the documents are shipped for.
+            environment: Environment the documents are shipped for.
+            destination: Where the documents are shipped to, such as the Loki push URL. None records nothing.
+        """
+        self._directory = (
+            Path(directory)
+            / urllib.parse.quote(app_name, safe="")
+            / urllib.parse.quote(environment, safe="")
+            / urllib.parse.quote(destination, safe="")
+            if directory is not None and destination is not None
+            else None
+        )
+        self._lock = threading.Lock()
+        self._shipped: set[str] = set()
+        # chunks delivered so far of the documents shipped in several signals, by fingerprint
+        self._chunks: dict[str, set[int]] = {}
+
+    def __contains__(self, fingerprint: object) -> bool:
+        """Returns whether a document with this fingerprint was shipped."""
+        if not isinstance(fingerprint, str):
+            return False
+        with self._lock:
+            if fingerprint in self._shipped:
+                return True
+        if self._directory is not None and (self._directory / fingerprint).exists():
+            with self._lock:
+                self._shipped.add(fingerprint)
+            return True
+        return False
+
+    def delivered(self, fingerprint: str, chunk: int = 1, chunks: int = 1) -> None:
+        """Records that a signal carrying a document was pushed; the document is shipped once all its chunks were.
+
+        Args:
+            fingerprint: Fingerprint of the document.
+            chunk: Number of the chunk carried by the signal, from 1.
+            chunks: Number of chunks of the document.
+        """
+        if chunks > 1:
+            with self._lock:
+                received = self._chunks.setdefault(fingerprint, set())
+                received.add(chunk)
+                if len(received) < chunks:
+                    return
+                del self._chunks[fingerprint]
+        self.add(fingerprint)
+
+    def add(self, fingerprint: str) -> None:
+        """Records that the document with this fingerprint was shipped."""
+        with self._lock:
+            self._shipped.add(fingerprint)
+        if self._directory is not None:
+            self._directory.mkdir(parents=True, exist_ok=True)
+            (self._directory / fingerprint).touch()
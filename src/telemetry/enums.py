@@ -120,3 +120,74 @@ class Handler(IntEnum):
     def __str__(self) -> str:
         """Overwrites the __str__ method to retrieve the name.title() of the severity level."""
         return self.name.title()
+
+
+class OverflowPolicy(IntEnum):
+    """Enumeration to define what happens when a shipping queue is full.
+
+    Attributes:
+        BLOCK (int): The emitting thread waits until the background worker frees room in the queue.
+        DROP_OLDEST (int): The oldest queued record is discarded to make room for the new one.
+        DROP_BELOW_LEVEL (int): Records below the configured overflow level are discarded, while records at or above
+            it evict the oldest queued record below that level (or the oldest record if there is none).
+    """
+
+    BLOCK = 1
+    DROP_OLDEST = 2
+    DROP_BELOW_LEVEL = 3
+
+    def __str__(self) -> str:
+        """Overwrites the __str__ method to retrieve the name.title() of the overflow policy."""
+        return self.name.title()
+
+
+class FsyncPolicy(IntEnum):
+    """Enumeration to define when spooled signals are forced to disk.
+
+    Attributes:
+        NEVER (int): Writes are left to the operating system, which flushes them on its own schedule.
+        SEGMENT (int): Each spool segment is forced to disk when it is sealed.
+        BATCH (int): Each batch is forced to disk as soon as it is spooled.
+    """
+
+    NEVER = 1
+    SEGMENT = 2
+    BATCH = 3
+
+    def __str__(self) -> str:
+        """Overwrites the __str__ method to retrieve the name.title() of the fsync policy."""
+        return self.name.title()
+
+
+class ArchiveFormat(IntEnum):
+    """Enumeration to define the file format of the signals archive.
+
+    Attributes:
+        PARQUET (int): Parquet files, one row group per written batch, compressed with zstd.
+        ARROW (int): Arrow IPC files, one record batch per written batch, readable through a memory map.
+    """
+
+    PARQUET = 1
+    ARROW = 2
+
+    def __str__(self) -> str:
+        """Overwrites the __str__ method to retrieve the name.title() of the archive format."""
+        return self.name.title()
+
+
+class MetricKind(IntEnum):
+    """Enumeration of the metrics aggregated in memory and emitted as one signal per group.
+
+    Attributes:
+        COUNTER (int): Sum of the recorded values, e.g. rows processed.
+        GAUGE (int): Last recorded value, with its minimum, maximum and mean, e.g. a queue depth.
+        HISTOGRAM (int): Distribution of the recorded values, summarized by percentiles, e.g. a latency per batch.
+    """
+
+    COUNTER = 1
+    GAUGE = 2
+    HISTOGRAM = 3
+
+    def __str__(self) -> str:
+        """Overwrites the __str__ method to retrieve the name.title() of the metric kind."""
+        return self.name.title()
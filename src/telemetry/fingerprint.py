@@ -0,0 +1,329 @@
+"""Content fingerprints of the files and DataFrames named by DATA_SOURCE and DATASET signals.
+
+A fingerprint is a SHA-256 digest of the content, hardware-accelerated on most CPUs and stable across runs, so
+downstream checks can tell whether the inputs of a job changed. Files are read through mmap in fixed-size chunks
+hashed on a thread pool, and their fingerprints are cached by path, size, modification time and inode: an unchanged
+file is not read again, within the process or, with a cache file, across runs. DataFrames are hashed column by column
+over their raw buffers.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import threading
+import time
+from collections.abc import Iterable
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+if TYPE_CHECKING:
+    from concurrent.futures import ThreadPoolExecutor
+
+    from pandas import DataFrame  # pyright: ignore[reportMissingTypeStubs]
+
+# files modified this recently may change again within the same mtime tick, so their fingerprint is not cached
+_RACY_WINDOW_NS = 2_000_000_000
+# numpy dtype kinds hashed over their raw buffer: bool, integers, floats, complex, timedelta and datetime
+_BUFFER_KINDS = frozenset("biufcmM")
+
+
+class _FileState(NamedTuple):
+    """What a cached fingerprint of a file is valid for."""
+
+    size: int
+    mtime_ns: int
+    inode: int
+    chunk_size: int
+
+
+def _file_state(stat: os.stat_result, chunk_size: int) -> _FileState:
+    """Returns the state of a file a fingerprint is cached for."""
+    return _FileState(stat.st_size, stat.st_mtime_ns, stat.st_ino, chunk_size)
+
+
+def _hash_chunk(path: str, offset: int, length: int) -> bytes:
+    """Returns the digest of a chunk of a file, read through mmap."""
+    with (
+        open(path, "rb") as file,  # noqa: PTH123
+        mmap.mmap(file.fileno(), length, access=mmap.ACCESS_READ, offset=offset) as view,
+    ):
+        return hashlib.sha256(view).digest()
+
+
+class FingerprintCache:
+    """Fingerprints of files by resolved path, optionally persisted to a JSON file.
+
+    The file is loaded on first use and rewritten atomically whenever fingerprints were added, so a crash never leaves
+    it half-written.
+    """
+
+    def __init__(self, path: str | os.PathLike[str] | None = None) -> None:
+        """Initializes the cache.
+
+        Args:
+            path: File persisting the cache across runs. None keeps it in memory for the lifetime of the process.
+        """
+        self._path = Path(path) if path is not None else None
+        self._lock = threading.Lock()
+        self._entries: dict[str, tuple[_FileState, str]] | None = None
+        self._dirty = False
+
+    def get(self, key: str, state: _FileState) -> str | None:
+        """Returns the cached fingerprint of a file, if the file is still in the given state."""
+        with self._lock:
+            entry = self._load().get(key)
+        return entry[1] if entry is not None and entry[0] == state else None
+
+    def put(self, key: str, state: _FileState, fingerprint: str) -> None:
+        """Caches the fingerprint of a file in the given state."""
+        with self._lock:
+            self._load()[key] = (state, fingerprint)
+            self._dirty = True
+
+    def save(self) -> None:
+        """Writes the cache to its file, if fingerprints were added since it was last written."""
+        with self._lock:
+            if self._path is None or not self._dirty or self._entries is None:
+                return
+            entries = {key: [*state, fingerprint] for key, (state, fingerprint) in self._entries.items()}
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            temporary = self._path.with_name(f"{self._path.name}.tmp")
+            temporary.write_text(json.dumps(entries, separators=(",", ":")))
+            temporary.replace(self._path)
+            self._dirty = False
+
+    def _load(self) -> dict[str, tuple[_FileState, str]]:
+        """Returns the entries, read from the cache file on first use; an unreadable file is ignored."""
+        if self._entries is None:
+            self._entries = {}
+            if self._path is not None and self._path.exists():
+                try:
+                    stored: dict[str, list[Any]] = json.loads(self._path.read_text())
+                    self._entries = {key: (_FileState(*entry[:4]), entry[4]) for key, entry in stored.items()}
+                except (OSError, ValueError, TypeError, IndexError):
+                    self._entries = {}
+        return self._entries
+
+
+class FrameDigest:
+    """Incremental fingerprint of a DataFrame, given whole or chunk by chunk.
+
+    Each column is hashed over its raw buffer when it has a numpy dtype, over its UTF-8 encoded values when it holds
+    strings, and over `pandas.util.hash_pandas_object` otherwise; the index is left out. Values it cannot hash, such
+    as lists and dicts, are hashed over their JSON representation, with the position of nulls. A frame and the
+    concatenation of its chunks have the same fingerprint as long as the columns keep their dtype, and their values
+    stay hashable or not in every chunk.
+
+    A chunk that cannot be fingerprinted at all stops the digest: `error` then holds the exception, and `hexdigest`
+    must not be used.
+
+    Attributes:
+        error: The exception raised by the chunk that could not be fingerprinted, or None.
+    """
+
+    def __init__(self, pool: "ThreadPoolExecutor | None" = None) -> None:
+        """Initializes an empty digest.
+
+        Args:
+            pool: Thread pool hashing the columns of a chunk concurrently. None hashes them in the calling thread.
+        """
+        self._pool = pool
+        self._rows = 0
+        self._columns: dict[str, tuple[str, Any, Any]] = {}
+        self.error: Exception | None = None
+
+    def update(self, chunk: "DataFrame") -> None:
+        """Adds a chunk of the frame to the digest; once a chunk failed, later chunks are ignored."""
+        if self.error is not None:
+            return
+        try:
+            self._update(chunk)
+        except Exception as error:  # noqa: BLE001
+            # fingerprints are informative: a frame failing to hash must not fail the signal, nor its profile
+            self.error = error
+
+    def _update(self, chunk: "DataFrame") -> None:
+        """Adds a chunk of the frame to the digest, raising when it cannot be hashed."""
+        frame: Any = chunk
+        self._rows += len(frame)
+        columns: list[Any] = []
+        hashers: list[Any] = []
+        layouts: list[Any] = []
+        for name, column in frame.items():
+            state = self._columns.get(str(name))
+            if state is None:
+                hasher, layout = hashlib.sha256(), hashlib.sha256()
+                state = self._columns[str(name)] = (str(column.dtype), hasher, layout)
+            columns.append(column)
+            hashers.append(state[1])
+            layouts.append(state[2])
+        if self._pool is None or len(columns) < 2:  # noqa: PLR2004
+            for column, hasher, layout in zip(columns, hashers, layouts, strict=True):
+                _hash_column(column, hasher, layout)
+        else:
+            list(self._pool.map(_hash_column, columns, hashers, layouts))
+
+    def hexdigest(self) -> str:
+        """Returns the fingerprint of the rows added so far."""
+        digest = hashlib.sha256(str(self._rows).encode())
+        for name, (dtype, hasher, layout) in self._columns.items():
+            digest.update(f"\0{name}\0{dtype}\0".encode())
+            digest.update(hasher.digest())
+            digest.update(layout.digest())
+        return digest.hexdigest()
+
+
+def _hash_column(column: Any, hasher: Any, layout: Any) -> None:
+    """Adds a chunk of a column to its hashers: `hasher` for the values and `layout` for the position of nulls."""
+    import numpy as np  # numpy and pandas are only imported to fingerprint frames
+    import pandas as pd  # pyright: ignore[reportMissingTypeStubs]
+
+    pandas: Any = pd
+    dtype = column.dtype
+    if isinstance(dtype, np.dtype) and dtype.kind in _BUFFER_KINDS:
+        hasher.update(np.ascontiguousarray(column.to_numpy()).view(np.uint8))
+    elif pandas.api.types.infer_dtype(column, skipna=True) in {"string", "empty"}:
+        missing = column.isna().to_numpy()
+        values = column.to_numpy(dtype=object)
+        if missing.any():
+            values = values[~missing]
+        layout.update(missing.view(np.uint8))
+        if len(values):
+            # each value is terminated, so that chunks hash as their concatenation
+            hasher.update(("\0".join(values) + "\0").encode("utf-8", "surrogatepass"))
+    else:
+        try:
+            hashes = pandas.util.hash_pandas_object(column, index=False)
+        except TypeError:
+            # unhashable values, such as lists and dicts
+            missing = column.isna().to_numpy()
+            values = column.to_numpy(dtype=object)[~missing]
+            layout.update(missing.view(np.uint8))
+            hasher.update("".join(f"{_json_value(value)}\0" for value in values).encode("utf-8", "surrogatepass"))
+        else:
+            hasher.update(hashes.to_numpy().view(np.uint8))
+
+
+def _json_value(value: Any) -> str:
+    """Returns a representation of a value stable across runs: JSON with sorted keys, or its repr."""
+    try:
+        return json.dumps(value, ensure_ascii=False, sort_keys=True, default=_json_default)
+    except (TypeError, ValueError):
+        return repr(value)
+
+
+def _json_default(value: Any) -> Any:
+    """Returns a JSON serializable form of a value: the sorted items of sets, the items of arrays, or its repr."""
+    if isinstance(value, set | frozenset):
+        return sorted(map(_json_value, value))  # pyright: ignore[reportUnknownArgumentType]
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    return repr(value)
+
+
+class Fingerprinter:
+    """Computes the fingerprints of files and DataFrames, caching those of files."""
+
+    def __init__(
+        self,
+        cache_path: str | os.PathLike[str] | None = None,
+        chunk_size: int = 8 * 1024 * 1024,
+        workers: int = 4,
+    ) -> None:
+        """Initializes the fingerprinter; its thread pool is started on first use.
+
+        Args:
+            cache_path: File persisting the fingerprints of files across runs. None caches them in memory only.
+            chunk_size: Size of the chunks files are hashed in, rounded up to the mmap allocation granularity.
+            workers: Number of threads hashing chunks and columns.
+        """
+        granularity = mmap.ALLOCATIONGRANULARITY
+        self._chunk_size = max(granularity, -(-chunk_size // granularity) * granularity)
+        self._workers = workers
+        self._cache = FingerprintCache(cache_path)
+        self._lock = threading.Lock()
+        self._pool: ThreadPoolExecutor | None = None
+
+    @property
+    def cache(self) -> FingerprintCache:
+        """Returns the cache of the fingerprints of files."""
+        return self._cache
+
+    def files(self, paths: Iterable[str | os.PathLike[str]]) -> dict[str, str]:
+        """Returns the fingerprints of files, by path as given.
+
+        Files whose size, modification time and inode match their cached fingerprint are not read. The chunks of the
+        others, whichever file they belong to, are hashed concurrently.
+
+        Raises:
+            OSError: If a file cannot be read.
+        """
+        fingerprints: dict[str, str] = {}
+        pending: list[tuple[str, str, _FileState, list[Any]]] = []
+        for path in paths:
+            name = os.fspath(path)
+            key = str(Path(name).resolve())
+            stat = os.stat(key)  # noqa: PTH116
+            state = _file_state(stat, self._chunk_size)
+            cached = self._cache.get(key, state)
+            if cached is not None:
+                fingerprints[name] = cached
+                continue
+            offsets = range(0, stat.st_size, self._chunk_size)
+            chunks = [
+                self._executor().submit(_hash_chunk, key, offset, min(self._chunk_size, stat.st_size - offset))
+                for offset in offsets
+            ]
+            pending.append((name, key, state, chunks))
+
+        now = time.time_ns()
+        for name, key, state, chunks in pending:
+            digest = hashlib.sha256(str(state.size).encode())
+            for chunk in chunks:
+                digest.update(chunk.result())
+            fingerprints[name] = digest.hexdigest()
+            if now - state.mtime_ns > _RACY_WINDOW_NS:
+                self._cache.put(key, state, fingerprints[name])
+        if pending:
+            self._cache.save()
+        return fingerprints
+
+    def file(self, path: str | os.PathLike[str]) -> str:
+        """Returns the fingerprint of a file; see `files`."""
+        return self.files([path])[os.fspath(path)]
+
+    def content(self, data: bytes) -> str:
+        """Returns the fingerprint of content held in memory, equal to that of a file with the same content."""
+        view = memoryview(data)
+        digest = hashlib.sha256(str(len(view)).encode())
+        for offset in range(0, len(view), self._chunk_size):
+            digest.update(hashlib.sha256(view[offset : offset + self._chunk_size]).digest())
+        return digest.hexdigest()
+
+    def frame_digest(self) -> FrameDigest:
+        """Returns an empty digest, fed chunk by chunk, hashing the columns of each chunk on the thread pool."""
+        return FrameDigest(self._executor())
+
+    def frame(self, frame: "DataFrame") -> str:
+        """Returns the fingerprint of a DataFrame; see `FrameDigest`."""
+        digest = self.frame_digest()
+        digest.update(frame)
+        return digest.hexdigest()
+
+    def close(self) -> None:
+        """Stops the thread pool and writes the cache."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown()
+        self._cache.save()
+
+    def _executor(self) -> "ThreadPoolExecutor":
+        """Returns the thread pool, started on first use."""
+        with self._lock:
+            if self._pool is None:
+                from concurrent.futures import ThreadPoolExecutor  # only started when something is fingerprinted
+
+                self._pool = ThreadPoolExecutor(max_workers=self._workers, thread_name_prefix="signals-fingerprint")
+            return self._pool
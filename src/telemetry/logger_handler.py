@@ -15,6 +15,8 @@ class LoggerHandler:
     def __init__(self) -> None:
         """Initializes class and attributes."""
         self._logger = loguru_logger
+        self._level_numbers: dict[str, int] = {}
+        self.__setup_default_levels()
         self.__setup_signals_event_types()
         self.__setup_signals_event_groups()
 
@@ -23,12 +25,22 @@ class LoggerHandler:
         """Returns logger instance."""
         return self._logger
 
+    @property
+    def level_numbers(self) -> dict[str, int]:
+        """Returns the severity number of every level known by the logger, indexed by level name."""
+        return self._level_numbers
+
+    def __setup_default_levels(self) -> None:
+        """Indexes loguru built-in levels by name."""
+        for name in ("TRACE", "DEBUG", "INFO", "SUCCESS", "WARNING", "ERROR", "CRITICAL"):
+            self._level_numbers[name] = self.logger.level(name).no
+
     def __add_level_to_logger(
         self, level: SignalsLevel | SignalsGroup, color: str = "<light-white>", icon: str | None = None
     ) -> None:
         """Adds custom level to logger."""
         self.logger.level(name=level.name, no=level.value, color=color, icon=icon)
-        self.logger.debug(f"level {level.name} added to logger.")
+        self._level_numbers[level.name] = level.value
 
     def __setup_signals_event_types(self) -> None:
         """Setup signals event types."""
@@ -40,6 +52,10 @@ class LoggerHandler:
         self.__add_level_to_logger(level=SignalsLevel.DATA_SOURCE, icon="🔍")
         # Docs signal
         self.__add_level_to_logger(level=SignalsLevel.DOCS, icon="📄")
+        # DataOps signal, e.g. metrics aggregated per group
+        self.__add_level_to_logger(level=SignalsLevel.DATAOPS, color="<cyan>", icon="📊")
+        # DevOps signal, e.g. the health of the telemetry pipeline itself
+        self.__add_level_to_logger(level=SignalsLevel.DEVOPS, color="<blue>", icon="⚙️")
 
     def __setup_signals_event_groups(self) -> None:
         """Setup signals event groups."""
@@ -0,0 +1,185 @@
+"""In-memory aggregation of metrics, emitted as one signal per group instead of one signal per measurement."""
+
+import abc
+import math
+import threading
+from typing import Any
+
+from telemetry.context import GroupFrame
+from telemetry.enums import MetricKind
+from telemetry.stats import Histogram
+
+# histogram buckets per power of two: a percentile is off by at most 1 / 8 of its value
+_SUB_BUCKETS = 8
+
+
+class _Metric(abc.ABC):
+    """Aggregate of the values recorded for one metric."""
+
+    __slots__ = ("count", "maximum", "minimum", "total")
+
+    kind: MetricKind
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total: float = 0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+
+    def add(self, value: float) -> None:
+        """Records a value."""
+        self.count += 1
+        self.total += value
+        self.minimum = min(self.minimum, value)
+        self.maximum = max(self.maximum, value)
+
+    @abc.abstractmethod
+    def summary(self) -> dict[str, Any]:
+        """Returns the summary statistics emitted for the metric."""
+
+
+class _Counter(_Metric):
+    """Sum of the recorded values."""
+
+    __slots__ = ()
+
+    kind = MetricKind.COUNTER
+
+    def summary(self) -> dict[str, Any]:
+        """Returns the sum and the number of updates."""
+        return {"kind": self.kind.name.lower(), "value": self.total, "updates": self.count}
+
+
+class _Gauge(_Metric):
+    """Last recorded value, with the minimum, maximum and mean of the recorded values."""
+
+    __slots__ = ("last",)
+
+    kind = MetricKind.GAUGE
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.last = 0.0
+
+    def add(self, value: float) -> None:
+        """Records a value."""
+        super().add(value)
+        self.last = value
+
+    def summary(self) -> dict[str, Any]:
+        """Returns the last value, its minimum, maximum and mean, and the number of updates."""
+        return {
+            "kind": self.kind.name.lower(),
+            "value": self.last,
+            "min": self.minimum,
+            "max": self.maximum,
+            "mean": self.total / self.count,
+            "updates": self.count,
+        }
+
+
+class _Histogram(_Metric):
+    """Distribution of the recorded values, in the logarithmic buckets of a `Histogram`.
+
+    Each power of two is split into 8 buckets, so percentiles are exact to within 12.5 %.
+    """
+
+    __slots__ = ("values",)
+
+    kind = MetricKind.HISTOGRAM
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.values = Histogram(_SUB_BUCKETS)
+
+    def add(self, value: float) -> None:
+        """Records a value."""
+        super().add(value)
+        self.values.record(value)
+
+    def summary(self) -> dict[str, Any]:
+        """Returns the number of values, their sum, mean, minimum, maximum and 50th, 90th and 99th percentiles."""
+        return {
+            "kind": self.kind.name.lower(),
+            "count": self.count,
+            "sum": self.total,
+            "mean": self.total / self.count,
+            "min": self.minimum,
+            "max": self.maximum,
+            "p50": self.values.percentile(50),
+            "p90": self.values.percentile(90),
+            "p99": self.values.percentile(99),
+        }
+
+
+_METRIC_TYPES: dict[MetricKind, type[_Metric]] = {
+    MetricKind.COUNTER: _Counter,
+    MetricKind.GAUGE: _Gauge,
+    MetricKind.HISTOGRAM: _Histogram,
+}
+
+
+class MetricsAggregator:
+    """Aggregates metrics per group and level until they are taken to be emitted.
+
+    Metrics recorded in a group are kept apart from those of its parent and children; each group emits its own when
+    it ends. Recording takes a lock shared by every group, held for a few dictionary operations.
+    """
+
+    def __init__(self) -> None:
+        """Initializes an empty aggregator."""
+        self._lock = threading.Lock()
+        self._groups: dict[tuple[str | None, str], tuple[GroupFrame | None, dict[str, _Metric]]] = {}
+
+    def record(self, frame: GroupFrame | None, level: str, kind: MetricKind, name: str, value: float) -> None:
+        """Records a value of a metric.
+
+        Args:
+            frame: Group the metric belongs to, or None for the job.
+            level: Level name of the signal the metric is emitted with.
+            kind: Kind of the metric.
+            name: Name of the metric, unique within the group and level.
+            value: Recorded value.
+
+        Raises:
+            ValueError: If the value is not finite, or if the metric was already recorded in the group with another
+                kind.
+        """
+        if not math.isfinite(value):
+            msg = f"Metric {name!r} got {value!r}; metric values must be finite."
+            raise ValueError(msg)
+        key = (frame.uuid if frame else None, level)
+        with self._lock:
+            group = self._groups.get(key)
+            if group is None:
+                group = self._groups[key] = (frame, {})
+            metric = group[1].get(name)
+            if metric is None:
+                metric = group[1][name] = _METRIC_TYPES[kind]()
+            elif metric.kind is not kind:
+                msg = f"Metric {name!r} is a {metric.kind.name.lower()}, not a {kind.name.lower()}."
+                raise ValueError(msg)
+            metric.add(value)
+
+    def take(self, frame: GroupFrame | None) -> list[tuple[GroupFrame | None, str, dict[str, dict[str, Any]]]]:
+        """Removes the metrics of a group and returns their summaries, per level."""
+        uuid = frame.uuid if frame else None
+        with self._lock:
+            keys = [key for key in self._groups if key[0] == uuid]
+            groups = [(key[1], self._groups.pop(key)) for key in keys]
+        return [(group_frame, level, _summaries(metrics)) for level, (group_frame, metrics) in groups]
+
+    def take_all(self) -> list[tuple[GroupFrame | None, str, dict[str, dict[str, Any]]]]:
+        """Removes the metrics of every group and returns their summaries, per group and level."""
+        with self._lock:
+            groups, self._groups = self._groups, {}
+        return [(frame, level, _summaries(metrics)) for (_, level), (frame, metrics) in groups.items()]
+
+    def __len__(self) -> int:
+        """Returns the number of groups and levels holding metrics."""
+        return len(self._groups)
+
+
+def _summaries(metrics: dict[str, _Metric]) -> dict[str, dict[str, Any]]:
+    """Returns the summary statistics of metrics, by name."""
+    return {name: metric.summary() for name, metric in metrics.items()}
@@ -0,0 +1,252 @@
+"""Compact profiles of pandas DataFrames, attached to DATASET signals.
+
+Row, null and numeric min/max statistics are computed over every row with vectorized operations, one pass per column.
+The costlier statistics, distinct estimates, min/max of non-numeric columns and the deep memory usage of object
+columns, are computed on a uniform sample of the rows, kept across chunks by bottom-k reservoir sampling, and
+extrapolated to the whole dataset.
+"""
+
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+import pandas as pd  # pyright: ignore[reportMissingTypeStubs]
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from pandas import DataFrame  # pyright: ignore[reportMissingTypeStubs]
+
+    from telemetry.fingerprint import FrameDigest
+
+# pandas ships partial annotations: its helpers are looked up untyped
+_pandas: Any = pd
+
+
+def _plain(value: Any) -> Any:
+    """Converts numpy and pandas scalars into JSON friendly values; missing values become None."""
+    if value is None or (_pandas.api.types.is_scalar(value) and _pandas.isna(value)):
+        return None
+    if isinstance(value, pd.Timestamp | pd.Timedelta):
+        return str(value)
+    if isinstance(value, np.generic):
+        return value.item()  # pyright: ignore[reportUnknownVariableType]
+    return value
+
+
+def _is_exact(dtype: Any) -> bool:
+    """Returns whether min/max of a column are computed over every row, i.e. cheap and always comparable."""
+    return (
+        _pandas.api.types.is_numeric_dtype(dtype)
+        or _pandas.api.types.is_datetime64_any_dtype(dtype)
+        or _pandas.api.types.is_timedelta64_dtype(dtype)
+    )
+
+
+class _Column:
+    """Statistics of one column, accumulated over the chunks."""
+
+    __slots__ = ("dtype", "maximum", "memory_bytes", "minimum", "nulls")
+
+    def __init__(self, dtype: Any) -> None:
+        self.dtype = str(dtype)
+        self.nulls = 0
+        self.minimum: Any = None
+        self.maximum: Any = None
+        self.memory_bytes = 0
+
+    def update(self, column: Any) -> None:
+        """Adds the statistics of a chunk of the column."""
+        self.nulls += int(column.isna().sum())
+        self.memory_bytes += int(column.memory_usage(index=False, deep=False))
+        if _is_exact(column.dtype):
+            self._extend(column.min(), column.max())
+
+    def _extend(self, minimum: Any, maximum: Any) -> None:
+        """Widens the range of the column."""
+        minimum, maximum = _plain(minimum), _plain(maximum)
+        if minimum is not None and (self.minimum is None or minimum < self.minimum):
+            self.minimum = minimum
+        if maximum is not None and (self.maximum is None or maximum > self.maximum):
+            self.maximum = maximum
+
+
+class DatasetProfiler:
+    """Accumulates the profile of a dataset, given as a DataFrame or chunk by chunk.
+
+    Example:
+        profiler = DatasetProfiler()
+        for chunk in pd.read_csv(path, chunksize=1_000_000):
+            profiler.update(chunk)
+        signals.dataset("Orders loaded.", profiler)
+    """
+
+    def __init__(self, sample_size: int | None = 100_000, max_columns: int = 100, seed: int | None = None) -> None:
+        """Initializes an empty profile.
+
+        Args:
+            sample_size: Number of rows sampled for the distinct estimates, the min/max of non-numeric columns and the
+                deep memory usage. None uses every row, which hashes and compares all of them.
+            max_columns: Maximum number of columns profiled, in column order; the others are only counted.
+            seed: Seed of the sampling, for reproducible profiles.
+        """
+        self._sample_size = sample_size
+        self._max_columns = max_columns
+        self._random = np.random.default_rng(seed)
+        self._rows = 0
+        self._chunks = 0
+        self._column_names: list[str] = []
+        self._columns: dict[str, _Column] = {}
+        self._sample: Any = None
+        self._sample_keys: np.ndarray[Any, np.dtype[np.float64]] = np.empty(0)
+
+    @property
+    def rows(self) -> int:
+        """Returns the number of rows profiled so far."""
+        return self._rows
+
+    def update(self, chunk: "DataFrame") -> None:
+        """Adds a chunk of the dataset to the profile."""
+        frame: Any = chunk
+        if not self._chunks:
+            self._column_names = [str(name) for name in frame.columns]
+        self._chunks += 1
+        self._rows += len(frame)
+
+        profiled = frame.iloc[:, : self._max_columns]
+        for name, column in profiled.items():
+            stats = self._columns.get(str(name))
+            if stats is None:
+                stats = self._columns[str(name)] = _Column(column.dtype)
+            stats.update(column)
+        self._reservoir(profiled)
+
+    def _reservoir(self, chunk: Any) -> None:
+        """Keeps the rows with the smallest random keys seen so far: a uniform sample of every chunk given.
+
+        Keys are only drawn for the rows that can enter the sample: their number follows a binomial law below the
+        largest kept key, and only the `sample_size` smallest of them are drawn, so a chunk costs O(sample_size).
+        """
+        if self._sample_size is None:
+            self._sample = chunk if self._sample is None else pd.concat([self._sample, chunk], ignore_index=True)
+            return
+
+        size, rows, random = self._sample_size, len(chunk), self._random
+        threshold = float(self._sample_keys.max()) if len(self._sample_keys) >= size else 1.0
+        candidates = rows if threshold >= 1.0 else int(random.binomial(rows, threshold))
+        if candidates > size:
+            # the largest of the `size` smallest keys, then the others uniformly below it
+            largest = float(random.beta(size, candidates - size + 1)) * threshold
+            keys = np.append(random.random(size - 1) * largest, largest)
+        else:
+            keys = random.random(candidates) * threshold
+        if not len(keys):
+            return
+        positions = np.sort(random.choice(rows, len(keys), replace=False)) if len(keys) < rows else slice(None)
+        sample: Any = chunk.iloc[positions]
+
+        if self._sample is not None:
+            sample = pd.concat([self._sample, sample], ignore_index=True)
+            keys = np.concatenate([self._sample_keys, keys])
+        if len(keys) > size:
+            kept = np.argpartition(keys, size - 1)[:size]
+            sample, keys = sample.iloc[kept], keys[kept]
+        self._sample, self._sample_keys = sample.reset_index(drop=True), keys
+
+    def profile(self) -> dict[str, Any]:
+        """Returns the profile of the rows added so far.
+
+        Returns:
+            `rows`, `columns`, `chunks` and `memory_bytes` of the dataset, `sample_rows` when statistics were sampled,
+            and `column_profiles`: per column, its dtype, null count, min, max and distinct estimate.
+        """
+        sample = self._sample
+        sampled = sample is not None and len(sample) < self._rows
+        scale = self._rows / len(sample) if sample is not None and len(sample) else 0.0
+        columns: dict[str, dict[str, Any]] = {}
+        memory_bytes = 0
+        for name, stats in self._columns.items():
+            profile: dict[str, Any] = {"dtype": stats.dtype, "nulls": stats.nulls}
+            column_memory = stats.memory_bytes
+            if sample is not None:
+                values: Any = sample[name]
+                if _pandas.api.types.is_object_dtype(values.dtype) or _pandas.api.types.is_string_dtype(values.dtype):
+                    # the shallow usage of object columns only counts the pointers
+                    column_memory = int(values.memory_usage(index=False, deep=True) * scale)
+                minimum, maximum = stats.minimum, stats.maximum
+                if minimum is None and not _is_exact(values.dtype):
+                    minimum, maximum = _sample_range(values)
+                profile["min"], profile["max"] = minimum, maximum
+                profile["distinct"] = _distinct_estimate(values, self._rows, stats.nulls, sampled=sampled)
+            memory_bytes += column_memory
+            columns[name] = profile
+
+        result: dict[str, Any] = {
+            "rows": self._rows,
+            "columns": len(self._column_names),
+            "chunks": self._chunks,
+            "memory_bytes": memory_bytes,
+        }
+        if sampled and sample is not None:
+            result["sample_rows"] = len(sample)
+        if len(self._column_names) > len(columns):
+            result["columns_profiled"] = len(columns)
+        result["column_profiles"] = columns
+        return result
+
+
+def _sample_range(values: Any) -> tuple[Any, Any]:
+    """Returns the min and max of sampled values, or None when they cannot be compared."""
+    values = values.dropna()
+    if not len(values):
+        return None, None
+    try:
+        return _plain(values.min()), _plain(values.max())
+    except TypeError:
+        return None, None
+
+
+def _distinct_estimate(values: Any, rows: int, nulls: int, *, sampled: bool) -> int:
+    """Estimates the number of distinct non-null values of a column from a uniform sample of its rows.
+
+    Unsampled columns are counted exactly. Otherwise the first-order jackknife estimator of Haas et al. (Duj1) is used,
+    over the non-null values: `d * n / (n - f1 + f1 * n / N)`, with `d` values seen in the sample of `n` values, `f1`
+    of them once, out of `N`. It is exact when every value is unique and when every value was seen more than once.
+    """
+    try:
+        counts = values.value_counts(dropna=True)
+    except TypeError:
+        # unhashable values, e.g. lists
+        counts = values.astype(str).value_counts(dropna=True)
+    seen, size, total = len(counts), int(counts.sum()), rows - nulls
+    if not sampled or not size:
+        return seen
+    singletons = int((counts == 1).sum())
+    return min(total, round(seen * size / (size - singletons + singletons * size / total)))
+
+
+def profile_dataset(
+    data: "DataFrame | Iterable[DataFrame] | DatasetProfiler",
+    sample_size: int | None = 100_000,
+    max_columns: int = 100,
+    digest: "FrameDigest | None" = None,
+) -> dict[str, Any]:
+    """Returns the profile of a DataFrame, of the chunks of a dataset, or of a profiler fed by the caller.
+
+    Args:
+        data: The dataset. An iterable of chunks is consumed.
+        sample_size: Number of rows sampled for the costlier statistics; see `DatasetProfiler`.
+        max_columns: Maximum number of columns profiled.
+        digest: Fingerprint fed with the chunks as they are profiled, so that they are only iterated once. A profiler
+            fed by the caller holds no rows to fingerprint.
+
+    Returns:
+        The profile, see `DatasetProfiler.profile`.
+    """
+    if isinstance(data, DatasetProfiler):
+        return data.profile()
+    profiler = DatasetProfiler(sample_size=sample_size, max_columns=max_columns)
+    for chunk in [data] if isinstance(data, pd.DataFrame) else data:
+        profiler.update(chunk)
+        if digest is not None:
+            digest.update(chunk)
+    return profiler.profile()
@@ -0,0 +1,429 @@
+"""Indexed queries over archived and spooled signals.
+
+Requires pyarrow, installed with the `archive` extra.
+"""
+
+import json
+import os
+from collections.abc import Sequence
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from telemetry.archive import ARCHIVE_COLUMNS, archive_files, archive_schema, import_pyarrow
+from telemetry.enums import SignalsGroup
+from telemetry.spool import read_spool
+
+if TYPE_CHECKING:
+    from pandas import DataFrame  # pyright: ignore[reportMissingTypeStubs]
+
+GROUP_LEVELS: tuple[str, ...] = tuple(group.name for group in SignalsGroup)
+ERROR_LEVELS: tuple[str, ...] = ("ERROR", "CRITICAL")
+
+_INDEX_DIRECTORY = ".index"
+_SPOOL_FILE = "<spool>"
+# fields of the Loki lines added by the loki formatter, not by the signals
+_LOKI_FORMATTER_FIELDS = frozenset(("timestamp", "process", "thread", "function", "module", "name", "signal_timestamp"))
+
+
+class SignalsQuery:
+    """Answers questions about jobs from the signals archive, and optionally from a Loki spool.
+
+    Two secondary indexes are kept:
+
+    - the row groups index: for each row group of each archive file, the jobs and levels it holds, with their time
+      range and number of signals;
+    - the groups index: the job of every process, task and step, to resolve a `parent_uuid` to its job.
+
+    Building them reads the `time`, `job_uuid`, `level` and `event_uuid` columns of each file once. Archive files are
+    immutable once complete, so the indexes are persisted in the `.index` directory of the archive and `refresh` only
+    indexes the new files. Queries then read the requested columns of the row groups holding the requested job only.
+    """
+
+    def __init__(
+        self,
+        directory: str | os.PathLike[str],
+        spool_directory: str | os.PathLike[str] | None = None,
+        *,
+        persist_index: bool = True,
+    ) -> None:
+        """Loads the persisted indexes and indexes the files added since.
+
+        Args:
+            directory: Archive directory.
+            spool_directory: Loki spool directory whose undelivered signals are also queried.
+            persist_index: Saves the indexes in the archive directory.
+        """
+        self._pa = import_pyarrow()
+        self._pc = import_pyarrow("pyarrow.compute")
+        self._parquet = import_pyarrow("pyarrow.parquet")
+        self._ipc = import_pyarrow("pyarrow.ipc")
+        self._directory = Path(directory)
+        self._spool_directory = Path(spool_directory) if spool_directory is not None else None
+        self._persist_index = persist_index
+        self._schema = archive_schema()
+
+        self._row_groups: Any = self._load_index("row_groups", self._row_groups_schema())
+        self._groups: Any = self._load_index("groups", self._groups_schema())
+        self._spool: Any = self._schema.empty_table()
+        self.refresh()
+
+    def _row_groups_schema(self) -> Any:
+        """Returns the schema of the row groups index."""
+        pa = self._pa
+        timestamp = pa.timestamp("ns", tz="UTC")
+        return pa.schema(
+            [
+                ("file", pa.string()),
+                ("row_group", pa.int32()),
+                ("job_uuid", pa.string()),
+                ("level", pa.string()),
+                ("start", timestamp),
+                ("end", timestamp),
+                ("signals", pa.int64()),
+            ]
+        )
+
+    def _groups_schema(self) -> Any:
+        """Returns the schema of the groups index."""
+        pa = self._pa
+        return pa.schema([("group_uuid", pa.string()), ("job_uuid", pa.string()), ("file", pa.string())])
+
+    def _load_index(self, name: str, schema: Any) -> Any:
+        """Loads a persisted index, or returns an empty one."""
+        path = self._directory / _INDEX_DIRECTORY / f"{name}.parquet"
+        if self._persist_index and path.exists():
+            return self._parquet.read_table(path, schema=schema)
+        return schema.empty_table()
+
+    def _save_index(self) -> None:
+        """Persists the indexes."""
+        directory = self._directory / _INDEX_DIRECTORY
+        directory.mkdir(exist_ok=True)
+        for name, table in (("row_groups", self._row_groups), ("groups", self._groups)):
+            temporary = directory / f"{name}.parquet.tmp"
+            self._parquet.write_table(table, temporary)
+            temporary.replace(directory / f"{name}.parquet")
+
+    def refresh(self) -> None:
+        """Indexes the archive files added since the last refresh, forgets the deleted ones and reloads the spool."""
+        pa, pc = self._pa, self._pc
+        files = {path.name: path for path in archive_files(self._directory)} if self._directory.exists() else {}
+        indexed = set(self._row_groups["file"].to_pylist())
+        indexed.discard(_SPOOL_FILE)
+
+        row_groups = [self._without_file(self._row_groups, _SPOOL_FILE)]
+        groups = [self._without_file(self._groups, _SPOOL_FILE)]
+        if indexed - files.keys():
+            removed = pa.array(sorted(indexed - files.keys()))
+            row_groups = [table.filter(pc.invert(pc.is_in(table["file"], removed))) for table in row_groups]
+            groups = [table.filter(pc.invert(pc.is_in(table["file"], removed))) for table in groups]
+
+        added = sorted(files.keys() - indexed)
+        for name in added:
+            columns = ["time", "job_uuid", "level", "event_uuid"]
+            for row_group, table in enumerate(self._row_group_tables(files[name], columns)):
+                row_groups.append(self._index_row_group(table, name, row_group))
+                groups.append(self._index_groups(table, name))
+
+        self._row_groups = pa.concat_tables(row_groups)
+        self._groups = pa.concat_tables(groups)
+        if self._persist_index and (added or indexed - files.keys()):
+            self._save_index()
+
+        if self._spool_directory is not None:
+            self._spool = self._unarchived(self._read_spool(self._spool_directory))
+            spool_row_groups = self._index_row_group(self._spool, _SPOOL_FILE, 0)
+            self._row_groups = pa.concat_tables([self._row_groups, spool_row_groups])
+            self._groups = pa.concat_tables([self._groups, self._index_groups(self._spool, _SPOOL_FILE)])
+
+    def _unarchived(self, spool: Any) -> Any:
+        """Returns the spooled signals that are not archived too."""
+        pa, pc = self._pa, self._pc
+        jobs = pc.unique(spool["job_uuid"].cast(pa.string()))
+        index = self._row_groups.filter(pc.is_in(self._row_groups["job_uuid"], jobs))
+        archived = [table["event_uuid"] for table in self._read_row_groups(index, ["event_uuid"])]
+        if not archived:
+            return spool
+        archived_uuids = pa.chunked_array([chunk for column in archived for chunk in column.chunks], pa.string())
+        return spool.filter(pc.invert(pc.is_in(spool["event_uuid"], archived_uuids)))
+
+    def _without_file(self, table: Any, name: str) -> Any:
+        """Returns the rows of an index not coming from the given file."""
+        return table.filter(self._pc.not_equal(table["file"], name))
+
+    def _index_row_group(self, table: Any, name: str, row_group: int) -> Any:
+        """Summarizes the jobs and levels of a row group."""
+        pa = self._pa
+        summary = table.group_by(["job_uuid", "level"]).aggregate([("time", "min"), ("time", "max"), ("time", "count")])
+        return pa.table(
+            [
+                pa.array([name] * summary.num_rows, pa.string()),
+                pa.array([row_group] * summary.num_rows, pa.int32()),
+                summary["job_uuid"].cast(pa.string()),
+                summary["level"].cast(pa.string()),
+                summary["time_min"],
+                summary["time_max"],
+                summary["time_count"],
+            ],
+            schema=self._row_groups_schema(),
+        )
+
+    def _index_groups(self, table: Any, name: str) -> Any:
+        """Lists the processes, tasks and steps signals of a table with their job."""
+        pa, pc = self._pa, self._pc
+        groups = table.filter(pc.is_in(table["level"], pa.array(GROUP_LEVELS)))
+        return pa.table(
+            [
+                groups["event_uuid"].cast(pa.string()),
+                groups["job_uuid"].cast(pa.string()),
+                pa.array([name] * groups.num_rows, pa.string()),
+            ],
+            schema=self._groups_schema(),
+        )
+
+    def _row_group_tables(self, path: Path, columns: list[str]) -> list[Any]:
+        """Reads some columns of every row group of an archive file, one table per row group."""
+        if path.suffix == ".parquet":
+            parquet_file = self._parquet.ParquetFile(path)
+            return [parquet_file.read_row_group(index, columns=columns) for index in range(parquet_file.num_row_groups)]
+        reader = self._ipc.open_file(self._pa.memory_map(str(path)))
+        return [
+            self._pa.Table.from_batches([reader.get_batch(index)]).select(columns)
+            for index in range(reader.num_record_batches)
+        ]
+
+    def _read_file(self, path: Path, row_groups: list[int], columns: list[str]) -> Any:
+        """Reads some columns of some row groups of an archive file."""
+        pa = self._pa
+        if path.suffix == ".parquet":
+            return self._parquet.ParquetFile(path).read_row_groups(row_groups, columns=columns)
+        reader = self._ipc.open_file(pa.memory_map(str(path)))
+        return pa.Table.from_batches([reader.get_batch(index) for index in row_groups], schema=self._schema).select(
+            columns
+        )
+
+    def _read_spool(self, directory: Path) -> Any:
+        """Converts the undelivered signals of a Loki spool into a table of the archive schema."""
+        pa = self._pa
+        columns: dict[str, list[Any]] = {column: [] for column in ARCHIVE_COLUMNS}
+        if directory.exists():
+            for payload in read_spool(directory):
+                for stream in json.loads(payload)["streams"]:
+                    for timestamp_ns, text in stream["values"]:
+                        line: dict[str, Any] = json.loads(text)
+                        columns["time"].append(int(timestamp_ns))
+                        columns["message_id"].append(line.pop("message_id", None) or None)
+                        for column in ARCHIVE_COLUMNS:
+                            if column not in {"time", "message_id", "extra"}:
+                                columns[column].append(str(line.pop(column, "") or ""))
+                        extra = {key: value for key, value in line.items() if key not in _LOKI_FORMATTER_FIELDS}
+                        columns["extra"].append(json.dumps(extra, ensure_ascii=False) if extra else None)
+        return pa.table([pa.array(columns[field.name], field.type) for field in self._schema], schema=self._schema)
+
+    def job_of(self, uuid: str) -> str | None:
+        """Returns the job of a job, process, task or step UUID, or None when it is unknown."""
+        pc = self._pc
+        if pc.any(pc.equal(self._row_groups["job_uuid"], uuid)).as_py():
+            return uuid
+        matches = self._groups.filter(pc.equal(self._groups["group_uuid"], uuid))
+        return matches["job_uuid"][0].as_py() if matches.num_rows else None
+
+    def jobs(self) -> "DataFrame":
+        """Returns one row per job, with its time range, number of signals and number of errors.
+
+        It is answered from the index alone, without reading the archive.
+        """
+        pc = self._pc
+        index = self._row_groups
+        jobs = index.group_by("job_uuid").aggregate([("start", "min"), ("end", "max"), ("signals", "sum")])
+        errors = index.filter(pc.is_in(index["level"], self._pa.array(ERROR_LEVELS)))
+        errors = errors.group_by("job_uuid").aggregate([("signals", "sum")]).rename_columns(["job_uuid", "errors"])
+        jobs = jobs.join(errors, "job_uuid", join_type="left outer").rename_columns(
+            ["job_uuid", "start", "end", "signals", "errors"]
+        )
+        return jobs.sort_by("start").to_pandas().fillna({"errors": 0}).astype({"errors": "int64"})
+
+    def signals(
+        self,
+        job_uuid: str | None = None,
+        parent_uuid: str | None = None,
+        levels: Sequence[str] | None = None,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        columns: Sequence[str] | None = None,
+    ) -> "DataFrame":
+        """Returns the signals matching every given criterion, ordered by time.
+
+        Args:
+            job_uuid: Only returns the signals of this job.
+            parent_uuid: Only returns the signals whose parent is this job, process, task or step.
+            levels: Only returns the signals of these levels.
+            start: Only returns the signals emitted at or after this time.
+            end: Only returns the signals emitted before this time.
+            columns: Columns to return, among `ARCHIVE_COLUMNS`. None returns every column.
+
+        Returns:
+            A DataFrame with one row per signal.
+        """
+        return self._signals(job_uuid, parent_uuid, levels, start, end, columns).to_pandas()
+
+    def _signals(
+        self,
+        job_uuid: str | None,
+        parent_uuid: str | None,
+        levels: Sequence[str] | None,
+        start: datetime | None,
+        end: datetime | None,
+        columns: Sequence[str] | None,
+    ) -> Any:
+        """Returns the signals matching every given criterion as an Arrow table."""
+        pa = self._pa
+        field = import_pyarrow("pyarrow.dataset").field
+        selected = list(columns) if columns is not None else list(ARCHIVE_COLUMNS)
+        if parent_uuid is not None and job_uuid is None:
+            job_uuid = self.job_of(parent_uuid)
+            if job_uuid is None:
+                return self._schema.empty_table().select(selected)
+
+        timestamp = pa.timestamp("ns", tz="UTC")
+        start_at = pa.scalar(start, timestamp) if start is not None else None
+        end_at = pa.scalar(end, timestamp) if end is not None else None
+        level_names = list(levels) if levels is not None else None
+
+        # row groups holding matching signals, from the index
+        index_filter = _all_of(
+            job_uuid is not None and field("job_uuid") == job_uuid,
+            level_names is not None and field("level").isin(level_names),
+            start_at is not None and field("end") >= start_at,
+            end_at is not None and field("start") < end_at,
+        )
+        index = self._row_groups.filter(index_filter) if index_filter is not None else self._row_groups
+
+        # matching signals in those row groups
+        row_filter = _all_of(
+            job_uuid is not None and field("job_uuid") == job_uuid,
+            parent_uuid is not None and field("parent_uuid") == parent_uuid,
+            level_names is not None and field("level").isin(level_names),
+            start_at is not None and field("time") >= start_at,
+            end_at is not None and field("time") < end_at,
+        )
+        needed = list(dict.fromkeys([*selected, "time", "job_uuid", "parent_uuid", "level"]))
+        tables = [
+            table.filter(row_filter) if row_filter is not None else table
+            for table in self._read_row_groups(index, needed)
+        ]
+        if not tables:
+            return self._schema.empty_table().select(selected)
+        return pa.concat_tables(tables, promote_options="permissive").sort_by("time").select(selected)
+
+    def _read_row_groups(self, index: Any, columns: list[str]) -> list[Any]:
+        """Reads some columns of the row groups listed by rows of the row groups index, one table per file."""
+        locations = index.group_by("file").aggregate([("row_group", "distinct")])
+        tables: list[Any] = []
+        for name, row_groups in zip(
+            locations["file"].to_pylist(), locations["row_group_distinct"].to_pylist(), strict=True
+        ):
+            if name == _SPOOL_FILE:
+                tables.append(self._spool.select(columns))
+            else:
+                tables.append(self._read_file(self._directory / name, sorted(row_groups), columns))
+        return tables
+
+    def tree(self, job_uuid: str) -> "DataFrame":
+        """Reconstructs the process, task and step hierarchy of a job in one pass over its signals.
+
+        Args:
+            job_uuid: Job to reconstruct.
+
+        Returns:
+            A DataFrame with one row per group, in start order, with its `depth`, `path`, start and end times,
+            `status` (finished, failed or open), `elapsed_ms`, the number of `signals` and `errors` directly under it
+            and the number of `subtree_errors` under it and its descendants. Error and critical signals count as
+            errors, as does the group itself when it failed.
+        """
+        pa, pc = self._pa, self._pc
+        table = self._signals(job_uuid, None, None, None, None, ["time", "level", "parent_uuid", "event_uuid", "extra"])
+
+        direct = pc.value_counts(table["parent_uuid"].cast(pa.string()))
+        signals_under = dict(zip(direct.field("values").to_pylist(), direct.field("counts").to_pylist(), strict=True))
+        failures = table.filter(pc.is_in(table["level"], pa.array(ERROR_LEVELS)))
+        errors_under: dict[str, int] = {}
+        for parent in failures["parent_uuid"].cast(pa.string()).to_pylist():
+            errors_under[parent] = errors_under.get(parent, 0) + 1
+
+        nodes: dict[str, dict[str, Any]] = {}
+        groups = table.filter(pc.is_in(table["level"], pa.array(GROUP_LEVELS)))
+        for time_ns, level, parent, uuid, extra_text in zip(
+            groups["time"].cast(pa.int64()).to_pylist(),
+            groups["level"].cast(pa.string()).to_pylist(),
+            groups["parent_uuid"].cast(pa.string()).to_pylist(),
+            groups["event_uuid"].to_pylist(),
+            groups["extra"].to_pylist(),
+            strict=True,
+        ):
+            extra: dict[str, Any] = json.loads(extra_text) if extra_text else {}
+            group_uuid = extra.get("group_uuid")
+            if group_uuid in nodes:
+                # end of a span
+                node = nodes[group_uuid]
+                node["ended_at"] = time_ns
+                node["status"] = extra.get("status", "finished")
+                if node["status"] == "failed":
+                    node["errors"] += 1
+                    node["subtree_errors"] += 1
+                node["elapsed_ms"] = extra.get("elapsed_ms")
+                continue
+
+            parent_node = nodes.get(parent)
+            title = str(extra.get("title", ""))
+            nodes[uuid] = {
+                "group_uuid": uuid,
+                "parent_uuid": parent,
+                "depth": parent_node["depth"] + 1 if parent_node else 0,
+                "group": level,
+                "title": title,
+                "path": f"{parent_node['path']} > {title}" if parent_node else title,
+                "started_at": time_ns,
+                "ended_at": None,
+                "status": "open",
+                "elapsed_ms": None,
+                "signals": signals_under.get(uuid, 0),
+                "errors": errors_under.get(uuid, 0),
+                "subtree_errors": errors_under.get(uuid, 0),
+            }
+
+        # children start after their parent: walking backwards sums the errors bottom-up
+        for node in reversed(nodes.values()):
+            parent_node = nodes.get(node["parent_uuid"])
+            if parent_node is not None:
+                parent_node["subtree_errors"] += node["subtree_errors"]
+
+        timestamp = pa.timestamp("ns", tz="UTC")
+        schema = pa.schema(
+            [
+                ("group_uuid", pa.string()),
+                ("parent_uuid", pa.string()),
+                ("depth", pa.int32()),
+                ("group", pa.string()),
+                ("title", pa.string()),
+                ("path", pa.string()),
+                ("started_at", timestamp),
+                ("ended_at", timestamp),
+                ("status", pa.string()),
+                ("elapsed_ms", pa.float64()),
+                ("signals", pa.int64()),
+                ("errors", pa.int64()),
+                ("subtree_errors", pa.int64()),
+            ]
+        )
+        return pa.Table.from_pylist(list(nodes.values()), schema=schema).to_pandas()
+
+
+def _all_of(*conditions: Any) -> Any:
+    """Combines the given dataset expressions with a logical and, skipping the False ones; None when all are."""
+    combined = None
+    for condition in conditions:
+        if condition is not False:
+            combined = condition if combined is None else combined & condition
+    return combined
@@ -0,0 +1,100 @@
+"""Routing of signals to named sinks, compiled into a lookup by level.
+
+Each sink is added to loguru with the lowest level routed to it and a filter reading a set of levels: the signals of
+those levels are accepted with a single membership test, and only the levels of routes with group or predicate
+criteria run checks. `Signals.add_sink` combines the filter with the one of the instance, so that the routes of an
+instance never apply to the signals of another.
+"""
+
+from collections.abc import Callable, Iterable, Mapping
+from enum import IntEnum
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from loguru import Record
+
+    from telemetry.config import SignalsRoute
+
+type RecordCheck = Callable[["Record"], bool]
+
+
+def _route_check(route: "SignalsRoute") -> RecordCheck | None:
+    """Returns the check of the group and predicate criteria of a route, or None when it has neither."""
+    groups = frozenset(group.casefold() for group in route.groups)
+    predicate = route.predicate
+    if not groups:
+        return predicate
+
+    def check(record: "Record") -> bool:
+        name = record["extra"].get("signal_group_name")
+        return isinstance(name, str) and name.casefold() in groups and (predicate is None or predicate(record))
+
+    return check
+
+
+class RoutingTable:
+    """Routes compiled, for each sink, into the levels it always receives and the checks left for other levels."""
+
+    def __init__(
+        self, routes: "Iterable[SignalsRoute]", level_numbers: Mapping[str, int], sinks: Iterable[str]
+    ) -> None:
+        """Compiles the routes.
+
+        Args:
+            routes: Routes of the configuration.
+            level_numbers: Number of every level, by name.
+            sinks: Names of the configured sinks.
+
+        Raises:
+            ValueError: If a route names an unknown sink or level.
+        """
+        names = tuple(sinks)
+        self._always: dict[str, set[int]] = {name: set() for name in names}
+        self._checks: dict[str, dict[int, list[RecordCheck]]] = {name: {} for name in names}
+        for route in routes:
+            unknown = [sink for sink in route.sinks if sink not in self._always]
+            if unknown:
+                msg = f"Route to unknown sinks {unknown}; the configured sinks are {list(names)}."
+                raise ValueError(msg)
+            numbers = {self._level_number(level, level_numbers) for level in route.levels} or set(
+                level_numbers.values()
+            )
+            check = _route_check(route)
+            for sink in route.sinks:
+                if check is None:
+                    self._always[sink].update(numbers)
+                else:
+                    for number in numbers:
+                        self._checks[sink].setdefault(number, []).append(check)
+        # levels a sink always receives need no check
+        for sink, checks in self._checks.items():
+            for number in self._always[sink]:
+                checks.pop(number, None)
+
+    @staticmethod
+    def _level_number(level: "str | IntEnum", level_numbers: Mapping[str, int]) -> int:
+        """Returns the number of a level given by name or member."""
+        name = level.name if isinstance(level, IntEnum) else level.upper()
+        if name not in level_numbers:
+            msg = f"Route of unknown level {level!r}."
+            raise ValueError(msg)
+        return level_numbers[name]
+
+    def min_level(self, sink: str) -> int | None:
+        """Returns the lowest level routed to a sink, or None when nothing is routed to it."""
+        return min((*self._always[sink], *self._checks[sink]), default=None)
+
+    def filter(self, sink: str) -> RecordCheck:
+        """Returns the loguru filter of a sink, accepting the records routed to it."""
+        always = frozenset(self._always[sink])
+        checks = {number: tuple(checks) for number, checks in self._checks[sink].items()}
+        if not checks:
+            return lambda record: record["level"].no in always
+
+        def accepts(record: "Record") -> bool:
+            number = record["level"].no
+            if number in always:
+                return True
+            return any(check(record) for check in checks.get(number, ()))
+
+        return accepts
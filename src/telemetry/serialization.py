@@ -0,0 +1,168 @@
+"""JSON serialization of signals for Loki.
+
+The fields shared by every signal of a Signals instance or view, such as `app_name`, `job_uuid` and the fields given
+to `bind`, are rendered once into a `StaticFields` fragment carried by the records. Each record then only encodes its
+own fields and appends the fragment. The fragment is attached next to the `extra` of records by a patcher, so that
+text sinks and user sinks formatting `extra` do not show it. orjson is used when installed, with the `json` extra.
+"""
+
+import json
+import traceback
+from collections.abc import Callable, Iterable, Mapping
+from typing import TYPE_CHECKING, Any, cast
+
+if TYPE_CHECKING:
+    from loguru import Record
+
+try:
+    import orjson  # pyright: ignore[reportMissingImports]
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+# record key, next to `extra`, holding the `StaticFields` of the instance or view that emitted the record
+STATIC_FIELDS_KEY = "static_fields"
+# fields every line gets from the record itself, or that are removed from lines
+_RECORD_FIELDS = frozenset(
+    (
+        *("message", "timestamp", "process", "thread", "function", "module", "name", "level"),
+        *("file", "path", "line", "stacktrace", "loki_metadata"),
+    )
+)
+
+_json_encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"), default=str).encode
+
+
+def dumps(value: Any) -> str:
+    """Serializes a value into compact JSON, with orjson when installed; unknown types are serialized as strings."""
+    if orjson is None:
+        return _json_encode(value)
+    return orjson.dumps(value, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+class StaticFields:
+    """Fields shared by every signal of a Signals instance or view, rendered into JSON once.
+
+    Attributes:
+        fields: The shared fields.
+        fragment: JSON members of the fields, without the enclosing braces.
+        renderable: Whether the fragment can be appended to lines, i.e. no shared field is named like a record field.
+        owner: Token of the Signals instance emitting the records, shared by its views, or None.
+    """
+
+    __slots__ = ("_items", "fields", "fragment", "owner", "renderable")
+
+    def __init__(self, fields: Mapping[str, Any], owner: object = None) -> None:
+        """Initializes the fields and renders their fragment.
+
+        Args:
+            fields: The shared fields.
+            owner: Token of the Signals instance emitting the records, telling its records from those of others.
+        """
+        self.fields = dict(fields)
+        self.owner = owner
+        self.fragment = dumps(self.fields)[1:-1]
+        self.renderable = _RECORD_FIELDS.isdisjoint(self.fields)
+        self._items = tuple(self.fields.items())
+
+    def __repr__(self) -> str:
+        """Returns a short representation, since every record carries the fields."""
+        return f"StaticFields({', '.join(self.fields)})"
+
+    def __reduce__(self) -> tuple[type["StaticFields"], tuple[dict[str, Any]]]:
+        """Pickles the fields only; the fragment is rendered again and the owner, local to a process, is dropped."""
+        return StaticFields, (self.fields,)
+
+    def holds(self, extra: Mapping[str, Any]) -> bool:
+        """Returns whether every shared field of a record still holds the shared value, i.e. none was overridden."""
+        return all(extra.get(key) is value for key, value in self._items)
+
+    def patcher(self) -> Callable[["Record"], None]:
+        """Returns a loguru patcher attaching the fields to records, next to their `extra`."""
+
+        def attach(record: "Record") -> None:
+            cast("dict[str, Any]", record)[STATIC_FIELDS_KEY] = self
+
+        return attach
+
+
+def static_fields(record: "Record") -> StaticFields | None:
+    """Returns the `StaticFields` attached to a record, or None when it has none."""
+    return cast("Mapping[str, Any]", record).get(STATIC_FIELDS_KEY)
+
+
+class RecordSerializer:
+    """Renders loguru records into Loki log lines.
+
+    Lines hold the same fields as the formatter of `loki_logger_handler`: message, timestamp, process, thread,
+    function, module, name and level, the fields of the record and, for errors, the source location and stack trace.
+    """
+
+    def __init__(self, label_keys: Iterable[str], metadata_keys: Iterable[str] = ()) -> None:
+        """Initializes the serializer.
+
+        Args:
+            label_keys: Record fields promoted to stream labels, read by `labels`.
+            metadata_keys: Record fields attached to each line as structured metadata, read by `metadata`.
+        """
+        self._label_keys = tuple(label_keys)
+        self._metadata_keys = tuple(metadata_keys)
+
+    def line(self, record: "Record") -> str:
+        """Returns the log line of a record."""
+        extra = record["extra"]
+        level = record["level"].name.upper()
+        fields: dict[str, Any] = {
+            "message": record["message"],
+            "timestamp": record["time"].timestamp(),
+            "process": record["process"].id,
+            "thread": record["thread"].id,
+            "function": record["function"],
+            "module": record["module"],
+            "name": record["name"],
+            "level": level,
+        }
+
+        static = static_fields(record)
+        if static is not None and static.renderable and static.holds(extra):
+            shared = static.fields
+            fields.update((key, value) for key, value in extra.items() if key not in shared)
+        else:
+            static = None
+            fields.update(extra)
+        fields.pop("loki_metadata", None)
+
+        if level.startswith("ER"):
+            fields["file"] = record["file"].name
+            fields["path"] = record["file"].path
+            fields["line"] = record["line"]
+            if record["exception"] is not None:
+                error_type, error, error_traceback = record["exception"]
+                fields["stacktrace"] = "".join(traceback.format_exception(error_type, error, error_traceback))
+
+        text = dumps(fields)
+        if static is None or not static.fragment:
+            return text
+        return f"{text[:-1]},{static.fragment}}}"
+
+    def labels(self, record: "Record") -> tuple[str | None, ...]:
+        """Returns the values of the label fields of a record, in `label_keys` order; None for absent fields."""
+        return tuple(_field(record, key) for key in self._label_keys)
+
+    def metadata(self, record: "Record") -> dict[str, str]:
+        """Returns the structured metadata of a record: its `metadata_keys` fields, as strings, when present."""
+        metadata: dict[str, str] = {}
+        for key in self._metadata_keys:
+            value = _field(record, key)
+            if value is not None:
+                metadata[key] = value
+        return metadata
+
+
+def _field(record: "Record", key: str) -> str | None:
+    """Returns a field of a record as a string, the level name for `level`, or None when absent."""
+    extra = record["extra"]
+    if key in extra:
+        return str(extra[key])
+    if key == "level":
+        return record["level"].name.upper()
+    return None
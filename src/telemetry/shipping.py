@@ -0,0 +1,650 @@
+"""Background shipping of signals."""
+
+import atexit
+import functools
+import itertools
+import threading
+import time
+import weakref
+from collections import deque
+from collections.abc import Callable, Iterable
+from typing import TYPE_CHECKING, Any, TextIO
+
+from telemetry.enums import OverflowPolicy
+from telemetry.serialization import RecordSerializer, dumps
+from telemetry.stats import Histogram
+from tools.timestamp import LazyTimestamp
+
+if TYPE_CHECKING:
+    from loguru import Message, Record
+
+    from telemetry.spool import Spool, SpoolReplayer
+
+
+class _ExitHooks:
+    """Stops the running shippers at interpreter exit, once what is held ahead of them has reached them.
+
+    A single atexit hook is registered, on first use rather than at import: loguru is imported by then, so the hook
+    runs before the one of loguru, which removes the sinks.
+    """
+
+    def __init__(self) -> None:
+        """Initializes the hooks; nothing is registered until the first shipper starts or callback is added."""
+        self._lock = threading.Lock()
+        self._registered: bool = False
+        self._flushes: list[weakref.WeakMethod[Callable[[], None]]] = []
+        self._shippers: dict[BatchShipper[Any], None] = {}
+
+    def add_flush(self, flush: Callable[[], None]) -> None:
+        """Runs a bound method at exit before the shippers stop; the method is only referenced weakly."""
+        with self._lock:
+            self._flushes.append(weakref.WeakMethod(flush))
+            self._register()
+
+    def add_shipper(self, shipper: "BatchShipper[Any]") -> None:
+        """Stops a started shipper at exit."""
+        with self._lock:
+            self._shippers[shipper] = None
+            self._register()
+
+    def discard_shipper(self, shipper: "BatchShipper[Any]") -> None:
+        """Forgets a stopped shipper."""
+        with self._lock:
+            self._shippers.pop(shipper, None)
+
+    def _register(self) -> None:
+        """Registers the atexit hook once. Must be called with the lock held."""
+        if not self._registered:
+            self._registered = True
+            atexit.register(self.run)
+
+    def run(self) -> None:
+        """Runs the flushes, then stops the shippers, the last started first."""
+        with self._lock:
+            flushes = [flush for reference in self._flushes if (flush := reference()) is not None]
+            shippers = list(reversed(self._shippers))
+        for flush in flushes:
+            flush()
+        for shipper in shippers:
+            shipper.stop()
+
+
+_exit_hooks = _ExitHooks()
+
+
+def flush_at_exit(flush: Callable[[], None]) -> None:
+    """Runs a bound method at interpreter exit, before the shippers ship what they still hold and stop.
+
+    It lets what is held ahead of the shippers, such as open deduplication windows, still reach them. The method is
+    only referenced weakly.
+    """
+    _exit_hooks.add_flush(flush)
+
+
+class BatchShipper[T]:
+    """Bounded in-memory queue drained in batches by a background worker.
+
+    Emitting threads only pay for an enqueue. A daemon worker hands the queued items to `ship` once `batch_size` items
+    are waiting or the oldest one has been waiting for `flush_interval` seconds. When the queue is full, the
+    `overflow_policy` decides whether the producer waits for room or which item is dropped.
+    """
+
+    def __init__(
+        self,
+        ship: Callable[[list[T]], None] | None,
+        *,
+        queue_size: int,
+        batch_size: int,
+        flush_interval: float,
+        overflow_policy: OverflowPolicy = OverflowPolicy.DROP_OLDEST,
+        overflow_level: int = 0,
+        level_of: Callable[[T], int] | None = None,
+        name: str = "signals-shipper",
+    ) -> None:
+        """Initializes the queue and starts the background worker.
+
+        Args:
+            ship: Callable receiving each batch. It runs on the worker thread and its errors are counted, not raised.
+                None creates no worker thread, for subclasses taking the batches from the queue themselves, which
+                then override `_start`, `drain` and `stop`.
+            queue_size: Maximum number of queued items.
+            batch_size: Number of queued items that triggers a shipment.
+            flush_interval: Maximum time, in seconds, an item waits in the queue before being shipped.
+            overflow_policy: What to do with new items when the queue is full.
+            overflow_level: Level below which items are dropped under `OverflowPolicy.DROP_BELOW_LEVEL`.
+            level_of: Returns the level of an item. Required by `OverflowPolicy.DROP_BELOW_LEVEL`.
+            name: Name of the worker thread.
+        """
+        if overflow_policy is OverflowPolicy.DROP_BELOW_LEVEL and level_of is None:
+            msg = "level_of is required by the DROP_BELOW_LEVEL overflow policy."
+            raise ValueError(msg)
+
+        self._queue_size = max(1, queue_size)
+        self._batch_size = max(1, min(batch_size, self._queue_size))
+        self._flush_interval = flush_interval
+        self._overflow_policy = overflow_policy
+        self._overflow_level = overflow_level
+        self._level_of: Callable[[T], int] = level_of or (lambda _: 0)
+
+        self._queue: deque[T] = deque()
+        # enqueue time of each queued item, in step with the queue: the flush interval runs from the oldest one left
+        self._queued_at: deque[float] = deque()
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+        self._idle = threading.Condition(self._lock)
+        self._in_flight: int = 0
+        self._flush_requested: bool = False
+        self._closed: bool = False
+
+        self._dropped: int = 0
+        self._failed: int = 0
+        self._last_error: BaseException | None = None
+        self._shipped_callbacks: list[Callable[[list[T]], None]] = []
+
+        # self-instrumentation, written under the lock or by the worker only
+        self._dropped_levels: dict[int, int] = {}
+        self._high_water: int = 0
+        self._shipped: int = 0
+        self._batch_sizes = Histogram()
+        self._ship_latency = Histogram()
+
+        # the worker is started by the first item, so that unused shippers cost no thread
+        self._worker = (
+            threading.Thread(target=self._run, args=(ship,), name=name, daemon=True) if ship is not None else None
+        )
+        self._started: bool = False
+
+    @property
+    def dropped(self) -> int:
+        """Returns the number of items discarded by the overflow policy."""
+        return self._dropped
+
+    @property
+    def failed(self) -> int:
+        """Returns the number of items whose shipment raised an error."""
+        return self._failed
+
+    @property
+    def last_error(self) -> BaseException | None:
+        """Returns the last error raised while shipping, if any."""
+        return self._last_error
+
+    def __len__(self) -> int:
+        """Returns the number of items waiting in the queue."""
+        return len(self._queue)
+
+    def stats(self) -> dict[str, Any]:
+        """Returns the counters of the shipper.
+
+        Returns:
+            The queue depth, its high-water mark and capacity, the number of items shipped, dropped (in total and per
+            level) and failed, and summaries of the batch sizes and of the time spent shipping each batch, in
+            milliseconds.
+        """
+        return {
+            "queue_depth": len(self._queue),
+            "queue_high_water": self._high_water,
+            "queue_size": self._queue_size,
+            "shipped": self._shipped,
+            "dropped": self._dropped,
+            "dropped_by_level": dict(self._dropped_levels),
+            "failed": self._failed,
+            "batch_size": self._batch_sizes.summary(),
+            "ship_ms": self._ship_latency.summary(1e-6),
+        }
+
+    def put(self, item: T) -> None:
+        """Queues an item, applying the overflow policy when the queue is full."""
+        with self._lock:
+            if self._closed or (len(self._queue) >= self._queue_size and not self._make_room(item)):
+                self._drop(item)
+                return
+            if not self._started:
+                self._start()
+
+            self._queue.append(item)
+            self._queued_at.append(time.monotonic())
+            size = len(self._queue)
+            self._high_water = max(size, self._high_water)
+            self._queued(size)
+
+    def _queued(self, size: int) -> None:
+        """Wakes the worker up when the first item or a full batch is queued. Must be called with the lock held."""
+        if size in {1, self._batch_size}:
+            self._not_empty.notify()
+
+    def _start(self) -> None:
+        """Starts the worker. Must be called with the lock held."""
+        self._started = True
+        if self._worker is not None:
+            self._worker.start()
+        _exit_hooks.add_shipper(self)
+
+    def _worker_alive(self) -> bool:
+        """Returns whether the worker thread is running."""
+        return self._worker is not None and self._worker.is_alive()
+
+    def _make_room(self, item: T) -> bool:
+        """Frees a slot for `item` according to the overflow policy. Must be called with the lock held."""
+        if self._overflow_policy is OverflowPolicy.BLOCK:
+            while len(self._queue) >= self._queue_size and not self._closed:
+                self._not_full.wait()
+            return not self._closed
+
+        if self._overflow_policy is OverflowPolicy.DROP_BELOW_LEVEL:
+            if self._level_of(item) < self._overflow_level:
+                return False
+            for index, queued in enumerate(self._queue):
+                if self._level_of(queued) < self._overflow_level:
+                    del self._queue[index]
+                    del self._queued_at[index]
+                    self._drop(queued)
+                    return True
+
+        self._queued_at.popleft()
+        self._drop(self._queue.popleft())
+        return True
+
+    def _drop(self, item: T) -> None:
+        """Counts an item discarded by the overflow policy. Must be called with the lock held."""
+        self._dropped += 1
+        level = self._level_of(item)
+        self._dropped_levels[level] = self._dropped_levels.get(level, 0) + 1
+
+    def _next_batch(self) -> list[T] | None:
+        """Waits for a batch to be ready and takes it from the queue. Returns None once closed and drained."""
+        with self._lock:
+            while not self._queue and not self._closed:
+                self._not_empty.wait()
+            if not self._queue:
+                return None
+
+            while len(self._queue) < self._batch_size and not (self._closed or self._flush_requested):
+                remaining = self._queued_at[0] + self._flush_interval - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._not_empty.wait(remaining)
+
+            batch = self._take(min(self._batch_size, len(self._queue)))
+            self._in_flight = len(batch)
+            return batch
+
+    def _take(self, count: int) -> list[T]:
+        """Takes `count` items from the head of the queue. Must be called with the lock held."""
+        batch = [self._queue.popleft() for _ in range(count)]
+        for _ in range(count):
+            self._queued_at.popleft()
+        self._not_full.notify_all()
+        return batch
+
+    def _run(self, ship: Callable[[list[T]], None]) -> None:
+        """Worker loop: ships batches until the shipper is stopped and the queue is drained."""
+        while (batch := self._next_batch()) is not None:
+            self._batch_sizes.record(len(batch))
+            started_at = time.perf_counter_ns()
+            try:
+                ship(batch)
+            except Exception as error:  # noqa: BLE001
+                self._failed += len(batch)
+                self._last_error = error
+            else:
+                self._shipped += len(batch)
+                self._notify_shipped(batch)
+            self._ship_latency.record(time.perf_counter_ns() - started_at)
+
+            with self._lock:
+                self._in_flight = 0
+                if not self._queue:
+                    self._flush_requested = False
+                    self._idle.notify_all()
+
+        with self._lock:
+            self._idle.notify_all()
+
+    def add_shipped_callback(self, callback: Callable[[list[T]], None]) -> None:
+        """Calls `callback` with each batch once `ship` returned for it, e.g. to record what was delivered.
+
+        The callback runs on the worker, after the batch is counted as shipped; its errors are kept as `last_error`.
+        Callbacks must be added before the first item is put.
+        """
+        self._shipped_callbacks.append(callback)
+
+    def _notify_shipped(self, batch: list[T]) -> None:
+        """Calls the shipped callbacks with a batch."""
+        for callback in self._shipped_callbacks:
+            try:
+                callback(batch)
+            except Exception as error:  # noqa: BLE001
+                self._last_error = error
+
+    def drain(self, timeout: float | None = None) -> bool:
+        """Ships everything queued so far without waiting for the flush interval.
+
+        Args:
+            timeout: Maximum time, in seconds, to wait for the queue to be shipped. None waits indefinitely.
+
+        Returns:
+            True if the queue was fully shipped, False if the timeout expired first.
+        """
+        with self._lock:
+            if not self._worker_alive():
+                return not self._queue
+            self._flush_requested = True
+            self._not_empty.notify()
+            return self._idle.wait_for(lambda: not self._queue and not self._in_flight, timeout)
+
+    def stop(self, timeout: float | None = 5.0) -> None:
+        """Stops accepting items, ships what is still queued and stops the worker.
+
+        Loguru calls this method when the sink is removed, and it is also registered to run at interpreter exit.
+
+        Args:
+            timeout: Maximum time, in seconds, to wait for the worker to finish.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._not_empty.notify_all()
+            self._not_full.notify_all()
+        if self._started:
+            if self._worker is not None:
+                self._worker.join(timeout)
+            _exit_hooks.discard_shipper(self)
+
+
+class TextSink(BatchShipper["Message"]):
+    """Loguru sink writing the formatted messages to a text stream, such as stdout or a file, from a background worker.
+
+    A slow terminal, pipe or disk only holds the worker: the messages queued meanwhile are written together by its next
+    write.
+    """
+
+    def __init__(self, stream: TextIO, *, close: bool = False, name: str = "signals-text-sink", **kwargs: Any) -> None:
+        """Initializes the sink.
+
+        Args:
+            stream: Text stream the messages are written to.
+            close: Closes the stream when the sink is stopped, e.g. for a file opened for the sink.
+            name: Name of the worker thread.
+            **kwargs: Queue options forwarded to `BatchShipper`.
+        """
+        self._stream = stream
+        self._close = close
+        super().__init__(self._write_lines, level_of=message_level, name=name, **kwargs)
+
+    def write(self, message: "Message") -> None:
+        """Loguru sink entry point: queues the formatted message."""
+        self.put(message)
+
+    def _write_lines(self, messages: list["Message"]) -> None:
+        """Writes a batch of messages and flushes the stream."""
+        self._stream.write("".join(messages))
+        self._stream.flush()
+
+    def stop(self, timeout: float | None = 5.0) -> None:
+        """Stops accepting messages, writes what is still queued and stops the worker; see `BatchShipper.stop`."""
+        super().stop(timeout)
+        if self._close and not self._stream.closed:
+            self._stream.close()
+
+
+class LokiEncoder:
+    """Encodes loguru records into Loki push payloads, one stream per distinct set of labels.
+
+    Every stream costs Loki an index entry and a chunk, so labels should only take a few values: fields such as job or
+    group identifiers are better left in the line, where `| json` finds them, or sent as structured metadata. As a
+    guard, a label taking more than `max_label_values` distinct values has the next ones replaced by
+    `OVERFLOW_LABEL_VALUE`; the line keeps the actual value.
+    """
+
+    OVERFLOW_LABEL_VALUE = "__overflow__"
+
+    def __init__(
+        self,
+        labels: dict[str, str],
+        label_keys: Iterable[str],
+        metadata_keys: Iterable[str] = (),
+        max_label_values: int | None = None,
+    ) -> None:
+        """Initializes the encoder.
+
+        Args:
+            labels: Static labels added to every stream.
+            label_keys: Record fields promoted to stream labels.
+            metadata_keys: Record fields attached to each line as Loki structured metadata, which requires Loki 2.9 or
+                later with structured metadata allowed.
+            max_label_values: Maximum number of distinct values of each label over the lifetime of the encoder. None
+                does not limit them.
+        """
+        self._labels = labels
+        self._label_keys = tuple(label_keys)
+        self._serializer = RecordSerializer(self._label_keys, metadata_keys)
+        self._with_metadata = bool(tuple(metadata_keys))
+        self._max_label_values = max_label_values
+        self._label_values: list[set[str]] = [set() for _ in self._label_keys]
+
+    def encode(self, records: list["Record"]) -> str:
+        """Groups the records into Loki streams, in timestamp order, and serializes the push payload."""
+        serializer = self._serializer
+        streams: dict[tuple[str | None, ...], list[list[Any]]] = {}
+        # label values of the records, as read, to their stream, once capped
+        read: dict[tuple[str | None, ...], list[list[Any]]] = {}
+        for record in records:
+            label_values = serializer.labels(record)
+            values = read.get(label_values)
+            if values is None:
+                values = read[label_values] = streams.setdefault(self._cap(label_values), [])
+            # signals carry their own nanosecond timestamp, which avoids going through a float
+            signal_timestamp = record["extra"].get("signal_timestamp")
+            if isinstance(signal_timestamp, LazyTimestamp):
+                timestamp_ns = signal_timestamp.ns
+            else:
+                timestamp_ns = int(record["time"].timestamp() * 1e9)
+            entry: list[Any] = [str(timestamp_ns), serializer.line(record)]
+            if self._with_metadata and (metadata := serializer.metadata(record)):
+                entry.append(metadata)
+            values.append(entry)
+        return dumps({"streams": [self._stream(label_values, values) for label_values, values in streams.items()]})
+
+    def _cap(self, label_values: tuple[str | None, ...]) -> tuple[str | None, ...]:
+        """Returns the label values of a stream, those beyond `max_label_values` replaced by the overflow value."""
+        if self._max_label_values is None:
+            return label_values
+        capped: list[str | None] = []
+        for value, seen in zip(label_values, self._label_values, strict=True):
+            if value is None or value in seen:
+                capped.append(value)
+            elif len(seen) < self._max_label_values:
+                seen.add(value)
+                capped.append(value)
+            else:
+                capped.append(self.OVERFLOW_LABEL_VALUE)
+        return tuple(capped)
+
+    def _stream(self, label_values: tuple[str | None, ...], values: list[list[Any]]) -> dict[str, Any]:
+        """Returns a Loki stream: its labels, static and read from the records, and its lines in timestamp order."""
+        labels = dict(self._labels)
+        labels.update(
+            (key, value) for key, value in zip(self._label_keys, label_values, strict=True) if value is not None
+        )
+        # records of a batch come from several threads, and Loki before 2.4 rejects lines older than their stream
+        if any(int(previous[0]) > int(entry[0]) for previous, entry in itertools.pairwise(values)):
+            values.sort(key=lambda entry: int(entry[0]))
+        return {"stream": labels, "values": values}
+
+
+class LokiShipper(BatchShipper["Record"]):
+    """Loguru sink that ships records to Loki in batches from a background worker.
+
+    Records are only queued on the emitting thread; formatting, grouping into Loki streams, serialization and the HTTP
+    push all happen on the worker.
+
+    With a spool, each encoded batch is first written to disk and a second worker pushes the spooled batches in order:
+    an unavailable or slow Loki no longer loses signals nor stalls the queue, and the backlog is replayed once it
+    recovers. Batches then count as shipped, for `add_shipped_callback` too, once they are spooled.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        labels: dict[str, str],
+        label_keys: Iterable[str],
+        metadata_keys: Iterable[str] = (),
+        max_label_values: int | None = None,
+        spool: "Spool | None" = None,
+        replay_rate: float = 10.0,
+        push_timeout: float = 10.0,
+        **kwargs: Any,
+    ) -> None:
+        """Initializes the Loki shipper.
+
+        Args:
+            url: Loki push endpoint.
+            labels: Static labels added to every stream.
+            label_keys: Record fields promoted to stream labels.
+            metadata_keys: Record fields attached to each line as structured metadata.
+            max_label_values: Maximum number of distinct values of each label; see `LokiEncoder`.
+            spool: Write-ahead spool of the encoded batches. None pushes the batches directly.
+            replay_rate: Maximum number of spooled batches pushed per second while replaying a backlog.
+            push_timeout: Maximum time, in seconds, to wait for Loki to answer a push.
+            **kwargs: Queue options forwarded to `BatchShipper`.
+        """
+        self._encoder = LokiEncoder(labels, label_keys, metadata_keys, max_label_values)
+        self._url = url
+        self._push_timeout = push_timeout
+        # the Loki client and its HTTP stack are only imported and built by the first push, on a worker thread
+        self._client_lock = threading.Lock()
+        self._request: Any = None
+        # written by the shipper worker, and the pushes by the replayer instead when spooling
+        self._serialize_latency = Histogram()
+        self._push_latency = Histogram()
+
+        self._spool = spool
+        self._replayer: SpoolReplayer | None = None
+        if spool is not None:
+            from telemetry import spool as spooling  # only imported by spooling shippers
+
+            self._replayer = spooling.SpoolReplayer(spool, self._send, rate=replay_rate)
+        ship = self._push if spool is None else self._write_ahead
+        super().__init__(ship, level_of=record_level, name="signals-loki-shipper", **kwargs)
+
+    @property
+    def spool(self) -> "Spool | None":
+        """Returns the write-ahead spool, if any."""
+        return self._spool
+
+    @property
+    def replayer(self) -> "SpoolReplayer | None":
+        """Returns the worker pushing the spooled batches, if any."""
+        return self._replayer
+
+    def write(self, message: "Message") -> None:
+        """Loguru sink entry point: queues the record behind the formatted message."""
+        self.put(message.record)
+
+    def _connect(self) -> Any:
+        """Returns the Loki push client, importing and building it on first use."""
+        with self._client_lock:
+            if self._request is None:
+                from loki_logger_handler.loki_request import LokiRequest  # pyright: ignore[reportMissingTypeStubs]
+
+                request = LokiRequest(url=self._url, compressed=True)
+                # LokiRequest posts without a timeout: a stalled endpoint would hold the pushing thread forever
+                session: Any = request.session
+                session.request = functools.partial(session.request, timeout=self._push_timeout)
+                self._request = request
+            return self._request
+
+    def stats(self) -> dict[str, Any]:
+        """Returns the counters of the shipper, with the serialization and push times, in milliseconds, and the spool.
+
+        Returns:
+            The counters of `BatchShipper.stats`, plus `serialize_ms` and `push_ms` summaries and, with a spool, the
+            number of spooled batches pending, delivered and failed, and of spool bytes pending.
+        """
+        stats = super().stats()
+        stats["serialize_ms"] = self._serialize_latency.summary(1e-6)
+        stats["push_ms"] = self._push_latency.summary(1e-6)
+        if self._spool is not None and self._replayer is not None:
+            stats["spool"] = {
+                "pending": self._spool.pending,
+                "pending_bytes": self._spool.pending_bytes,
+                "dropped": self._spool.dropped,
+                "delivered": self._replayer.delivered,
+                "failed": self._replayer.failed,
+            }
+        return stats
+
+    def encode(self, records: list["Record"]) -> str:
+        """Groups the records into Loki streams and serializes the push payload."""
+        started_at = time.perf_counter_ns()
+        payload = self._encoder.encode(records)
+        self._serialize_latency.record(time.perf_counter_ns() - started_at)
+        return payload
+
+    def _push(self, records: list["Record"]) -> None:
+        """Sends a batch of records to Loki."""
+        payload = self.encode(records)
+        started_at = time.perf_counter_ns()
+        try:
+            self._connect().send(payload)
+        finally:
+            self._push_latency.record(time.perf_counter_ns() - started_at)
+
+    def _write_ahead(self, records: list["Record"]) -> None:
+        """Spools a batch of records and wakes the replayer up."""
+        if self._spool is not None and self._replayer is not None:
+            self._spool.append(self.encode(records).encode())
+            self._replayer.wake()
+
+    def _send(self, payload: bytes) -> None:
+        """Sends a spooled batch to Loki."""
+        started_at = time.perf_counter_ns()
+        try:
+            self._connect().send(payload.decode())
+        finally:
+            self._push_latency.record(time.perf_counter_ns() - started_at)
+
+    def drain(self, timeout: float | None = None) -> bool:
+        """Ships everything queued so far, including the spooled batches, without waiting for the flush interval.
+
+        Args:
+            timeout: Maximum time, in seconds, to wait for the records to be shipped. None waits indefinitely.
+
+        Returns:
+            True if every record was shipped, False if the timeout expired first.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        if not super().drain(timeout):
+            return False
+        if self._replayer is None:
+            return True
+        return self._replayer.wait_idle(None if deadline is None else max(0.0, deadline - time.monotonic()))
+
+    def stop(self, timeout: float | None = 5.0) -> None:
+        """Stops accepting records, ships what is still queued and stops the workers.
+
+        Spooled batches that cannot be pushed before the timeout stay on disk and are replayed by the next process using
+        the same spool directory. The spool is only closed once both workers have finished: a worker still running
+        keeps using it, and the entries it writes or acknowledges are persisted as it goes.
+
+        Args:
+            timeout: Maximum time, in seconds, to wait for each worker to finish.
+        """
+        super().stop(timeout)
+        if self._replayer is not None and self._spool is not None:
+            replayer_stopped = self._replayer.stop(timeout)
+            if replayer_stopped and not self._worker_alive():
+                self._spool.close()
+
+
+def record_level(record: "Record") -> int:
+    """Returns the numeric level of a loguru record."""
+    return record["level"].no
+
+
+def message_level(message: "Message") -> int:
+    """Returns the numeric level of a loguru message."""
+    return message.record["level"].no
@@ -1,45 +1,170 @@
 """Signals implementation."""
 
+import contextlib
+import dataclasses
+import functools
+import io
+import operator
 import os
 import sys
-from datetime import UTC, datetime
-from typing import Any
+import threading
+import time
+import weakref
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, cast
+
+from telemetry import Constants, LoggerLevel, MetricKind, SignalsConfig, SignalsGroup, SignalsLevel
+from telemetry.context import GroupContext, GroupFrame
+from telemetry.logger_handler import LoggerHandler
+from telemetry.serialization import StaticFields, static_fields
+from telemetry.shipping import BatchShipper, LokiShipper, TextSink, flush_at_exit
+from telemetry.spans import Span
+from telemetry.stats import LevelCounter
+from telemetry.suppression import Repeats, SignalSuppressor
+from tools import BufferedIdGenerator, KeyedSingleton, LazyTimestamp, sortable_id
 
-from loki_logger_handler.formatters.loguru_formatter import LoguruFormatter  # pyright: ignore[reportMissingTypeStubs]
-from loki_logger_handler.loki_logger_handler import LokiLoggerHandler  # pyright: ignore[reportMissingTypeStubs]
+if TYPE_CHECKING:
+    from collections.abc import Callable, Hashable, Iterable
+    from typing import BinaryIO, TextIO
 
-from telemetry import Constants, LoggerLevel, SignalsConfig, SignalsGroup, SignalsLevel
-from telemetry.logger_handler import LoggerHandler
-from tools import generate_uuid4
-from tools.uuid import integer_time_id
+    from loguru import Record
+    from pandas import DataFrame  # pyright: ignore[reportMissingTypeStubs]
+
+    from telemetry.archive import ArchiveSink
+    from telemetry.collector import CollectorHandle, RecordForwarder
+    from telemetry.docs import ShippedDocs
+    from telemetry.fingerprint import Fingerprinter
+    from telemetry.metrics import MetricsAggregator
+    from telemetry.profiling import DatasetProfiler
+    from telemetry.spool import Spool
+
+
+# reads every configuration value at once, in field order
+_config_values = operator.attrgetter(*(field.name for field in dataclasses.fields(SignalsConfig)))
+
+
+class Signals(metaclass=KeyedSingleton):
+    """Implements the signals emitting functionality for the application.
+
+    When `SignalsConfig.use_singleton_design_pattern` is set, constructing Signals again with an equal configuration
+    returns the instance already built, with its sinks, instead of setting up new ones.
+
+    The current process, task or step lives in a context variable. Asyncio tasks inherit the group current when they
+    are created, but threads start outside of any group, whereas earlier versions shared the current group between all
+    threads. A thread runs under the current group when its target runs in a copy of the current context:
 
+        context = contextvars.copy_context()
+        threading.Thread(target=context.run, args=(load_table, table)).start()
 
-class Signals:
-    """Implements the signals emitting functionality for the application."""
+    or, with an executor, `executor.submit(contextvars.copy_context().run, load_table, table)`.
+    """
 
-    def __init__(self, config: SignalsConfig, **kwargs: Any) -> None:
-        """Initializes Signals."""
-        os.environ["LOKI_URL"] = "http://192.168.200.61:3100/loki/api/v1/push"
+    @classmethod
+    def registry_key(
+        cls, config: SignalsConfig, forward_to: "CollectorHandle | None" = None, **kwargs: Any
+    ) -> "Hashable | None":
+        """Returns the key under which the instance built with these arguments is registered.
+
+        Args:
+            config: Signals configuration.
+            forward_to: Collector handle; forwarding instances are never registered.
+            **kwargs: Additional options of the stdout sink.
+
+        Returns:
+            The configuration values and stdout sink options, or None when the instance is not to be registered.
+        """
+        if forward_to is not None or not config.use_singleton_design_pattern:
+            return None
+        values: tuple[Any, ...] = _config_values(config)
+        if any(type(value) is dict for value in values):
+            values = tuple(
+                tuple(sorted(cast("dict[str, Any]", value).items())) if isinstance(value, dict) else value
+                for value in values
+            )
+        key = (values, tuple(sorted(kwargs.items())))
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    def __init__(self, config: SignalsConfig, forward_to: "CollectorHandle | None" = None, **kwargs: Any) -> None:
+        """Initializes Signals.
+
+        Args:
+            config: Signals configuration.
+            forward_to: Collector handle received from the parent process. When given, no sink is set up: signals are
+                forwarded to the collector, under the job and group of the parent process.
+            **kwargs: Additional options of the stdout sink.
+        """
         self.__config: SignalsConfig = config
-        self.__logger = LoggerHandler().logger
+        logger_handler = LoggerHandler()
+        self.__logger = logger_handler.logger
+
+        # level gate: records below every sink level are discarded before any field is computed
+        self.__level_numbers: dict[str, int] = logger_handler.level_numbers
+        self.__sink_levels: dict[int, int] = {}
+        self._min_level: float = float("inf")
+        self._emit: Callable[..., None]
+        self.__forwarder: RecordForwarder | None = None
+        # token carried by the records of this instance and its views: sinks added by an instance only receive the
+        # records of that instance, although every instance adds its sinks to the same loguru logger
+        self.__owner = object()
+        # sinks set up from the configuration, by name
+        self.__sinks: dict[str, Any] = {}
+
+        # self-instrumentation: signals handed to the sinks, per level
+        self._emitted = LevelCounter()
+
+        # this instance and the views returned by `bind`, copies of it sharing its sinks and group context
+        self.__views: weakref.WeakSet[Signals] = weakref.WeakSet([self])
+        self._bound_fields: dict[str, Any] = {}
+
+        # identifiers
+        self._new_event_id = config.event_id_factory or BufferedIdGenerator(config.event_id_format).next_id
 
         # signal attributes
         # job uuid
-        self._job_uuid: str = generate_uuid4()
+        self._job_uuid: str = forward_to.job_uuid if forward_to else self._new_event_id()
 
-        # group uuid
-        self._process_uuid: str | None = None
-        self._task_uuid: str | None = None
-        self._step_uuid: str | None = None
+        # process control: the current group lives in a context variable, so threads and asyncio tasks sharing this
+        # instance each see their own hierarchy
+        self._groups = GroupContext(
+            name=f"signals_group_{self._job_uuid}", root=forward_to.group if forward_to else None
+        )
 
-        # process control
-        self._current_group_uuid: str | None = None
-        self._current_group_name: str | None = None
+        # log storm suppression, ahead of every sink
+        self._suppressor: SignalSuppressor | None = None
+        if config.suppression_rate is not None or config.suppression_level_rates or config.suppression_window > 0:
+            self._suppressor = SignalSuppressor(
+                self.__emit_repeats,
+                rate=config.suppression_rate,
+                level_rates=config.suppression_level_rates,
+                burst=config.suppression_burst,
+                window=config.suppression_window,
+                exempt_levels=[group.name for group in SignalsGroup],
+            )
+            # the repeats of the windows still open at exit are emitted before the shippers stop
+            flush_at_exit(self._suppressor.flush)
+
+        # optional features, imported and built on first use: the metrics aggregator, the fingerprinter and the
+        # record of shipped documents, by name; the dictionary is shared with the views
+        self.__features: dict[str, Any] = {}
+        # the metrics still aggregated at exit are emitted before the shippers stop
+        flush_at_exit(self.flush_metrics)
+
+        if config.stats_interval > 0:
+            self.__every(config.stats_interval, "signals-stats", Signals.__emit_stats)
+        if config.metrics_flush_interval > 0:
+            self.__every(config.metrics_flush_interval, "signals-metrics", Signals.flush_metrics)
+
+        if forward_to is not None:
+            self.__setup_forwarding(forward_to)
+            return
 
         # setup logger
         self.__setup_logger_main_configurations()
-        self.__setup_loki_server(url=os.environ["LOKI_URL"])
-        self.__setup_logger_default_output_sink(**kwargs)
+        self.__setup_sinks(**kwargs)
 
         # greeting with job uuid
         self.info(f"Job started with UUID: {self.job_uuid}")
@@ -54,51 +179,540 @@ class Signals:
             parent_uuid=self.current_group_uuid or self.job_uuid,
             signal_group_name="",
         )
+        # fields shared by every signal, serialized once for Loki; attached to records outside of `extra`
+        self.__static_fields = StaticFields(
+            {"app_name": self.__config.app_name, "job_uuid": self.job_uuid}, owner=self.__owner
+        )
         # self.__logger.level("TRACE")
-        self.__logger.remove(0)
-
-    def __setup_loki_server(self, url: str) -> None:
+        # the default stderr sink of loguru, only present until the first instance removes it
+        with contextlib.suppress(ValueError):
+            self.__logger.remove(0)
+        self._emit = self.__logger.patch(self.__static_fields.patcher()).log
+
+    def __setup_forwarding(self, handle: "CollectorHandle") -> None:
+        """Forwards the signals of a worker process to the collector of the parent process."""
+        from telemetry.collector import RecordForwarder  # only imported by worker processes
+
+        forwarder = RecordForwarder(
+            handle.queue,
+            self.__level_numbers,
+            queue_size=self.__config.loki_queue_size,
+            batch_size=self.__config.loki_batch_size,
+            flush_interval=self.__config.loki_flush_interval,
+            overflow_policy=self.__config.loki_overflow_policy,
+            overflow_level=self.__config.loki_overflow_level,
+        )
+        self.__forwarder = forwarder
+        self._emit = forwarder.log
+        from multiprocessing.util import Finalize  # worker processes leave through multiprocessing finalizers
+
+        # ahead of the finalizer of the forwarder, whose priority is 10
+        Finalize(self, self.flush_metrics, exitpriority=12)
+        if self._suppressor is not None:
+            Finalize(self._suppressor, self._suppressor.flush, exitpriority=11)
+        self._min_level = handle.min_level
+
+    def __setup_sinks(self, **kwargs: Any) -> None:
+        """Sets up the configured sinks and routes the signals to them."""
+        config = self.__config
+        stdout_format = config.output_format or Constants.SIGNALS_SINK_FORMAT_DEFAULT_VALUE
+        text_options: dict[str, Any] = {"format": stdout_format, "serialize": False, "backtrace": True, "catch": True}
+        record_options: dict[str, Any] = {"format": "{message}", "catch": True}
+
+        # sinks by name: how to build each one, its level without routing and its loguru options
+        factories: dict[str, tuple[Callable[[], Any], int, dict[str, Any]]] = {
+            "stdout": (
+                self._stdout_sink,
+                config.log_from_level,
+                {**text_options, "colorize": True, "diagnose": True, "enqueue": False, **kwargs},
+            ),
+        }
+        url = self.__loki_url()
+        if url:
+            factories["loki"] = (
+                functools.partial(self.__setup_loki_server, url),
+                config.loki_log_from_level,
+                record_options,
+            )
+        if config.archive_directory:
+            factories["archive"] = (self.__setup_archive, config.archive_log_from_level, record_options)
+        for name, path in (config.file_sinks or {}).items():
+            if name in factories:
+                msg = f"The file sink {name!r} is named like a built-in sink."
+                raise ValueError(msg)
+            factories[name] = (
+                functools.partial(self.__open_file_sink, path),
+                config.log_from_level,
+                {**text_options, "colorize": False, "diagnose": False},
+            )
+
+        routing = None
+        if config.routes is not None:
+            from telemetry.routing import RoutingTable  # only imported by routed configurations
+
+            routing = RoutingTable(config.routes, self.__level_numbers, factories)
+        for name, (factory, default_level, default_options) in factories.items():
+            level: int | None = default_level
+            options = default_options
+            if routing is not None:
+                level = routing.min_level(name)
+                if level is None:
+                    # nothing is routed to this sink, which is not even built
+                    continue
+                options = {**default_options, "filter": routing.filter(name)}
+            sink = factory()
+            self.add_sink(sink=sink, level=level, **options)
+            self.__sinks[name] = sink
+
+    def __loki_url(self) -> str | None:
+        """Returns the Loki push endpoint, from the configuration or the `LOKI_URL` environment variable."""
+        return self.__config.loki_url or os.environ.get("LOKI_URL") or None
+
+    def __setup_loki_server(self, url: str) -> BatchShipper[Any]:
         """Setup Loki server access."""
-        # sets the LokiLoggerHandler configuration
-        custom_handler = LokiLoggerHandler(
+        # records are queued and pushed to Loki in batches by a background worker, optionally through a local spool
+        spool = None
+        if self.__config.loki_spool_directory:
+            from telemetry.spool import Spool  # only imported by spooling configurations
+
+            spool = Spool(
+                self.__config.loki_spool_directory,
+                segment_size=self.__config.loki_spool_segment_size,
+                fsync_policy=self.__config.loki_spool_fsync,
+                use_mmap=self.__config.loki_spool_mmap,
+                max_bytes=self.__config.loki_spool_max_bytes,
+            )
+        shipper = self._loki_shipper(url, spool)
+        # documents only count as shipped once pushed, including those forwarded by worker processes
+        shipper.add_shipped_callback(self.__record_shipped_docs)
+        return shipper
+
+    def _loki_shipper(self, url: str, spool: "Spool | None") -> BatchShipper[Any]:
+        """Returns the sink shipping the signals to Loki; subclasses can ship them differently.
+
+        Args:
+            url: Loki push endpoint.
+            spool: Write-ahead spool of the encoded batches, when configured.
+        """
+        return LokiShipper(
             url=url,
             labels={"application": self.__config.app_name, "environment": self.__config.environment},
-            label_keys={"job_uuid", "level", "parent_uuid", "signal_group_name"},
-            default_formatter=LoguruFormatter(),  # pyright: ignore[reportArgumentType]
+            label_keys=self.__config.loki_label_keys,
+            metadata_keys=self.__config.loki_metadata_keys,
+            max_label_values=self.__config.loki_max_label_values,
+            spool=spool,
+            replay_rate=self.__config.loki_replay_rate,
+            push_timeout=self.__config.loki_push_timeout,
+            queue_size=self.__config.loki_queue_size,
+            batch_size=self.__config.loki_batch_size,
+            flush_interval=self.__config.loki_flush_interval,
+            overflow_policy=self.__config.loki_overflow_policy,
+            overflow_level=self.__config.loki_overflow_level,
         )
-        self.__logger.configure(handlers=[{"sink": custom_handler, "serialize": True}])
-
-    def __setup_logger_default_output_sink(self, **kwargs: Any) -> None:
-        """Configures a sink for the logger."""
-        self.__logger.add(
-            sink=sys.stdout,
-            level=self.__config.log_from_level,
-            format=self.__config.output_format or Constants.SIGNALS_SINK_FORMAT_DEFAULT_VALUE,
-            colorize=True,
-            serialize=False,
-            backtrace=True,
-            diagnose=True,
-            enqueue=False,
-            catch=True,
-            **kwargs,
+
+    def _stdout_sink(self) -> Any:
+        """Returns the sink writing the signals to stdout: stdout itself, or a queued sink when routes are set."""
+        if self.__config.routes is None:
+            return sys.stdout
+        return self._text_sink(sys.stdout)
+
+    def _text_sink(self, stream: "TextIO", *, close: bool = False) -> Any:
+        """Returns a sink writing the signals to a text stream from a queue and worker of its own.
+
+        Subclasses can write them differently.
+
+        Args:
+            stream: Text stream the formatted signals are written to.
+            close: Closes the stream when the sink is removed.
+        """
+        return TextSink(
+            stream,
+            close=close,
+            queue_size=self.__config.loki_queue_size,
+            batch_size=1_000,
+            flush_interval=0,
+            overflow_policy=self.__config.loki_overflow_policy,
+            overflow_level=self.__config.loki_overflow_level,
+        )
+
+    def __open_file_sink(self, path: str) -> Any:
+        """Returns the sink of a file, appended to."""
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        return self._text_sink(Path(path).open("a", encoding="utf-8"), close=True)  # noqa: SIM115
+
+    def __setup_archive(self) -> "ArchiveSink":
+        """Setup the columnar archive of signals."""
+        from telemetry.archive import ArchiveSink  # only imported by archiving configurations
+
+        return ArchiveSink(
+            self.__config.archive_directory or "",
+            archive_format=self.__config.archive_format,
+            row_group_size=self.__config.archive_row_group_size,
+            flush_interval=self.__config.archive_flush_interval,
+            max_file_bytes=self.__config.archive_max_file_bytes,
+            max_file_seconds=self.__config.archive_max_file_seconds,
         )
 
+    def add_sink(self, sink: Any, level: int | str = LoggerLevel.DEBUG, **kwargs: Any) -> int:
+        """Adds a loguru sink receiving the signals of this instance.
+
+        The sink only receives the signals of this instance and of its views, not those of other instances nor the
+        records logged with loguru directly.
+
+        Args:
+            sink: Any sink accepted by `loguru.logger.add`.
+            level: Minimum level, as a number or a level name, emitted to the sink.
+            **kwargs: Additional options forwarded to `loguru.logger.add`. A `filter` must be a callable or a module
+                name.
+
+        Returns:
+            The sink identifier, to be used with `remove_sink`.
+
+        Raises:
+            TypeError: If the filter is neither a callable nor a module name.
+        """
+        kwargs["filter"] = self.__own_records(kwargs.get("filter"))
+        sink_id: int = self.__logger.add(sink=sink, level=level, **kwargs)
+        self.__sink_levels[sink_id] = level if isinstance(level, int) else self.__level_numbers[level]
+        self.__set_min_level(min(self.__sink_levels.values()))
+        return sink_id
+
+    def _remove_sinks(self) -> None:
+        """Removes every sink of this instance from loguru; the signals emitted afterwards are dropped."""
+        for sink_id in list(self.__sink_levels):
+            self.remove_sink(sink_id)
+
+    def __own_records(self, accepts: "Callable[[Record], bool] | str | None") -> "Callable[[Record], bool]":
+        """Returns a loguru filter accepting the records of this instance that the filter of a sink accepts."""
+        owner = self.__owner
+        if isinstance(accepts, str):
+            accepts = _module_filter(accepts)
+        elif accepts is not None and not callable(accepts):
+            msg = f"Sink filters of Signals must be callables or module names, not {type(accepts).__name__}."
+            raise TypeError(msg)
+        if accepts is None:
+            return lambda record: getattr(static_fields(record), "owner", None) is owner
+
+        def own(record: "Record") -> bool:
+            return getattr(static_fields(record), "owner", None) is owner and accepts(record)
+
+        return own
+
+    def remove_sink(self, sink_id: int) -> None:
+        """Removes a sink previously added with `add_sink`."""
+        self.__logger.remove(sink_id)
+        del self.__sink_levels[sink_id]
+        self.__set_min_level(min(self.__sink_levels.values(), default=float("inf")))
+
+    def __set_min_level(self, level: float) -> None:
+        """Sets the level gate of this instance and of every view sharing its sinks."""
+        for view in self.__views:
+            # views copy the level gate so that their calls read it as fast as this instance does
+            view._min_level = level  # noqa: SLF001
+
+    def bind(self, **fields: Any) -> "Signals":
+        """Returns a view of this instance adding the given fields to every signal it emits.
+
+        The view shares the sinks, the suppression stage and the group context of this instance, so groups started
+        through it are groups of this instance too. The fields are merged once, when binding, instead of on every
+        call, and a view can be bound again to add more fields.
+
+        Args:
+            **fields: Fields added to every signal of the view. Fields given to a call take precedence.
+
+        Returns:
+            The view, a Signals instance.
+        """
+        return BoundSignals(self, fields)
+
+    def _bind(self, fields: dict[str, Any]) -> None:
+        """Turns a copy of a Signals instance into a view adding `fields` to the fields it was bound with."""
+        self._bound_fields = {**self._bound_fields, **fields}
+        if self.__forwarder is not None:
+            self._emit = functools.partial(self.__forwarder.log, **self._bound_fields)
+        else:
+            self.__static_fields = StaticFields({**self.__static_fields.fields, **fields}, owner=self.__owner)
+            self._emit = self.__logger.bind(**self._bound_fields).patch(self.__static_fields.patcher()).log
+        self.__views.add(self)
+
+    @property
+    def bound_fields(self) -> dict[str, Any]:
+        """Returns the fields added to every signal by `bind`."""
+        return dict(self._bound_fields)
+
+    def is_enabled_for(self, level: str) -> bool:
+        """Returns whether a signal of the given level reaches at least one sink."""
+        return self.__level_numbers.get(level, self._min_level) >= self._min_level
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Ships every queued signal without waiting for the flush interval.
+
+        Args:
+            timeout: Maximum time, in seconds, to wait for the queued signals to be shipped. None waits indefinitely.
+
+        Every queue is drained: Loki, or the collector in worker processes, the archive and the routed stdout and
+        file sinks.
+
+        Returns:
+            True if every queued signal was shipped, False if the timeout expired first.
+        """
+        self.flush_metrics()
+        if self._suppressor is not None:
+            self._suppressor.flush()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        shipped = True
+        for queue in self._queues().values():
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            shipped = queue.drain(remaining) and shipped
+        return shipped
+
+    def _queues(self) -> dict[str, BatchShipper[Any]]:
+        """Returns the queued sinks of this instance, by name."""
+        queues: dict[str, BatchShipper[Any]] = {
+            name: sink for name, sink in self.__sinks.items() if isinstance(sink, BatchShipper)
+        }
+        if self.__forwarder is not None:
+            queues["collector"] = self.__forwarder
+        return queues
+
+    def stats(self) -> dict[str, Any]:
+        """Returns the health counters of the telemetry pipeline of this instance and its views.
+
+        Reading them takes a few locks briefly; counting costs the emitting threads a dictionary increment per signal,
+        and the shipper workers a clock reading per batch.
+
+        Returns:
+            - `emitted`: signals handed to the sinks, per level name;
+            - `suppressed`: signals collapsed as repeats or dropped by rate limiting, when suppression is enabled;
+            - `loki`, or `collector` in worker processes: queue depth and high-water mark, items shipped, dropped per
+              level and failed, batch sizes and, in milliseconds, ship, serialization and push time percentiles;
+            - `archive`: the same queue counters for the archive sink, when configured;
+            - `sinks`: the same queue counters for the routed stdout sink and the file sinks, by name, when configured.
+        """
+        level_names = {number: name for name, number in self.__level_numbers.items()}
+        stats: dict[str, Any] = {"emitted": self._emitted.totals()}
+        if self._suppressor is not None:
+            stats["suppressed"] = {
+                "repeated": self._suppressor.repeated,
+                "rate_limited": self._suppressor.rate_limited,
+            }
+        for name, sink in self._queues().items():
+            sink_stats = sink.stats()
+            sink_stats["dropped_by_level"] = {
+                level_names.get(level, str(level)): count for level, count in sink_stats["dropped_by_level"].items()
+            }
+            if name in {"loki", "collector", "archive"}:
+                stats[name] = sink_stats
+            else:
+                stats.setdefault("sinks", {})[name] = sink_stats
+        return stats
+
+    def __every(self, interval: float, name: str, action: "Callable[[Signals], None]") -> None:
+        """Runs `action` on this instance every `interval` seconds from a daemon thread, until the instance is gone."""
+        reference = weakref.ref(self)
+
+        def run() -> None:
+            while True:
+                time.sleep(interval)
+                signals = reference()
+                if signals is None:
+                    return
+                action(signals)
+                del signals
+
+        threading.Thread(target=run, name=name, daemon=True).start()
+
+    def __emit_stats(self) -> None:
+        """Emits the stats as a DEVOPS signal."""
+        self.devops("Telemetry stats.", telemetry_stats=self.stats())
+
     def log(self, level: str, message: str, event_uuid: str | None = None, **kwargs: Any) -> None:
         """Emit logs."""
-        self.__logger.log(
+        # unknown levels fall through so that loguru reports them
+        if self.__level_numbers.get(level, self._min_level) < self._min_level:
+            return
+
+        frame = self._groups.current
+        if self._suppressor is not None:
+            added = self._suppressor.admit(level, message, kwargs, frame, self._emit)
+            if added is None:
+                return
+            if added:
+                kwargs = {**kwargs, **added}
+
+        self._emit(
             level,
             message,
-            message_id=integer_time_id(),
-            event_uuid=event_uuid or generate_uuid4(),
-            parent_uuid=self._current_group_uuid or self.job_uuid or generate_uuid4(),
-            signal_group_name=self.current_group_name or "Job",
-            signal_timestamp=datetime.now(UTC).strftime("%Y-%m-%d %H:%M:%S.%f")[:-3],
+            message_id=sortable_id(),
+            event_uuid=event_uuid or self._new_event_id(),
+            parent_uuid=(frame and frame.uuid) or self.job_uuid,
+            signal_group_name=(frame and frame.name) or "Job",
+            signal_timestamp=LazyTimestamp.now(),
             **kwargs,
         )
+        self._emitted.add(level)
+
+    def __emit_in_frame(
+        self,
+        emit: "Callable[..., None]",
+        frame: GroupFrame | None,
+        level: str,
+        message: str,
+        timestamp: LazyTimestamp,
+        **fields: Any,
+    ) -> None:
+        """Emits a signal on behalf of a group that may not be current, e.g. from another thread or after the fact."""
+        emit(
+            level,
+            message,
+            message_id=sortable_id(),
+            event_uuid=self._new_event_id(),
+            parent_uuid=(frame and frame.uuid) or self.job_uuid,
+            signal_group_name=(frame and frame.name) or "Job",
+            signal_timestamp=timestamp,
+            **fields,
+        )
+        self._emitted.add(level)
+
+    def __emit_repeats(self, repeats: Repeats) -> None:
+        """Emits the repeats collapsed by the deduplication window as one signal, in the group of the first one."""
+        self.__emit_in_frame(
+            repeats.scope,
+            repeats.context,
+            repeats.level,
+            repeats.message,
+            LazyTimestamp(repeats.last_seen_ns),
+            **repeats.fields,
+            repeat_count=repeats.repeat_count,
+            first_seen=LazyTimestamp(repeats.first_seen_ns),
+            last_seen=LazyTimestamp(repeats.last_seen_ns),
+        )
+
+    def __record_metric(self, kind: MetricKind, name: str, value: float, level: SignalsLevel) -> None:
+        """Records a metric value in the current group, unless its level reaches no sink."""
+        if self._min_level <= level:
+            self.__metrics().record(self._groups.current, level.name, kind, name, value)
+
+    def __metrics(self) -> "MetricsAggregator":
+        """Returns the metrics aggregated per group, emitted when the group ends, on flush and periodically."""
+        metrics = self.__features.get("metrics")
+        if metrics is None:
+            from telemetry.metrics import MetricsAggregator  # only imported by the first metric
+
+            metrics = self.__features.setdefault("metrics", MetricsAggregator())
+        return metrics
+
+    def __fingerprinter(self) -> "Fingerprinter":
+        """Returns the fingerprinter of the inputs named by signals; files are cached by size and mtime."""
+        fingerprinter = self.__features.get("fingerprinter")
+        if fingerprinter is None:
+            from telemetry.fingerprint import Fingerprinter  # only imported by the first fingerprint
+
+            config = self.__config
+            fingerprinter = self.__features.setdefault(
+                "fingerprinter",
+                Fingerprinter(
+                    cache_path=config.fingerprint_cache_path,
+                    chunk_size=config.fingerprint_chunk_size,
+                    workers=config.fingerprint_workers,
+                ),
+            )
+        return fingerprinter
+
+    def __shipped_docs(self) -> "ShippedDocs":
+        """Returns the record of the documents already shipped."""
+        shipped = self.__features.get("shipped_docs")
+        if shipped is None:
+            from telemetry.docs import ShippedDocs  # only imported by the first document
+
+            config = self.__config
+            shipped = self.__features.setdefault(
+                "shipped_docs",
+                ShippedDocs(config.docs_directory, config.app_name, config.environment, self.__loki_url()),
+            )
+        return shipped
+
+    def __record_shipped_docs(self, records: list["Record"]) -> None:
+        """Records the documents carried by a batch of signals pushed to Loki."""
+        for record in records:
+            extra = record["extra"]
+            fingerprint = extra.get("doc_hash")
+            if fingerprint is not None:
+                self.__shipped_docs().delivered(fingerprint, extra.get("doc_chunk", 1), extra.get("doc_chunks", 1))
+
+    def count(self, name: str, value: float = 1, level: SignalsLevel = SignalsLevel.DATAOPS) -> None:
+        """Adds `value` to a counter of the current group, e.g. the rows processed.
+
+        Metrics are aggregated in memory and emitted as one signal per group and level, with summary statistics, when
+        the group ends, when `flush` or `flush_metrics` is called, and every `SignalsConfig.metrics_flush_interval`.
+
+        Args:
+            name: Name of the counter.
+            value: Amount added to the counter.
+            level: Level of the signal the counter is emitted with, DATAOPS or DEVOPS.
+
+        Raises:
+            ValueError: If `value` is not finite.
+        """
+        self.__record_metric(MetricKind.COUNTER, name, value, level)
+
+    def gauge(self, name: str, value: float, level: SignalsLevel = SignalsLevel.DATAOPS) -> None:
+        """Sets a gauge of the current group, e.g. a queue depth; its minimum, maximum and mean are emitted too.
+
+        Args:
+            name: Name of the gauge.
+            value: Current value of the gauge.
+            level: Level of the signal the gauge is emitted with, DATAOPS or DEVOPS.
+
+        Raises:
+            ValueError: If `value` is not finite.
+        """
+        self.__record_metric(MetricKind.GAUGE, name, value, level)
+
+    def observe(self, name: str, value: float, level: SignalsLevel = SignalsLevel.DATAOPS) -> None:
+        """Records a value in a histogram of the current group, e.g. a latency per batch.
+
+        The histogram is emitted with the count, sum, mean, minimum, maximum and 50th, 90th and 99th percentiles of
+        its values.
+
+        Args:
+            name: Name of the histogram.
+            value: Recorded value.
+            level: Level of the signal the histogram is emitted with, DATAOPS or DEVOPS.
+
+        Raises:
+            ValueError: If `value` is not finite.
+        """
+        self.__record_metric(MetricKind.HISTOGRAM, name, value, level)
+
+    def flush_metrics(self) -> None:
+        """Emits the metrics aggregated so far in every group, one signal per group and level, and resets them."""
+        metrics: MetricsAggregator | None = self.__features.get("metrics")
+        if metrics is not None:
+            self.__emit_metrics(metrics.take_all())
+
+    def __emit_metrics(self, groups: list[tuple[GroupFrame | None, str, dict[str, dict[str, Any]]]]) -> None:
+        """Emits the summaries of the metrics of groups, one signal per group and level."""
+        for frame, level, metrics in groups:
+            name = (frame and frame.name) or "Job"
+            self.__emit_in_frame(self._emit, frame, level, f"{name} metrics.", LazyTimestamp.now(), metrics=metrics)
+
+    def emit_forwarded(self, level: str, message: str, fields: dict[str, Any], **kwargs: Any) -> None:
+        """Emits a signal whose fields were computed by another process, e.g. a worker forwarding to a collector.
 
-    def __initialize_group(self, group: SignalsGroup, title: str, summary: str, **kwargs: Any) -> None:
+        Args:
+            level: Level name of the signal.
+            message: Message of the signal.
+            fields: Fields computed by the emitting process.
+            **kwargs: Additional fields added by the receiving process.
+        """
+        if self.__level_numbers.get(level, self._min_level) >= self._min_level:
+            self._emit(level, message, **fields, **kwargs)
+            self._emitted.add(level)
+
+    def __initialize_group(self, group: SignalsGroup, title: str, summary: str, **kwargs: Any) -> Span:
         """Starts a new group."""
-        _uuid = generate_uuid4()
+        _uuid = self._new_event_id()
 
         self.log(
             event_uuid=_uuid,
@@ -108,60 +722,135 @@ class Signals:
             title=title,
             **kwargs,
         )
-        self.current_group_uuid = _uuid
-        self.current_group_name = title.title()
+        previous = self._groups.current
+        return Span(
+            frame=self._groups.push(group=group, uuid=_uuid, name=title.title()),
+            title=title,
+            on_end=self.__finalize_group,
+            previous=previous,
+            on_enter=self.__enter_group,
+            track_cpu_time=self.__config.span_cpu_time,
+            track_memory=self.__config.span_memory,
+        )
+
+    def __enter_group(self, span: Span) -> None:
+        """Keeps groups of the kind of a group entered by a `with` block nested under it until it ends."""
+        self._groups.enter(span.frame)
+
+    def __finalize_group(self, span: Span, error: BaseException | None) -> None:
+        """Emits the end signal of a group and restores the group that was current when it started."""
+        frame = span.frame
+        self._groups.exit(frame)
+        if frame.group is not None:
+            # groups started inside the span without being ended are closed with it
+            self._groups.replace(frame)
+            metrics: MetricsAggregator | None = self.__features.get("metrics")
+            if metrics is not None and len(metrics):
+                self.__emit_metrics(metrics.take(frame))
+            status = "failed" if error else "finished"
+            fields: dict[str, Any] = span.metrics()
+            if error:
+                fields["error"] = repr(error)
+            self.log(
+                level=frame.group.name,
+                message=f"{span.title} {status}.",
+                group_uuid=frame.uuid,
+                group_parent_uuid=span.parent_uuid or self.job_uuid,
+                status=status,
+                title=span.title,
+                **fields,
+            )
+        self._groups.replace(span.previous)
+
+    def process(self, title: str, summary: str, **kwargs: Any) -> Span:
+        """Starts a new Process group.
+
+        The returned span can be used as a context manager: leaving the block emits the end of the process with its
+        duration and restores the previous group.
+        """
+        return self.__initialize_group(group=SignalsGroup.PROCESS, title=title, summary=summary, **kwargs)
+
+    def task(self, title: str, summary: str, **kwargs: Any) -> Span:
+        """Starts a new Task group.
 
-    def process(self, title: str, summary: str, **kwargs: Any) -> None:
-        """Starts a new Process group."""
-        self.__initialize_group(group=SignalsGroup.PROCESS, title=title, summary=summary, **kwargs)
+        The returned span can be used as a context manager: leaving the block emits the end of the task with its
+        duration and restores the previous group.
+        """
+        return self.__initialize_group(group=SignalsGroup.TASK, title=title, summary=summary, **kwargs)
+
+    def step(self, title: str, summary: str | None = None, **kwargs: Any) -> Span:
+        """Starts a new Step group.
+
+        The returned span can be used as a context manager: leaving the block emits the end of the step with its
+        duration and restores the previous group.
+        """
+        return self.__initialize_group(group=SignalsGroup.STEP, title=title, summary=summary or "", **kwargs)
 
-    def task(self, title: str, summary: str, **kwargs: Any) -> None:
-        """Starts a new Task group."""
-        self.__initialize_group(group=SignalsGroup.TASK, title=title, summary=summary, **kwargs)
+    @property
+    def config(self) -> SignalsConfig:
+        """Returns the configuration of this instance."""
+        return self.__config
 
-    def step(self, title: str, summary: str | None = None, **kwargs: Any) -> None:
-        """Starts a new Task group."""
-        self.__initialize_group(group=SignalsGroup.STEP, title=title, summary=summary or "", **kwargs)
+    @property
+    def min_level(self) -> float:
+        """Returns the lowest level reaching a sink; signals below it are discarded."""
+        return self._min_level
 
     @property
     def job_uuid(self) -> str:
         """Returns job uuid."""
         return self._job_uuid
 
+    def __innermost_group_uuid(self, group: SignalsGroup) -> str | None:
+        """Returns the UUID of the innermost started group of the given type in the current hierarchy."""
+        frame = self._groups.current
+        while frame is not None and frame.group is not group:
+            frame = frame.parent
+        return frame.uuid if frame else None
+
     @property
     def process_uuid(self) -> str | None:
         """Returns the Process UUID or None."""
-        return self._process_uuid
+        return self.__innermost_group_uuid(SignalsGroup.PROCESS)
 
     @property
     def task_uuid(self) -> str | None:
         """Returns the Task UUID or None."""
-        return self._task_uuid
+        return self.__innermost_group_uuid(SignalsGroup.TASK)
 
     @property
     def step_uuid(self) -> str | None:
         """Returns the Step UUID or None."""
-        return self._step_uuid
+        return self.__innermost_group_uuid(SignalsGroup.STEP)
+
+    @property
+    def current_group(self) -> GroupFrame | None:
+        """Returns the group frame current in this thread or asyncio task, or None."""
+        return self._groups.current
 
     @property
     def current_group_uuid(self) -> str | None:
         """Returns the current group UUID or None."""
-        return self._current_group_uuid
+        frame = self._groups.current
+        return frame.uuid if frame else None
 
     @current_group_uuid.setter
     def current_group_uuid(self, value: str | None) -> None:
         """Sets the current group UUID."""
-        self._current_group_uuid = value
+        frame = self._groups.current
+        self._groups.replace(frame._replace(uuid=value) if frame else GroupFrame(uuid=value, name=None))
 
     @property
     def current_group_name(self) -> str | None:
         """Returns the current group name or None."""
-        return self._current_group_name
+        frame = self._groups.current
+        return frame.name if frame else None
 
     @current_group_name.setter
     def current_group_name(self, value: str | None) -> None:
         """Sets the current group name."""
-        self._current_group_name = value
+        frame = self._groups.current
+        self._groups.replace(frame._replace(name=value) if frame else GroupFrame(uuid=None, name=value))
 
     def trace(self, message: str, **kwargs: Any) -> None:
         """Logs a trace-level message.
@@ -177,7 +866,8 @@ class Signals:
         Returns:
             None
         """
-        self.log(level="TRACE", message=message, **kwargs)
+        if self._min_level <= LoggerLevel.TRACE:
+            self.log(level="TRACE", message=message, **kwargs)
 
     def debug(self, message: str, **kwargs: Any) -> None:
         """Logs a debug message with optional keyword arguments.
@@ -193,7 +883,8 @@ class Signals:
         Returns:
             None
         """
-        self.log(level="DEBUG", message=message, **kwargs)
+        if self._min_level <= LoggerLevel.DEBUG:
+            self.log(level="DEBUG", message=message, **kwargs)
 
     def info(self, message: str, **kwargs: Any) -> None:
         """Logs an informational message.
@@ -208,7 +899,8 @@ class Signals:
         Returns:
             None
         """
-        self.log(level=LoggerLevel.INFO.name, message=message, **kwargs)
+        if self._min_level <= LoggerLevel.INFO:
+            self.log(level=LoggerLevel.INFO.name, message=message, **kwargs)
 
     def warning(self, message: str, **kwargs: Any) -> None:
         """Logs a warning message with additional context if provided.
@@ -226,7 +918,8 @@ class Signals:
         Returns:
             None
         """
-        self.log(level="WARNING", message=message, **kwargs)
+        if self._min_level <= LoggerLevel.WARNING:
+            self.log(level="WARNING", message=message, **kwargs)
 
     def error(self, message: str, **kwargs: Any) -> None:
         """Logs an error message with the provided details.
@@ -241,7 +934,8 @@ class Signals:
         Returns:
             None
         """
-        self.log(level="ERROR", message=message, **kwargs)
+        if self._min_level <= LoggerLevel.ERROR:
+            self.log(level="ERROR", message=message, **kwargs)
 
     def critical(self, message: str, **kwargs: Any) -> None:
         """Log a critical level message.
@@ -258,7 +952,8 @@ class Signals:
         Returns:
             None
         """
-        self.log(level="CRITICAL", message=message, **kwargs)
+        if self._min_level <= LoggerLevel.CRITICAL:
+            self.log(level="CRITICAL", message=message, **kwargs)
 
     def success(self, message: str, **kwargs: Any) -> None:
         """Logs a success message with a specified level.
@@ -287,25 +982,58 @@ class Signals:
         Returns:
             None
         """
-        self.log(level=SignalsLevel.BUSINESS.name, message=message, **kwargs)
+        if self._min_level <= SignalsLevel.BUSINESS:
+            self.log(level=SignalsLevel.BUSINESS.name, message=message, **kwargs)
 
-    def dataset(self, message: str, **kwargs: Any) -> None:
+    def dataset(
+        self, message: str, data: "DataFrame | Iterable[DataFrame] | DatasetProfiler | None" = None, **kwargs: Any
+    ) -> None:
         """Logs a message at the DATASET level.
 
         This method logs a message with the log level set as DATASET. It takes a message string and any additional
         keyword arguments, which are passed for context or specific logging configurations.
         This functionality can be useful to track data-related events or activities within the system.
 
+        Given a dataset, its profile is added as the `profile` field: rows, columns, memory usage and, per column,
+        nulls, min/max and an estimate of the distinct values. Null counts and numeric ranges cover every row; the
+        other statistics are computed on a sample of `dataset_profile_sample_size` rows. Unless disabled with
+        `fingerprint_datasets`, the content fingerprint of the rows is added as the `fingerprint` field. Both are only
+        computed when the level is enabled. A dataset that cannot be fingerprinted is logged without the field, after a
+        WARNING telling why.
+
         Args:
             message: The message string to log.
+            data: A DataFrame, an iterable of DataFrame chunks, consumed while profiling, or a `DatasetProfiler` fed
+                by the caller.
             **kwargs: Additional arguments to include in the log entry.
 
         Returns:
             None
         """
-        self.log(level=SignalsLevel.DATASET.name, message=message, **kwargs)
-
-    def data_source(self, message: str, **kwargs: Any) -> None:
+        if self._min_level <= SignalsLevel.DATASET:
+            if data is not None:
+                from telemetry.profiling import DatasetProfiler, profile_dataset  # pandas is only imported here
+
+                fingerprint = self.__config.fingerprint_datasets and not isinstance(data, DatasetProfiler)
+                digest = self.__fingerprinter().frame_digest() if fingerprint else None
+                kwargs["profile"] = profile_dataset(
+                    data,
+                    sample_size=self.__config.dataset_profile_sample_size,
+                    max_columns=self.__config.dataset_profile_max_columns,
+                    digest=digest,
+                )
+                if digest is not None and digest.error is None:
+                    kwargs["fingerprint"] = digest.hexdigest()
+                elif digest is not None:
+                    self.warning(f"Dataset not fingerprinted: {digest.error!r}.", dataset_message=message)
+            self.log(level=SignalsLevel.DATASET.name, message=message, **kwargs)
+
+    def data_source(
+        self,
+        message: str,
+        paths: "str | os.PathLike[str] | Iterable[str | os.PathLike[str]] | None" = None,
+        **kwargs: Any,
+    ) -> None:
         """Logs a message with the DATA_SOURCE log level.
 
         This method allows logging messages that signify data source level
@@ -313,33 +1041,177 @@ class Signals:
         The `message` parameter is required, and additional context can be provided
         through keyword arguments.
 
+        Given the files read from the data source, their content fingerprints are added as the `fingerprints` field,
+        by path. A file is only hashed again when its size, modification time or inode changed.
+
         Args:
             message (str): The message to log, representing details about the data source event.
+            paths: A file, or files, read from the data source.
             **kwargs (Any): Optional keyword arguments that provide additional context
                 or metadata for the log entry.
 
         Returns:
             None
         """
-        self.log(level=SignalsLevel.DATA_SOURCE.name, message=message, **kwargs)
+        if self._min_level <= SignalsLevel.DATA_SOURCE:
+            if paths is not None:
+                files = [paths] if isinstance(paths, str | os.PathLike) else paths
+                kwargs["fingerprints"] = self.__fingerprinter().files(files)
+            self.log(level=SignalsLevel.DATA_SOURCE.name, message=message, **kwargs)
+
+    def dataops(self, message: str, **kwargs: Any) -> None:
+        """Logs a message at the DATAOPS level.
+
+        This level tracks the operation of the data pipelines, such as volumes and throughput. Measurements repeated
+        many times are better recorded with `count`, `gauge` or `observe`, which emit one DATAOPS signal per group.
+
+        Args:
+            message: The message string to log.
+            **kwargs: Additional arguments to include in the log entry.
+        """
+        if self._min_level <= SignalsLevel.DATAOPS:
+            self.log(level=SignalsLevel.DATAOPS.name, message=message, **kwargs)
+
+    def devops(self, message: str, **kwargs: Any) -> None:
+        """Logs a message at the DEVOPS level.
 
-    def docs(self, message: str, docs: str, **kwargs: Any) -> None:
+        This level tracks the operation of the infrastructure, such as latencies and resource usage, including the
+        health of the telemetry pipeline itself.
+
+        Args:
+            message: The message string to log.
+            **kwargs: Additional arguments to include in the log entry.
+        """
+        if self._min_level <= SignalsLevel.DEVOPS:
+            self.log(level=SignalsLevel.DEVOPS.name, message=message, **kwargs)
+
+    def docs(
+        self,
+        message: str,
+        docs: str | None = None,
+        paths: "str | os.PathLike[str] | Iterable[str | os.PathLike[str]] | None" = None,
+        **kwargs: Any,
+    ) -> None:
         """Logs a message at the DOCS level.
 
         This method allows logging a message with the `DOCS` level, which is a specific log level defined in the system.
         It takes a message string as its main argument and allows for additional keyword arguments for extended
         logging functionality. The logged message uses the `SignalsLevel.DOCS.name` level.
 
+        Each document, given as a string or read from files, is content addressed by its fingerprint, `doc_hash`. Until
+        it is shipped to Loki for the application and environment, its text is emitted as the `docs` field, in
+        several signals numbered by `doc_chunk` out of `doc_chunks` when it exceeds `docs_chunk_size` bytes. Once every
+        signal carrying it was pushed, it is emitted as a reference, `doc_ref`, without its text. Without a Loki sink,
+        documents are always emitted in full.
+
         Args:
           message: The message to be logged.
           docs: The docs description.
+          paths: Files or glob patterns, such as `docs/**/*.md`, of documents emitted one after the other with their
+            `doc_path`.
           **kwargs: Additional keyword arguments for extended logging options or functionality.
 
         Returns:
           None
 
+        Raises:
+          FileNotFoundError: If a path that is not a glob pattern does not exist.
+        """
+        if self._min_level <= SignalsLevel.DOCS:
+            if docs is not None:
+                content = docs.encode("utf-8", "surrogatepass")
+                fingerprint = self.__fingerprinter().content(content)
+                self.__emit_doc(message, fingerprint, len(content), lambda: io.BytesIO(content), kwargs)
+            if paths is not None:
+                from telemetry.docs import expand_paths  # only imported by the first document
+
+                files = expand_paths(paths)
+                fingerprints = self.__fingerprinter().files(files)
+                for file in files:
+                    fields = {**kwargs, "doc_path": str(file)}
+                    self.__emit_doc(
+                        message,
+                        fingerprints[str(file)],
+                        file.stat().st_size,
+                        functools.partial(file.open, "rb"),
+                        fields,
+                    )
+
+    def __emit_doc(
+        self, message: str, fingerprint: str, size: int, open_doc: "Callable[[], BinaryIO]", fields: dict[str, Any]
+    ) -> None:
+        """Emits a document in full the first time it is shipped, and as a reference to its fingerprint afterwards."""
+        fields = {**fields, "doc_bytes": size}
+        from telemetry.docs import text_chunks  # only imported by the first document
+
+        shipped_docs = self.__shipped_docs()
+        if fingerprint in shipped_docs:
+            self.log(level=SignalsLevel.DOCS.name, message=message, doc_ref=fingerprint, **fields)
+            return
+        chunk_size = self.__config.docs_chunk_size
+        chunks = max(1, -(-size // chunk_size))
+        with open_doc() as stream:
+            for index, text in enumerate(text_chunks(stream, chunk_size), start=1):
+                chunk: dict[str, Any] = {"doc_chunk": index, "doc_chunks": chunks} if chunks > 1 else {}
+                self.log(
+                    level=SignalsLevel.DOCS.name, message=message, docs=text, doc_hash=fingerprint, **fields, **chunk
+                )
+
+
+class BoundSignals(Signals):
+    """View of a Signals instance adding the same fields to every signal, returned by `Signals.bind`."""
+
+    @classmethod
+    def registry_key(cls, *args: Any, **kwargs: Any) -> "Hashable | None":  # noqa: ARG003
+        """Views are never registered."""
+        return None
+
+    def __init__(self, signals: Signals, fields: dict[str, Any]) -> None:
+        """Initializes the view as a copy of `signals` sharing its sinks, queues and group context.
+
+        Args:
+            signals: Instance, or view, being bound.
+            fields: Fields added to every signal of the view.
         """
-        self.log(level=SignalsLevel.DOCS.name, message=message, docs=docs, **kwargs)
+        vars(self).update(vars(signals))
+        self._bind(fields)
+
+
+_worker_signals: Signals | None = None
+
+
+def worker_signals(handle: "CollectorHandle | None" = None) -> Signals:
+    """Returns the forwarding Signals instance of the current worker process.
+
+    It can be used as a `ProcessPoolExecutor` or `multiprocessing.Pool` initializer, receiving the handle from
+    `SignalsCollector.handle`, and then called without arguments by the tasks running in the worker.
+
+    Args:
+        handle: Collector handle received from the parent process. Required on the first call in each process.
+
+    Returns:
+        The Signals instance forwarding to the collector of the parent process.
+    """
+    global _worker_signals  # noqa: PLW0603
+    if handle is not None and (_worker_signals is None or _worker_signals.job_uuid != handle.job_uuid):
+        _worker_signals = Signals(handle.config, forward_to=handle)
+    if _worker_signals is None:
+        msg = "worker_signals must first be called with the handle of a SignalsCollector."
+        raise RuntimeError(msg)
+    return _worker_signals
+
+
+def _module_filter(module: str) -> "Callable[[Record], bool] | None":
+    """Returns the filter of a module name, as loguru reads it: the records of the module and of its submodules."""
+    if not module:
+        return None
+    prefix = f"{module}."
+
+    def accepts(record: "Record") -> bool:
+        name = record["name"] or ""
+        return name == module or name.startswith(prefix)
+
+    return accepts
 
 
 if __name__ == "__main__":
@@ -0,0 +1,129 @@
+"""Timed process, task and step spans."""
+
+import os
+import time
+from collections.abc import Callable
+from types import TracebackType
+from typing import Self
+
+from telemetry.context import GroupFrame
+
+_PAGE_SIZE: int = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def current_rss_bytes() -> int | None:
+    """Returns the resident set size of the current process in bytes, or None where it cannot be read cheaply."""
+    try:
+        with open("/proc/self/statm", "rb") as statm:  # noqa: PTH123
+            return int(statm.read().split()[1]) * _PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+class Span:
+    """A started process, task or step.
+
+    The span starts when the group is started and records a `perf_counter_ns` reading. It ends either explicitly with
+    `end()` or when leaving a `with` block, which emits the end signal with the elapsed time and restores the group
+    that was current when the span started. A span that is never ended behaves like a plain group start.
+    """
+
+    __slots__ = (
+        "_cpu_start_ns",
+        "_end_ns",
+        "_on_end",
+        "_on_enter",
+        "_rss_start",
+        "_start_ns",
+        "frame",
+        "previous",
+        "title",
+    )
+
+    def __init__(
+        self,
+        frame: GroupFrame,
+        title: str,
+        on_end: Callable[["Span", BaseException | None], None],
+        *,
+        previous: GroupFrame | None = None,
+        on_enter: Callable[["Span"], None] | None = None,
+        track_cpu_time: bool = False,
+        track_memory: bool = False,
+    ) -> None:
+        """Starts the span.
+
+        Args:
+            frame: The group frame pushed when the span started.
+            title: Title of the group.
+            on_end: Called once, when the span ends, with the span and the exception that ended it, if any.
+            previous: The group frame that was current when the span started, restored when it ends.
+            on_enter: Called when a `with` block enters the span.
+            track_cpu_time: Records the CPU time consumed by the current thread during the span.
+            track_memory: Records the resident memory variation of the process during the span.
+        """
+        self.frame = frame
+        self.title = title
+        self.previous = previous
+        self._on_end = on_end
+        self._on_enter = on_enter
+        self._cpu_start_ns: int | None = time.thread_time_ns() if track_cpu_time else None
+        self._rss_start: int | None = current_rss_bytes() if track_memory else None
+        self._end_ns: int | None = None
+        self._start_ns: int = time.perf_counter_ns()
+
+    def __enter__(self) -> Self:
+        """Returns the span, already started."""
+        if self._on_enter is not None:
+            self._on_enter(self)
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Ends the span, flagging it as failed when an exception is being raised."""
+        self.end(exc_value)
+
+    @property
+    def uuid(self) -> str | None:
+        """Returns the UUID of the group."""
+        return self.frame.uuid
+
+    @property
+    def parent_uuid(self) -> str | None:
+        """Returns the UUID of the group that was current when the span started."""
+        return self.frame.parent.uuid if self.frame.parent else None
+
+    @property
+    def ended(self) -> bool:
+        """Returns whether the span has ended."""
+        return self._end_ns is not None
+
+    @property
+    def elapsed_ns(self) -> int:
+        """Returns the span duration in nanoseconds, up to now if it has not ended yet."""
+        return (self._end_ns or time.perf_counter_ns()) - self._start_ns
+
+    def metrics(self) -> dict[str, float | int]:
+        """Returns the measurements of the span: elapsed time and, when tracked, CPU time and RSS variation."""
+        elapsed_ns = self.elapsed_ns
+        measurements: dict[str, float | int] = {"elapsed_ns": elapsed_ns, "elapsed_ms": elapsed_ns / 1e6}
+        if self._cpu_start_ns is not None:
+            measurements["cpu_time_ms"] = (time.thread_time_ns() - self._cpu_start_ns) / 1e6
+        if self._rss_start is not None and (rss := current_rss_bytes()) is not None:
+            measurements["rss_delta_bytes"] = rss - self._rss_start
+        return measurements
+
+    def end(self, error: BaseException | None = None) -> None:
+        """Ends the span. Calling it again has no effect.
+
+        Args:
+            error: The exception that ended the span, if any.
+        """
+        if self._end_ns is not None:
+            return
+        self._end_ns = time.perf_counter_ns()
+        self._on_end(self, error)
@@ -0,0 +1,461 @@
+"""Durable local spool of the payloads shipped to Loki."""
+
+import mmap
+import os
+import struct
+import threading
+import time
+import zlib
+from collections.abc import Callable, Iterator
+from pathlib import Path
+from typing import BinaryIO, NamedTuple
+
+from telemetry.enums import FsyncPolicy
+
+# each entry is its payload length and crc32 followed by the payload; a zero length marks the unused tail of an mmap
+_ENTRY_HEADER = struct.Struct("<II")
+_CURSOR = struct.Struct("<QQ")
+_SEGMENT_SUFFIX = ".spool"
+_CURSOR_FILE_NAME = "cursor"
+
+
+def _segment_file_name(segment: int) -> str:
+    """Returns the file name of a segment."""
+    return f"{segment:016d}{_SEGMENT_SUFFIX}"
+
+
+class SpoolPosition(NamedTuple):
+    """Location of a spooled entry, used to acknowledge it."""
+
+    segment: int
+    offset: int
+    end: int
+
+
+class Spool:
+    """Write-ahead spool made of segmented, append-only files.
+
+    Payloads are appended to the active segment, which is sealed once it reaches `segment_size` bytes. Entries are read
+    back in order and acknowledged once delivered: a segment is deleted when all its entries are acknowledged. The read
+    cursor is persisted, so a process restarting on the same directory resumes with the entries left undelivered.
+    Delivery is at least once: entries acknowledged right before a crash may be read again.
+
+    A directory must only be used by one spool at a time.
+    """
+
+    def __init__(
+        self,
+        directory: str | os.PathLike[str],
+        *,
+        segment_size: int = 16 * 1024 * 1024,
+        fsync_policy: FsyncPolicy = FsyncPolicy.SEGMENT,
+        use_mmap: bool = False,
+        max_bytes: int | None = None,
+    ) -> None:
+        """Opens the spool, recovering the entries left by a previous process.
+
+        Args:
+            directory: Directory holding the segments. It is created if missing.
+            segment_size: Size, in bytes, at which the active segment is sealed and a new one is started.
+            fsync_policy: When spooled entries are forced to disk.
+            use_mmap: Writes the active segment through a memory map preallocated to `segment_size` bytes.
+            max_bytes: Maximum size of the spool. When exceeded, the oldest segments are dropped. None means no limit.
+        """
+        self._directory = Path(directory)
+        self._directory.mkdir(parents=True, exist_ok=True)
+        self._segment_size = max(1, segment_size)
+        self._fsync_policy = fsync_policy
+        self._use_mmap = use_mmap
+        self._max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+        # valid bytes and number of entries of each segment, the active one included
+        self._sizes: dict[int, int] = {}
+        self._counts: dict[int, int] = {}
+        self._cursor: tuple[int, int] = (0, 0)
+        self._acked_in_cursor_segment: int = 0
+        self._pending: int = 0
+        self._dropped: int = 0
+
+        self._file: BinaryIO | None = None
+        self._map: mmap.mmap | None = None
+        self._reader: tuple[int, BinaryIO] | None = None
+
+        self._recover()
+
+    @property
+    def directory(self) -> Path:
+        """Returns the spool directory."""
+        return self._directory
+
+    @property
+    def pending(self) -> int:
+        """Returns the number of entries not acknowledged yet."""
+        return self._pending
+
+    @property
+    def pending_bytes(self) -> int:
+        """Returns the size, in bytes, of the segments still holding unacknowledged entries."""
+        with self._lock:
+            segment, offset = self._cursor
+            return sum(size for index, size in self._sizes.items() if index >= segment) - offset
+
+    @property
+    def dropped(self) -> int:
+        """Returns the number of entries discarded because the spool exceeded its maximum size."""
+        return self._dropped
+
+    def __len__(self) -> int:
+        """Returns the number of entries not acknowledged yet."""
+        return self._pending
+
+    def append(self, payload: bytes) -> None:
+        """Appends a payload to the active segment."""
+        entry = _ENTRY_HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+        with self._lock:
+            if self._active_size and self._active_size + len(entry) > self._segment_size:
+                self._roll()
+            self._write(entry)
+            self._counts[self._active] += 1
+            self._pending += 1
+
+    def peek(self) -> tuple[SpoolPosition, bytes] | None:
+        """Returns the oldest unacknowledged entry and its position, or None when every entry was acknowledged."""
+        with self._lock:
+            while True:
+                segment, offset = self._cursor
+                if offset >= self._sizes[segment]:
+                    return None
+                length, checksum = _ENTRY_HEADER.unpack(self._read(segment, offset, _ENTRY_HEADER.size))
+                payload = self._read(segment, offset + _ENTRY_HEADER.size, length)
+                if zlib.crc32(payload) == checksum:
+                    return SpoolPosition(segment, offset, offset + _ENTRY_HEADER.size + length), payload
+                # entries following a corrupted one cannot be located: the rest of the segment is dropped
+                self._drop_cursor_segment()
+
+    def ack(self, position: SpoolPosition) -> None:
+        """Acknowledges the entry returned by `peek`, deleting its segment once fully acknowledged."""
+        with self._lock:
+            if self._cursor != position[:2]:
+                # the entry was dropped in the meantime
+                return
+            self._cursor = (position.segment, position.end)
+            self._acked_in_cursor_segment += 1
+            self._pending -= 1
+            self._advance()
+            self._write_cursor()
+
+    def close(self) -> None:
+        """Seals the active segment and persists the read cursor."""
+        with self._lock:
+            self._seal()
+            if self._reader is not None:
+                self._reader[1].close()
+                self._reader = None
+            self._write_cursor()
+
+    def _segment_path(self, segment: int) -> Path:
+        """Returns the path of a segment file."""
+        return self._directory / _segment_file_name(segment)
+
+    def _recover(self) -> None:
+        """Indexes the segments left by a previous process and starts a new active segment."""
+        cursor_path = self._directory / _CURSOR_FILE_NAME
+        cursor = _CURSOR.unpack(cursor_path.read_bytes()) if cursor_path.exists() else (0, 0)
+        segments = sorted(int(path.stem) for path in self._directory.glob(f"*{_SEGMENT_SUFFIX}") if path.stem.isdigit())
+
+        for segment in segments:
+            if segment < cursor[0]:
+                self._segment_path(segment).unlink()
+                continue
+            ends = self._scan(segment)
+            self._sizes[segment] = ends[-1] if ends else 0
+            self._counts[segment] = len(ends)
+            self._pending += len(ends)
+            if segment == cursor[0]:
+                acked = sum(end <= cursor[1] for end in ends)
+                self._cursor = (segment, ends[acked - 1] if acked else 0)
+                self._acked_in_cursor_segment = acked
+                self._pending -= acked
+
+        self._active = max(self._sizes, default=cursor[0]) + 1
+        if not self._sizes or self._cursor[0] not in self._sizes:
+            self._cursor = (min(self._sizes, default=self._active), 0)
+            self._acked_in_cursor_segment = 0
+        self._open_active(self._segment_size)
+        self._advance()
+        self._write_cursor()
+
+    def _scan(self, segment: int) -> list[int]:
+        """Returns the end offset of every valid entry of a segment, truncating any torn or unused tail."""
+        path = self._segment_path(segment)
+        data = path.read_bytes()
+        ends: list[int] = []
+        offset = 0
+        while offset + _ENTRY_HEADER.size <= len(data):
+            length, checksum = _ENTRY_HEADER.unpack_from(data, offset)
+            end = offset + _ENTRY_HEADER.size + length
+            if not length or end > len(data) or zlib.crc32(data[offset + _ENTRY_HEADER.size : end]) != checksum:
+                break
+            ends.append(end)
+            offset = end
+        if offset != len(data):
+            os.truncate(path, offset)
+        return ends
+
+    @property
+    def _active_size(self) -> int:
+        """Returns the number of bytes written to the active segment."""
+        return self._sizes[self._active]
+
+    def _open_active(self, capacity: int) -> None:
+        """Opens the active segment for writing."""
+        path = self._segment_path(self._active)
+        self._sizes.setdefault(self._active, 0)
+        self._counts.setdefault(self._active, 0)
+        if self._use_mmap:
+            with path.open("a+b") as file:
+                file.truncate(capacity)
+                self._map = mmap.mmap(file.fileno(), capacity)
+        else:
+            self._file = path.open("ab", buffering=0)
+
+    def _write(self, entry: bytes) -> None:
+        """Writes an entry at the end of the active segment."""
+        start = self._active_size
+        end = start + len(entry)
+        if self._map is not None:
+            if end > len(self._map):
+                # a single entry larger than a segment gets a segment of its own size
+                self._map.close()
+                self._open_active(end)
+            self._map[start:end] = entry
+            if self._fsync_policy is FsyncPolicy.BATCH:
+                self._map.flush()
+        elif self._file is not None:
+            self._file.write(entry)
+            if self._fsync_policy is FsyncPolicy.BATCH:
+                os.fsync(self._file.fileno())
+        self._sizes[self._active] = end
+
+    def _seal(self) -> None:
+        """Closes the active segment, trimming the unused tail of its memory map."""
+        if self._map is not None:
+            if self._fsync_policy is not FsyncPolicy.NEVER:
+                self._map.flush()
+            self._map.close()
+            self._map = None
+            os.truncate(self._segment_path(self._active), self._active_size)
+        elif self._file is not None:
+            if self._fsync_policy is not FsyncPolicy.NEVER:
+                os.fsync(self._file.fileno())
+            self._file.close()
+            self._file = None
+
+    def _roll(self) -> None:
+        """Seals the active segment, starts a new one and enforces the maximum spool size."""
+        self._seal()
+        self._active += 1
+        self._open_active(self._segment_size)
+
+        while self._max_bytes is not None and len(self._sizes) > 1 and sum(self._sizes.values()) > self._max_bytes:
+            self._drop_cursor_segment()
+        self._write_cursor()
+
+    def _read(self, segment: int, offset: int, size: int) -> bytes:
+        """Reads bytes from a segment."""
+        if segment == self._active and self._map is not None:
+            return self._map[offset : offset + size]
+        if self._reader is None or self._reader[0] != segment:
+            if self._reader is not None:
+                self._reader[1].close()
+            self._reader = (segment, self._segment_path(segment).open("rb"))
+        reader = self._reader[1]
+        reader.seek(offset)
+        return reader.read(size)
+
+    def _advance(self) -> None:
+        """Deletes the fully acknowledged sealed segments and moves the cursor to the next segment."""
+        segment, offset = self._cursor
+        while segment != self._active and offset >= self._sizes[segment]:
+            if self._reader is not None and self._reader[0] == segment:
+                self._reader[1].close()
+                self._reader = None
+            self._segment_path(segment).unlink(missing_ok=True)
+            del self._sizes[segment]
+            del self._counts[segment]
+            segment, offset = min(self._sizes), 0
+            self._acked_in_cursor_segment = 0
+        self._cursor = (segment, offset)
+
+    def _drop_cursor_segment(self) -> None:
+        """Discards the unacknowledged entries of the segment under the cursor."""
+        segment = self._cursor[0]
+        lost = self._counts[segment] - self._acked_in_cursor_segment
+        self._dropped += lost
+        self._pending -= lost
+        self._acked_in_cursor_segment = self._counts[segment]
+        self._cursor = (segment, self._sizes[segment])
+        self._advance()
+
+    def _write_cursor(self) -> None:
+        """Persists the read cursor, atomically replacing the previous one."""
+        temporary = self._directory / f"{_CURSOR_FILE_NAME}.tmp"
+        temporary.write_bytes(_CURSOR.pack(*self._cursor))
+        temporary.replace(self._directory / _CURSOR_FILE_NAME)
+
+
+def read_spool(directory: str | os.PathLike[str]) -> Iterator[bytes]:
+    """Reads the unacknowledged payloads of a spool directory, oldest first, without modifying it.
+
+    The spool may be in use by another process: entries appended while reading may or may not be returned, and a
+    torn entry at the end of a segment ends the segment.
+    """
+    directory = Path(directory)
+    cursor_path = directory / _CURSOR_FILE_NAME
+    cursor_segment, cursor_offset = _CURSOR.unpack(cursor_path.read_bytes()) if cursor_path.exists() else (0, 0)
+    segments = sorted(int(path.stem) for path in directory.glob(f"*{_SEGMENT_SUFFIX}") if path.stem.isdigit())
+    for segment in segments:
+        if segment < cursor_segment:
+            continue
+        data = (directory / _segment_file_name(segment)).read_bytes()
+        offset = cursor_offset if segment == cursor_segment else 0
+        while offset + _ENTRY_HEADER.size <= len(data):
+            length, checksum = _ENTRY_HEADER.unpack_from(data, offset)
+            payload = data[offset + _ENTRY_HEADER.size : offset + _ENTRY_HEADER.size + length]
+            if not length or len(payload) != length or zlib.crc32(payload) != checksum:
+                break
+            yield payload
+            offset += _ENTRY_HEADER.size + length
+
+
+class SpoolReplayer:
+    """Background worker delivering the spooled entries in order.
+
+    Each entry is acknowledged once `send` returns. When it raises, the worker retries the same entry with an
+    exponential backoff, and once the endpoint recovers the backlog is replayed at no more than `rate` entries per
+    second, so that a recovering endpoint is not flooded.
+    """
+
+    def __init__(
+        self,
+        spool: Spool,
+        send: Callable[[bytes], None],
+        *,
+        rate: float = 10.0,
+        retry_delay: float = 0.5,
+        max_retry_delay: float = 30.0,
+        name: str = "signals-spool-replayer",
+    ) -> None:
+        """Initializes the replayer and starts its worker.
+
+        Args:
+            spool: Spool holding the entries to deliver.
+            send: Callable delivering an entry. It must raise when the entry was not delivered.
+            rate: Maximum number of entries delivered per second while replaying a backlog.
+            retry_delay: Delay, in seconds, before the first retry of a failed delivery.
+            max_retry_delay: Maximum delay, in seconds, between retries.
+            name: Name of the worker thread.
+        """
+        self._spool = spool
+        self._send = send
+        self._interval = 1 / rate if rate > 0 else 0.0
+        self._retry_delay = retry_delay
+        self._max_retry_delay = max_retry_delay
+
+        self._condition = threading.Condition()
+        self._stopping: bool = False
+        self._recovering: bool = bool(spool.pending)
+        self._delivered: int = 0
+        self._failed: int = 0
+        self._last_error: BaseException | None = None
+
+        self._worker = threading.Thread(target=self._run, name=name, daemon=True)
+        self._worker.start()
+
+    @property
+    def delivered(self) -> int:
+        """Returns the number of entries delivered."""
+        return self._delivered
+
+    @property
+    def failed(self) -> int:
+        """Returns the number of failed delivery attempts."""
+        return self._failed
+
+    @property
+    def last_error(self) -> BaseException | None:
+        """Returns the last delivery error, if any."""
+        return self._last_error
+
+    @property
+    def recovering(self) -> bool:
+        """Returns whether a backlog left by a failure is being replayed."""
+        return self._recovering
+
+    def wake(self) -> None:
+        """Notifies the worker that new entries were spooled."""
+        with self._condition:
+            self._condition.notify_all()
+
+    def wait_idle(self, timeout: float | None = None) -> bool:
+        """Waits until every spooled entry is delivered.
+
+        Returns:
+            True if the spool is empty, False if the timeout expired first or the worker is stopped.
+        """
+        with self._condition:
+            self._condition.wait_for(lambda: not self._spool.pending or not self._worker.is_alive(), timeout)
+            return not self._spool.pending
+
+    def _run(self) -> None:
+        """Worker loop: delivers the oldest entry, retrying it until it is acknowledged."""
+        delay = self._retry_delay
+        next_send = 0.0
+        while True:
+            with self._condition:
+                entry = self._spool.peek()
+                if entry is None:
+                    self._recovering = False
+                    self._condition.notify_all()
+                    if self._stopping:
+                        return
+                    self._condition.wait()
+                    continue
+                if self._recovering:
+                    self._condition.wait_for(lambda: self._stopping, next_send - time.monotonic())
+
+            position, payload = entry
+            try:
+                self._send(payload)
+            except Exception as error:  # noqa: BLE001
+                self._failed += 1
+                self._last_error = error
+                self._recovering = True
+                with self._condition:
+                    if self._stopping or self._condition.wait_for(lambda: self._stopping, delay):
+                        return
+                delay = min(delay * 2, self._max_retry_delay)
+                continue
+
+            self._spool.ack(position)
+            self._delivered += 1
+            delay = self._retry_delay
+            next_send = time.monotonic() + self._interval
+
+    def stop(self, timeout: float | None = 5.0) -> bool:
+        """Delivers what is still spooled, unless delivery fails, and stops the worker.
+
+        Undelivered entries stay in the spool and are replayed by the next process using the same directory.
+
+        Args:
+            timeout: Maximum time, in seconds, to wait for the worker to finish.
+
+        Returns:
+            True if the worker finished, False if it is still delivering an entry when the timeout expires.
+        """
+        with self._condition:
+            self._stopping = True
+            self._condition.notify_all()
+        self._worker.join(timeout)
+        return not self._worker.is_alive()
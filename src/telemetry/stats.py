@@ -0,0 +1,138 @@
+"""Counters and histograms measuring the telemetry pipeline itself, and the metrics of the jobs."""
+
+import math
+import threading
+import weakref
+
+# histogram buckets per power of two, by default: a percentile is off by at most 1 / 4 of its value
+_SUB_BUCKETS = 4
+
+
+class Histogram:
+    """Histogram of finite numbers, such as durations in nanoseconds, batch sizes or the values of a metric.
+
+    Buckets are logarithmic, HDR histogram style: each power of two is split into `sub_buckets` buckets, so a
+    percentile is off by at most `1 / sub_buckets` of its value whatever the magnitude of the values, recording a value
+    costs a `frexp` and a dictionary increment, and memory grows with the range of the values rather than their
+    number. Negative values are bucketed by magnitude. Values are recorded by a single thread, e.g. a shipper worker,
+    or under a lock; any thread can read them.
+    """
+
+    __slots__ = ("_negative", "_positive", "_sub_buckets", "count", "maximum", "minimum", "total", "zeros")
+
+    def __init__(self, sub_buckets: int = _SUB_BUCKETS) -> None:
+        """Initializes an empty histogram.
+
+        Args:
+            sub_buckets: Buckets per power of two, trading memory for precision.
+        """
+        self._sub_buckets = sub_buckets
+        self._positive: dict[int, int] = {}
+        self._negative: dict[int, int] = {}
+        self.zeros = 0
+        self.count = 0
+        self.total: float = 0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+
+    def record(self, value: float) -> None:
+        """Records a finite value."""
+        if value:
+            buckets = self._positive if value > 0 else self._negative
+            mantissa, exponent = math.frexp(abs(value))
+            index = exponent * self._sub_buckets + int((mantissa - 0.5) * 2 * self._sub_buckets)
+            buckets[index] = buckets.get(index, 0) + 1
+        else:
+            self.zeros += 1
+        self.count += 1
+        self.total += value
+        self.minimum = min(self.minimum, value)
+        self.maximum = max(self.maximum, value)
+
+    def _bounds(self, index: int) -> tuple[float, float]:
+        """Returns the lowest and highest magnitudes of a bucket."""
+        exponent, sub = divmod(index, self._sub_buckets)
+        step = 1 / (2 * self._sub_buckets)
+        return math.ldexp(0.5 + sub * step, exponent), math.ldexp(0.5 + (sub + 1) * step, exponent)
+
+    def percentile(self, percent: float) -> float:
+        """Returns an upper bound of the given percentile of the recorded values, or zero when there is none."""
+        negative, positive = dict(self._negative), dict(self._positive)
+        ordered = [(-self._bounds(index)[0], negative[index]) for index in sorted(negative, reverse=True)]
+        ordered.append((0.0, self.zeros))
+        ordered.extend((self._bounds(index)[1], positive[index]) for index in sorted(positive))
+        count = sum(count for _, count in ordered)
+        if not count:
+            return 0
+        rank = max(1.0, count * percent / 100)
+        seen = 0
+        for bound, bucket in ordered:
+            seen += bucket
+            if seen >= rank:
+                return min(max(bound, self.minimum), self.maximum)
+        return self.maximum
+
+    def summary(self, scale: float = 1.0) -> dict[str, float]:
+        """Returns the count, mean, 50th, 90th and 99th percentiles and maximum, multiplied by `scale`.
+
+        Args:
+            scale: Factor applied to the values, e.g. 1e-6 to turn nanoseconds into milliseconds.
+        """
+        count = self.count
+        return {
+            "count": count,
+            "mean": self.total / count * scale if count else 0.0,
+            "p50": self.percentile(50) * scale,
+            "p90": self.percentile(90) * scale,
+            "p99": self.percentile(99) * scale,
+            "max": self.maximum * scale if count else 0.0,
+        }
+
+
+class LevelCounter:
+    """Counts signals per level name without locking.
+
+    Each thread increments its own counts, which are summed when read; the counts of finished threads are folded into
+    a common total, so that short-lived threads do not accumulate.
+    """
+
+    def __init__(self) -> None:
+        """Initializes the counter."""
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._threads: list[dict[str, int]] = []
+        self._finished: dict[str, int] = {}
+
+    def add(self, level: str) -> None:
+        """Counts one signal of the given level for the current thread."""
+        try:
+            counts: dict[str, int] = self._local.counts
+        except AttributeError:
+            counts = self._register()
+        counts[level] = counts.get(level, 0) + 1
+
+    def _register(self) -> dict[str, int]:
+        """Creates the counts of the current thread, folded into the common total once the thread is gone."""
+        counts: dict[str, int] = {}
+        self._local.counts = counts
+        with self._lock:
+            self._threads.append(counts)
+        weakref.finalize(threading.current_thread(), self._fold, counts)
+        return counts
+
+    def _fold(self, counts: dict[str, int]) -> None:
+        """Adds the counts of a finished thread to the common total."""
+        with self._lock:
+            self._threads = [thread for thread in self._threads if thread is not counts]
+            for level, count in counts.items():
+                self._finished[level] = self._finished.get(level, 0) + count
+
+    def totals(self) -> dict[str, int]:
+        """Returns the number of signals counted per level, over every thread."""
+        with self._lock:
+            totals = dict(self._finished)
+            threads = list(self._threads)
+        for counts in threads:
+            for level, count in dict(counts).items():
+                totals[level] = totals.get(level, 0) + count
+        return totals
@@ -0,0 +1,290 @@
+"""Suppression of log storms ahead of the sinks."""
+
+import re
+import threading
+import time
+from collections.abc import Callable, Iterable, Mapping
+from typing import Any, NamedTuple
+
+_NO_FIELDS: Mapping[str, Any] = {}
+# variable parts of formatted messages: quoted values, and words holding a digit such as counts, identifiers and times
+_VARIABLE_PARTS = re.compile(r"'[^']*'|\"[^\"]*\"|(?<![\w.:/-])[\w.:/-]*\d[\w.:/-]*")
+_PLACEHOLDER = "<*>"
+
+
+def message_template(message: str) -> str:
+    """Returns the template of a formatted message: its quoted values and words holding a digit masked.
+
+    Example:
+        >>> message_template("Order 1042 failed after 3.5 s: 'timeout'.")
+        'Order <*> failed after <*> s: <*>.'
+    """
+    return _VARIABLE_PARTS.sub(_PLACEHOLDER, message)
+
+
+class Repeats(NamedTuple):
+    """Identical signals collapsed by the deduplication window, emitted as one signal when the window closes.
+
+    Attributes:
+        level: Level name of the signals.
+        message: Message of the signals.
+        fields: Fields of the signals.
+        context: Context given with the first signal, e.g. the group it was emitted in.
+        scope: Scope the signals were emitted in, e.g. the emitter they came from.
+        repeat_count: Number of repeats collapsed, not counting the first signal, which was emitted.
+        first_seen_ns: Time of the first repeat, in nanoseconds since the epoch.
+        last_seen_ns: Time of the last repeat, in nanoseconds since the epoch.
+    """
+
+    level: str
+    message: str
+    fields: Mapping[str, Any]
+    context: Any
+    scope: Any
+    repeat_count: int
+    first_seen_ns: int
+    last_seen_ns: int
+
+
+class _Window:
+    """Deduplication window of one signal."""
+
+    __slots__ = ("context", "count", "ends_at", "fields", "first_seen", "last_seen", "level", "message", "scope")
+
+    def __init__(
+        self, level: str, message: str, fields: Mapping[str, Any], context: Any, scope: Any, now: float
+    ) -> None:
+        self.level = level
+        self.message = message
+        self.fields = fields
+        self.context = context
+        self.scope = scope
+        self.ends_at = now
+        self.count = 0
+        self.first_seen = 0.0
+        self.last_seen = 0.0
+
+    def repeats(self, wall_offset: float) -> Repeats:
+        """Returns the repeats collapsed by the window."""
+        return Repeats(
+            level=self.level,
+            message=self.message,
+            fields=self.fields,
+            context=self.context,
+            scope=self.scope,
+            repeat_count=self.count,
+            first_seen_ns=int((self.first_seen + wall_offset) * 1e9),
+            last_seen_ns=int((self.last_seen + wall_offset) * 1e9),
+        )
+
+
+class _Bucket:
+    """Token bucket of one level and message template."""
+
+    __slots__ = ("limited", "tokens", "updated_at")
+
+    def __init__(self, tokens: float, now: float) -> None:
+        self.tokens = tokens
+        self.updated_at = now
+        self.limited = 0
+
+
+class SignalSuppressor:
+    """Rate limits and deduplicates signals before any of their fields are computed.
+
+    Two stages are applied, each optional:
+
+    - a deduplication window: a signal identical to one emitted less than `window` seconds ago, same level, message,
+      fields, context and scope, is only counted. When the window closes, the count is handed to `on_repeats` with
+      the first and last times a repeat was seen;
+    - token buckets per level and message template, see `message_template`, so that messages differing by their
+      arguments, e.g. `f"Order {order_id} failed."`, share a bucket: each one holds up to `burst` signals and refills at
+      the rate of the level. Signals finding the bucket empty are dropped, and the next signal let through reports how
+      many were.
+
+    Both cost one dictionary lookup per signal, and rate limiting one more for the message template, computed once per
+    distinct message. Windows closing without a new repeat are found by a sweep running at most once per window (or
+    per second), or by `flush`.
+    """
+
+    def __init__(
+        self,
+        on_repeats: Callable[[Repeats], None],
+        *,
+        rate: float | None = None,
+        level_rates: Mapping[str, float] | None = None,
+        burst: int = 10,
+        window: float = 0.0,
+        exempt_levels: Iterable[str] = (),
+        max_keys: int = 10_000,
+    ) -> None:
+        """Initializes the suppressor.
+
+        Args:
+            on_repeats: Receives the repeats collapsed by each deduplication window. It is called on the emitting
+                thread, outside the suppressor lock.
+            rate: Signals per second let through for each level and message template. None disables rate limiting.
+            level_rates: Rates overriding `rate` for some levels, by level name.
+            burst: Number of signals of the same level and message template let through at once before the rate
+                applies.
+            window: Deduplication window, in seconds. Zero disables deduplication.
+            exempt_levels: Levels never suppressed.
+            max_keys: Maximum number of tracked windows and buckets. Signals beyond it are let through untracked.
+        """
+        self._on_repeats = on_repeats
+        self._rate = rate
+        self._level_rates = dict(level_rates or {})
+        self._burst = float(max(1, burst))
+        self._window = window
+        self._exempt_levels = frozenset(exempt_levels)
+        self._max_keys = max_keys
+
+        self._lock = threading.Lock()
+        self._windows: dict[tuple[Any, ...], _Window] = {}
+        self._buckets: dict[tuple[str, str], _Bucket] = {}
+        # templates of the messages seen, since a storm usually repeats the same message
+        self._templates: dict[str, str] = {}
+        self._sweep_interval = window or 1.0
+        self._next_sweep = time.monotonic() + self._sweep_interval
+        # converts monotonic times into wall clock times
+        self._wall_offset = time.time() - time.monotonic()
+
+        self._repeated: int = 0
+        self._rate_limited: int = 0
+
+    @property
+    def repeated(self) -> int:
+        """Returns the number of signals collapsed by the deduplication window."""
+        return self._repeated
+
+    @property
+    def rate_limited(self) -> int:
+        """Returns the number of signals dropped by the token buckets."""
+        return self._rate_limited
+
+    def admit(
+        self, level: str, message: str, fields: Mapping[str, Any], context: Any = None, scope: Any = None
+    ) -> Mapping[str, Any] | None:
+        """Decides whether a signal is emitted.
+
+        Args:
+            level: Level name of the signal.
+            message: Message of the signal.
+            fields: Fields of the signal.
+            context: Hashable context of the signal, e.g. the group it was emitted in: identical signals of different
+                contexts are not repeats of each other. It is kept with the first signal of a deduplication window and
+                handed back with its repeats.
+            scope: Hashable scope of the signal: identical signals of different scopes are not repeats of each other.
+
+        Returns:
+            None when the signal is suppressed. Otherwise, the fields to add to it: `rate_limited_count` when signals
+            of the same level and message template were dropped since the last one let through, or an empty mapping.
+        """
+        if level in self._exempt_levels:
+            return _NO_FIELDS
+
+        template = message
+        if self._rate is not None or self._level_rates:
+            template = self._templates.get(message) or self._template(message)
+        now = time.monotonic()
+        closed: list[Repeats] = []
+        with self._lock:
+            if now >= self._next_sweep:
+                closed.extend(self._sweep(now))
+
+            key: tuple[Any, ...] | None = None
+            if self._window:
+                try:
+                    key = (scope, context, level, message, *fields.items())
+                    repeated = self._repeat(key, now, closed)
+                except TypeError:
+                    # unhashable field values or context: the signal is only rate limited
+                    key, repeated = None, False
+                if repeated:
+                    admitted = None
+                else:
+                    admitted = self._take_token(level, template, now)
+                    if admitted is not None and key is not None and len(self._windows) < self._max_keys:
+                        self._windows[key] = _Window(level, message, fields, context, scope, now + self._window)
+            else:
+                admitted = self._take_token(level, template, now)
+
+        for repeats in closed:
+            self._on_repeats(repeats)
+        return admitted
+
+    def _template(self, message: str) -> str:
+        """Returns the template of a message, remembered until `max_keys` messages are, then until the next sweep."""
+        template = message_template(message)
+        if len(self._templates) < self._max_keys:
+            self._templates[message] = template
+        return template
+
+    def _repeat(self, key: tuple[Any, ...], now: float, closed: list[Repeats]) -> bool:
+        """Counts a signal as a repeat if its window is open; closes its window if it has ended."""
+        window = self._windows.get(key)
+        if window is None:
+            return False
+        if now < window.ends_at:
+            if not window.count:
+                window.first_seen = now
+            window.count += 1
+            window.last_seen = now
+            self._repeated += 1
+            return True
+        del self._windows[key]
+        if window.count:
+            closed.append(window.repeats(self._wall_offset))
+        return False
+
+    def _take_token(self, level: str, template: str, now: float) -> Mapping[str, Any] | None:
+        """Takes a token from the bucket of a level and message template, if it is rate limited."""
+        rate = self._level_rates.get(level, self._rate)
+        if rate is None:
+            return _NO_FIELDS
+
+        bucket = self._buckets.get((level, template))
+        if bucket is None:
+            if len(self._buckets) >= self._max_keys:
+                return _NO_FIELDS
+            bucket = self._buckets[level, template] = _Bucket(self._burst, now)
+        else:
+            bucket.tokens = min(self._burst, bucket.tokens + (now - bucket.updated_at) * rate)
+            bucket.updated_at = now
+
+        if bucket.tokens < 1:
+            bucket.limited += 1
+            self._rate_limited += 1
+            return None
+        bucket.tokens -= 1
+        if bucket.limited:
+            limited, bucket.limited = bucket.limited, 0
+            return {"rate_limited_count": limited}
+        return _NO_FIELDS
+
+    def _sweep(self, now: float) -> list[Repeats]:
+        """Forgets the closed windows and the full buckets, returning the repeats of the closed windows."""
+        self._next_sweep = now + self._sweep_interval
+        closed = [key for key, window in self._windows.items() if now >= window.ends_at]
+        repeats = [window.repeats(self._wall_offset) for key in closed if (window := self._windows.pop(key)).count]
+        full = [
+            key
+            for key, bucket in self._buckets.items()
+            if not bucket.limited
+            and bucket.tokens + (now - bucket.updated_at) * self._level_rates.get(key[0], self._rate or 0.0)
+            >= self._burst
+        ]
+        for key in full:
+            del self._buckets[key]
+        if len(self._templates) >= self._max_keys:
+            self._templates.clear()
+        return repeats
+
+    def flush(self) -> None:
+        """Closes every deduplication window, handing the repeats collected so far to `on_repeats`."""
+        with self._lock:
+            windows = list(self._windows.values())
+            self._windows.clear()
+        for window in windows:
+            if window.count:
+                self._on_repeats(window.repeats(self._wall_offset))
@@ -1,7 +1,69 @@
-"""OpsDataFlow tools."""
+"""OpsDataFlow tools.
 
-from tools import string_ops
-from tools.decorators import singleton
-from tools.uuid import generate_uuid4, generate_uuid5
+Public names are imported on first access (PEP 562), so that importing the package only loads the modules in use.
+"""
 
-__all__ = ["generate_uuid4", "generate_uuid5", "singleton", "string_ops"]
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from tools import string_ops
+    from tools.decorators import singleton
+    from tools.registry import KeyedSingleton
+    from tools.timestamp import LazyTimestamp, format_timestamp_ns
+    from tools.uuid import (
+        BufferedIdGenerator,
+        IdFormat,
+        SortableIdGenerator,
+        generate_uuid4,
+        generate_uuid5,
+        sortable_id,
+        sortable_ids,
+    )
+
+_LAZY_IMPORTS: dict[str, str] = {
+    "BufferedIdGenerator": "tools.uuid",
+    "IdFormat": "tools.uuid",
+    "KeyedSingleton": "tools.registry",
+    "LazyTimestamp": "tools.timestamp",
+    "SortableIdGenerator": "tools.uuid",
+    "format_timestamp_ns": "tools.timestamp",
+    "generate_uuid4": "tools.uuid",
+    "generate_uuid5": "tools.uuid",
+    "singleton": "tools.decorators",
+    "sortable_id": "tools.uuid",
+    "sortable_ids": "tools.uuid",
+}
+
+__all__ = [
+    "BufferedIdGenerator",
+    "IdFormat",
+    "KeyedSingleton",
+    "LazyTimestamp",
+    "SortableIdGenerator",
+    "format_timestamp_ns",
+    "generate_uuid4",
+    "generate_uuid5",
+    "singleton",
+    "sortable_id",
+    "sortable_ids",
+    "string_ops",
+]
+
+
+def __getattr__(name: str) -> Any:
+    """Imports a public name from its module on first access and caches it in the package."""
+    if name == "string_ops":
+        return importlib.import_module("tools.string_ops")
+    module = _LAZY_IMPORTS.get(name)
+    if module is None:
+        msg = f"module {__name__!r} has no attribute {name!r}"
+        raise AttributeError(msg)
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    """Lists the public names, imported or not."""
+    return sorted({*globals(), *__all__})
@@ -8,7 +8,7 @@ from typing import ParamSpec, TypeVar
 T = TypeVar("T")  # Type variable to maintain type hints
 P = ParamSpec("P")
 
-_lock = threading.RLock()  # lock to ensure thread safety
+_lock = threading.RLock()  # lock to ensure thread safety of the first construction
 
 
 def singleton(cls: type[T]) -> Callable[..., T]:
@@ -24,6 +24,9 @@ def singleton(cls: type[T]) -> Callable[..., T]:
 
     @wraps(cls)
     def get_instance(*args: P.args, **kwargs: P.kwargs) -> T:
+        # lock-free fast path once the instance exists
+        if cls in instances:
+            return instances[cls]  # pyright: ignore[reportUnknownVariableType]
         with _lock:  # acquire lock to ensure thread safety
             if cls not in instances:
                 instances[cls] = cls(*args, **kwargs)
@@ -0,0 +1,42 @@
+"""Registry of instances keyed by their construction arguments."""
+
+import threading
+from collections.abc import Hashable
+from typing import Any, cast
+
+_instances: dict[Hashable, Any] = {}
+_lock = threading.RLock()  # serializes the first construction of each key
+
+
+class KeyedSingleton(type):
+    """Metaclass keeping a single instance of its classes per registry key.
+
+    A class using it implements `registry_key`, a class method receiving the constructor arguments and returning the
+    key of the instance they build, or None to build a new, unregistered, instance. Once the instance of a key exists,
+    it is returned after a dictionary lookup, without locking: only the first construction of each key takes the lock.
+    """
+
+    def __call__[T](cls: type[T], *args: Any, **kwargs: Any) -> T:
+        """Returns the registered instance built with equivalent arguments, building and registering it if needed."""
+        key = cast("KeyedSingleton", cls).registry_key(*args, **kwargs)
+        if key is None:
+            return type.__call__(cls, *args, **kwargs)
+
+        # lock-free fast path: instances are only registered once fully built
+        instance = _instances.get((cls, key))
+        if instance is None:
+            with _lock:
+                instance = _instances.get((cls, key))
+                if instance is None:
+                    instance = _instances[cls, key] = type.__call__(cls, *args, **kwargs)
+        return instance
+
+    def registry_key(cls, *args: Any, **kwargs: Any) -> Hashable | None:  # noqa: ARG002
+        """Returns the registry key of the instance built with the given arguments; None does not register it."""
+        return None
+
+    def clear_instances(cls) -> None:
+        """Forgets the registered instances of the class, so that the next constructions build new ones."""
+        with _lock:
+            for key in [key for key in _instances if key[0] is cls]:  # pyright: ignore[reportIndexIssue]
+                del _instances[key]
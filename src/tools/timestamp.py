@@ -0,0 +1,89 @@
+"""Timestamp formatting tools."""
+
+import time
+
+
+class TimestampFormatter:
+    """Formats UTC timestamps given in integer nanoseconds as `YYYY-MM-DD HH:MM:SS.mmm`.
+
+    The `YYYY-MM-DD HH:MM:SS.` prefix is computed once per second and reused by every timestamp of the same second,
+    so formatting a timestamp usually costs a division and the millisecond suffix.
+    """
+
+    def __init__(self) -> None:
+        """Initializes the formatter with an empty prefix cache."""
+        self._second_prefix: tuple[int, str] = (-1, "")
+
+    def format(self, timestamp_ns: int) -> str:
+        """Formats a UTC timestamp given in nanoseconds since the epoch."""
+        second, nanoseconds = divmod(timestamp_ns, 1_000_000_000)
+        cached_second, prefix = self._second_prefix
+        if second != cached_second:
+            prefix = time.strftime("%Y-%m-%d %H:%M:%S.", time.gmtime(second))
+            self._second_prefix = (second, prefix)
+        return f"{prefix}{nanoseconds // 1_000_000:03d}"
+
+
+_timestamp_formatter = TimestampFormatter()
+
+
+def format_timestamp_ns(timestamp_ns: int) -> str:
+    """Formats a UTC timestamp given in nanoseconds using the process-wide `TimestampFormatter`."""
+    return _timestamp_formatter.format(timestamp_ns)
+
+
+class LazyTimestamp:
+    """UTC timestamp in integer nanoseconds whose text form is only computed when needed.
+
+    Consumers that accept numeric time read `ns` and never pay for formatting. `str()`, `repr()` and `format()` render
+    the `YYYY-MM-DD HH:MM:SS.mmm` text once and cache it, so the timestamp prints like the formatted string.
+    """
+
+    __slots__ = ("_text", "ns")
+
+    def __init__(self, ns: int) -> None:
+        """Initializes the timestamp.
+
+        Args:
+            ns: Nanoseconds since the epoch, as returned by `time.time_ns()`.
+        """
+        self.ns = ns
+        self._text: str | None = None
+
+    @classmethod
+    def now(cls) -> "LazyTimestamp":
+        """Returns the current time, read once from the system clock."""
+        return cls(time.time_ns())
+
+    def __str__(self) -> str:
+        """Returns the formatted timestamp."""
+        if self._text is None:
+            self._text = _timestamp_formatter.format(self.ns)
+        return self._text
+
+    def __repr__(self) -> str:
+        """Returns the representation of the formatted timestamp, as if it were a plain string."""
+        return repr(str(self))
+
+    def __format__(self, format_spec: str) -> str:
+        """Formats the text form of the timestamp."""
+        return format(str(self), format_spec)
+
+    def __eq__(self, other: object) -> bool:
+        """Compares timestamps by their nanoseconds."""
+        if isinstance(other, LazyTimestamp):
+            return self.ns == other.ns
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        """Hashes the nanoseconds."""
+        return hash(self.ns)
+
+    def __getstate__(self) -> int:
+        """Pickles only the nanoseconds."""
+        return self.ns
+
+    def __setstate__(self, state: int) -> None:
+        """Restores a pickled timestamp."""
+        self.ns = state
+        self._text = None
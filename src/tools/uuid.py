@@ -1,14 +1,253 @@
 """UUID Generator and management."""
 
+import os
+import threading
 import time
 import uuid
+import weakref
+from enum import IntEnum
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+# sortable ids layout, from the most significant bit: milliseconds since SORTABLE_ID_EPOCH_MS, sequence, node
+SORTABLE_ID_EPOCH_MS: int = 1_704_067_200_000  # 2024-01-01T00:00:00Z
+SORTABLE_ID_SEQUENCE_BITS: int = 12
+SORTABLE_ID_NODE_BITS: int = 10
+_NODE_MASK: int = (1 << SORTABLE_ID_NODE_BITS) - 1
 
 
 def integer_time_id() -> int:
-    """Returns an integer timestamp to be used as a simple key to sort data."""
+    """Returns an integer timestamp to be used as a simple key to sort data.
+
+    Records created in the same millisecond share the same value; use `sortable_id` for unique, sortable keys.
+    """
     return int(time.time() * 1000)
 
 
+class _TicketBlock(threading.local):
+    """Tickets reserved by the current thread, valid until the monotonic clock reaches `expires_ns`."""
+
+    tickets = iter(range(0))
+    expires_ns = 0
+
+
+class SortableIdGenerator:
+    """Generates unique, time-sortable 63-bit integer identifiers (Snowflake style).
+
+    Each identifier holds, from the most significant bit, 41 bits of milliseconds since 2024-01-01 UTC, a 12 bits
+    sequence and 10 node bits. The time prefix comes from the wall clock read once at creation and advanced with the
+    monotonic clock, so identifiers never go backwards when the system clock is adjusted.
+
+    Identifiers are unique within the generator and strictly increasing for each thread. Threads reserve small blocks
+    of sequence numbers under a lock and then hand them out lock-free until the block is exhausted or the millisecond
+    is over. As a result, identifiers of different threads are only ordered to the millisecond: an identifier handed
+    out after another one, by another thread within the same millisecond, may be smaller. A `block_size` of 1 makes
+    identifiers increasing across threads, at the cost of taking the lock for each of them. When more than 4096
+    identifiers are requested in the same millisecond, the sequence overflows into the time prefix: identifiers run
+    slightly ahead of the clock but stay unique and ordered.
+
+    Uniqueness across processes only rests on the node: two generators with the same node produce the same identifier
+    when they reserve the same sequence number in the same millisecond. The default node is drawn at random for each
+    process, which makes a collision between two given processes a 1 in 1024 chance, instead of a certainty for
+    processes whose ids are equal modulo 1024, such as the first process of each container. Processes that must never
+    collide should be given distinct nodes explicitly.
+    """
+
+    def __init__(self, node: int | None = None, block_size: int = 64) -> None:
+        """Initializes the generator.
+
+        Args:
+            node: Node number stored in the lowest 10 bits. Defaults to random bits drawn again in forked children.
+            block_size: Number of identifiers reserved at once by each thread.
+        """
+        self._explicit_node = node
+        self._block_size = max(1, block_size)
+        self.reset()
+
+    def reset(self) -> None:
+        """Resets the clock anchor, the node and the reserved blocks. Must be called in forked children."""
+        node = int.from_bytes(os.urandom(2)) if self._explicit_node is None else self._explicit_node
+        self._node = node & _NODE_MASK
+        self._lock = threading.Lock()
+        self._block = _TicketBlock()
+        self._anchor_ns = time.monotonic_ns()
+        self._anchor_ms = time.time_ns() // 1_000_000 - SORTABLE_ID_EPOCH_MS
+        self._next_ticket = 0
+
+    @property
+    def node(self) -> int:
+        """Returns the node number embedded in the identifiers."""
+        return self._node
+
+    def _reserve(self, count: int) -> tuple[int, int]:
+        """Reserves `count` consecutive tickets.
+
+        Returns:
+            The first reserved ticket and the monotonic time, in nanoseconds, at which the current millisecond ends.
+        """
+        with self._lock:
+            elapsed_ms = (time.monotonic_ns() - self._anchor_ns) // 1_000_000
+            first = max((self._anchor_ms + elapsed_ms) << SORTABLE_ID_SEQUENCE_BITS, self._next_ticket)
+            self._next_ticket = first + count
+        return first, self._anchor_ns + (elapsed_ms + 1) * 1_000_000
+
+    def next_id(self) -> int:
+        """Returns a new identifier."""
+        block = self._block
+        if time.monotonic_ns() < block.expires_ns:
+            ticket = next(block.tickets, None)
+            if ticket is not None:
+                return ticket << SORTABLE_ID_NODE_BITS | self._node
+
+        ticket, block.expires_ns = self._reserve(self._block_size)
+        block.tickets = iter(range(ticket + 1, ticket + self._block_size))
+        return ticket << SORTABLE_ID_NODE_BITS | self._node
+
+    def next_ids(self, count: int) -> range:
+        """Reserves `count` identifiers at once, for high-rate emitters.
+
+        Args:
+            count: Number of identifiers to reserve.
+
+        Returns:
+            An increasing range holding the reserved identifiers.
+        """
+        first, _ = self._reserve(count)
+        step = 1 << SORTABLE_ID_NODE_BITS
+        return range(first * step | self._node, (first + count) * step, step)
+
+    @staticmethod
+    def timestamp_ms(identifier: int) -> int:
+        """Returns the Unix time, in milliseconds, embedded in an identifier."""
+        return (identifier >> (SORTABLE_ID_SEQUENCE_BITS + SORTABLE_ID_NODE_BITS)) + SORTABLE_ID_EPOCH_MS
+
+
+_sortable_id_generator = SortableIdGenerator()
+os.register_at_fork(after_in_child=_sortable_id_generator.reset)
+
+
+def sortable_id() -> int:
+    """Returns a unique, time-sortable integer identifier from the process-wide `SortableIdGenerator`."""
+    return _sortable_id_generator.next_id()
+
+
+def sortable_ids(count: int) -> range:
+    """Reserves `count` unique, time-sortable integer identifiers from the process-wide `SortableIdGenerator`."""
+    return _sortable_id_generator.next_ids(count)
+
+
+class IdFormat(IntEnum):
+    """Enumeration of the text formats produced by `BufferedIdGenerator`.
+
+    Attributes:
+        UUID (int): Canonical 36 characters UUID version 4 string.
+        HEX (int): UUID version 4 as 32 hexadecimal characters, without dashes.
+        ULID (int): 26 characters Crockford base32 ULID: 48 bits of milliseconds followed by 80 random bits.
+    """
+
+    UUID = 1
+    HEX = 2
+    ULID = 3
+
+    def __str__(self) -> str:
+        """Overwrites the __str__ method to retrieve the name of the format."""
+        return self.name
+
+
+_UUID_VERSION_4 = bytes((byte & 0x0F) | 0x40 for byte in range(256))
+_UUID_VARIANT_RFC_4122 = bytes((byte & 0x3F) | 0x80 for byte in range(256))
+_CROCKFORD_BASE32 = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+# maps each random byte to one base32 character using its lowest 5 bits, which are uniformly distributed
+_BYTE_TO_CROCKFORD_BASE32 = bytes(ord(_CROCKFORD_BASE32[byte & 0x1F]) for byte in range(256))
+
+
+class BufferedIdGenerator:
+    """Generates random identifiers from bulk-drawn random bytes.
+
+    Random bytes for `buffer_size` identifiers are drawn with a single `os.urandom` call and formatted at once, then
+    handed out one by one. Handing out an identifier is a lock-free `next()` on the pre-filled buffer; when two threads
+    refill it concurrently, one of the batches is simply discarded. Buffers are discarded in forked children so that
+    parent and child never share identifiers.
+    """
+
+    def __init__(self, id_format: IdFormat = IdFormat.UUID, buffer_size: int = 1024) -> None:
+        """Initializes the generator.
+
+        Args:
+            id_format: Text format of the generated identifiers.
+            buffer_size: Number of identifiers generated per refill.
+        """
+        self._format = id_format
+        self._buffer_size = max(1, buffer_size)
+        self._ids: Iterator[str] = iter(())
+        self._ulid_prefix: tuple[int, str] = (-1, "")
+        _buffered_id_generators.add(self)
+
+    @property
+    def id_format(self) -> IdFormat:
+        """Returns the format of the generated identifiers."""
+        return self._format
+
+    def reset(self) -> None:
+        """Discards the identifiers generated in advance."""
+        self._ids = iter(())
+
+    def next_id(self) -> str:
+        """Returns a new identifier."""
+        identifier = next(self._ids, None)
+        if identifier is None:
+            buffer = self._fill()
+            identifier = buffer[0]
+            self._ids = iter(buffer[1:])
+
+        if self._format is IdFormat.ULID:
+            return self._ulid_time_prefix() + identifier
+        return identifier
+
+    def _fill(self) -> list[str]:
+        """Draws random bytes for a whole buffer and formats them."""
+        count = self._buffer_size
+        if self._format is IdFormat.ULID:
+            # 16 random characters carry the 80 random bits of a ULID
+            text = os.urandom(16 * count).translate(_BYTE_TO_CROCKFORD_BASE32).decode("ascii")
+            return [text[index : index + 16] for index in range(0, 16 * count, 16)]
+
+        raw = bytearray(os.urandom(16 * count))
+        raw[6::16] = raw[6::16].translate(_UUID_VERSION_4)
+        raw[8::16] = raw[8::16].translate(_UUID_VARIANT_RFC_4122)
+        text = raw.hex()
+        if self._format is IdFormat.HEX:
+            return [text[index : index + 32] for index in range(0, 32 * count, 32)]
+        return [
+            f"{text[i : i + 8]}-{text[i + 8 : i + 12]}-{text[i + 12 : i + 16]}-"
+            f"{text[i + 16 : i + 20]}-{text[i + 20 : i + 32]}"
+            for i in range(0, 32 * count, 32)
+        ]
+
+    def _ulid_time_prefix(self) -> str:
+        """Returns the 10 characters ULID time prefix of the current millisecond."""
+        now_ms = time.time_ns() // 1_000_000
+        cached_ms, prefix = self._ulid_prefix
+        if now_ms != cached_ms:
+            prefix = "".join(_CROCKFORD_BASE32[(now_ms >> shift) & 0x1F] for shift in range(45, -5, -5))
+            self._ulid_prefix = (now_ms, prefix)
+        return prefix
+
+
+_buffered_id_generators: "weakref.WeakSet[BufferedIdGenerator]" = weakref.WeakSet()
+
+
+def _reset_buffered_id_generators() -> None:
+    """Discards, in a forked child, the identifiers generated in advance by the parent."""
+    for generator in _buffered_id_generators:
+        generator.reset()
+
+
+os.register_at_fork(after_in_child=_reset_buffered_id_generators)
+
+
 def generate_uuid4() -> str:
     """Generate a universally unique identifier (UUID) version 4.
 
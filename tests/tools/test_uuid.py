@@ -0,0 +1,50 @@
+"""Tests of the sortable identifiers."""
+
+import threading
+
+from tools.uuid import SortableIdGenerator
+
+THREADS = 4
+IDS_PER_THREAD = 5_000
+
+
+def generate(generator: SortableIdGenerator) -> list[list[int]]:
+    """Returns the identifiers generated by each of several threads, in the order they were generated."""
+    results: list[list[int]] = [[] for _ in range(THREADS)]
+    lock = threading.Lock()
+    order: list[int] = []
+
+    def run(index: int) -> None:
+        for _ in range(IDS_PER_THREAD):
+            with lock:
+                identifier = generator.next_id()
+                order.append(identifier)
+            results[index].append(identifier)
+
+    threads = [threading.Thread(target=run, args=(index,)) for index in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return [*results, order]
+
+
+def test_identifiers_are_unique_and_increasing_per_thread() -> None:
+    """Identifiers never repeat and each thread sees them increase."""
+    *per_thread, order = generate(SortableIdGenerator(node=7))
+    assert len(set(order)) == len(order)
+    for identifiers in per_thread:
+        assert identifiers == sorted(identifiers)
+    assert all(identifier & 1023 == 7 for identifier in order)  # noqa: PLR2004
+
+
+def test_single_ticket_blocks_are_increasing_across_threads() -> None:
+    """Without ticket blocks, identifiers increase in the order they are handed out, whatever the thread."""
+    *_, order = generate(SortableIdGenerator(block_size=1))
+    assert order == sorted(order)
+
+
+def test_default_node_is_random() -> None:
+    """The default node does not depend on the process id."""
+    nodes = {SortableIdGenerator().node for _ in range(64)}
+    assert len(nodes) > 1
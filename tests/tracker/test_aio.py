@@ -0,0 +1,204 @@
+"""Tests of the asyncio HTTP client and Loki shipper."""
+
+import asyncio
+import gzip
+import json
+from collections.abc import Callable, Coroutine, Iterator
+from typing import Any
+
+import pytest
+from loguru import logger
+
+from telemetry import SignalsConfig
+from telemetry.aio import AsyncHttpClient, AsyncLokiShipper, AsyncSignals
+
+NO_CONTENT = b"HTTP/1.1 204 No Content\r\n\r\n"
+SHIPPER_OPTIONS: dict[str, Any] = {"queue_size": 1_000, "batch_size": 1_000, "flush_interval": 60}
+
+
+class FakeServer:
+    """HTTP/1.1 server answering each request with the next scripted response, then with 204 No Content.
+
+    A scripted response can close the connection after it, without telling the client, as a server dropping an idle
+    keep-alive connection would.
+    """
+
+    def __init__(self, *responses: tuple[bytes, bool]) -> None:
+        """Initializes the server.
+
+        Args:
+            *responses: Raw responses to the first requests, and whether the connection is closed after each.
+        """
+        self.responses = list(responses)
+        self.bodies: list[bytes] = []
+        self.connections = 0
+        self._server: asyncio.Server | None = None
+
+    @property
+    def url(self) -> str:
+        """Returns the push endpoint URL."""
+        assert self._server is not None
+        host, port = self._server.sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}/loki/api/v1/push"
+
+    @property
+    def lines(self) -> list[dict[str, Any]]:
+        """Returns the log lines pushed so far."""
+        streams = [stream for body in self.bodies for stream in json.loads(gzip.decompress(body))["streams"]]
+        return [json.loads(line) for stream in streams for _, line in stream["values"]]
+
+    async def __aenter__(self) -> "FakeServer":
+        """Starts serving on a free local port."""
+        self._server = await asyncio.start_server(self._serve, "127.0.0.1", 0)
+        return self
+
+    async def __aexit__(self, *_: object) -> None:
+        """Stops serving."""
+        assert self._server is not None
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Answers the requests of a connection."""
+        self.connections += 1
+        try:
+            while await reader.readline():
+                headers: dict[str, str] = {}
+                while (line := await reader.readline()) not in {b"\r\n", b""}:
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                self.bodies.append(await reader.readexactly(int(headers.get("content-length", "0"))))
+                response, close = self.responses.pop(0) if self.responses else (NO_CONTENT, False)
+                writer.write(response)
+                await writer.drain()
+                if close:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+def run(test: Callable[[], Coroutine[Any, Any, None]]) -> None:
+    """Runs a coroutine test on a new event loop."""
+    asyncio.run(test())
+
+
+def test_connections_are_kept_alive() -> None:
+    """Successive requests reuse the same connection."""
+
+    async def test() -> None:
+        async with FakeServer() as server:
+            client = AsyncHttpClient(server.url)
+            for _ in range(3):
+                assert await client.post(b"{}") == (204, b"")
+            await client.close()
+        assert client.connections_opened == 1
+        assert server.connections == 1
+
+    run(test)
+
+
+def test_request_is_retried_when_a_reused_connection_was_closed() -> None:
+    """A request on an idle connection the server closed is sent again on a new connection."""
+
+    async def test() -> None:
+        async with FakeServer((NO_CONTENT, True)) as server:
+            client = AsyncHttpClient(server.url)
+            assert await client.post(b"first") == (204, b"")
+            # lets the server close the connection, as it would after its keep-alive timeout
+            await asyncio.sleep(0.05)
+            assert await client.post(b"second") == (204, b"")
+            await client.close()
+        assert client.connections_opened == 2  # noqa: PLR2004
+        assert server.bodies[-1] == b"second"
+
+    run(test)
+
+
+def test_chunked_responses_are_read_whole() -> None:
+    """A chunked response body is reassembled, and the connection is reused after it."""
+    chunked = b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n5\r\nhello\r\n6;ext=1\r\n world\r\n0\r\n\r\n"
+
+    async def test() -> None:
+        async with FakeServer((chunked, False)) as server:
+            client = AsyncHttpClient(server.url)
+            assert await client.post(b"{}") == (200, b"hello world")
+            assert await client.post(b"{}") == (204, b"")
+            await client.close()
+        assert client.connections_opened == 1
+
+    run(test)
+
+
+@pytest.fixture
+def shipping() -> Iterator[Callable[[AsyncLokiShipper], None]]:
+    """Returns a function adding a shipper as a loguru sink; the sinks are removed after the test."""
+    sink_ids: list[int] = []
+
+    def add(shipper: AsyncLokiShipper) -> None:
+        sink_ids.append(logger.add(shipper, format="{message}"))
+
+    yield add
+    for sink_id in sink_ids:
+        logger.remove(sink_id)
+
+
+def test_rejected_pushes_are_counted_as_failed(shipping: Callable[[AsyncLokiShipper], None]) -> None:
+    """A push answered with an error status fails its records, and the error is kept."""
+    rejected = b"HTTP/1.1 500 Internal Server Error\r\nContent-Length: 4\r\n\r\noops"
+
+    async def test() -> None:
+        async with FakeServer((rejected, False)) as server:
+            shipper = AsyncLokiShipper(server.url, {"application": "test"}, (), **SHIPPER_OPTIONS)
+            shipping(shipper)
+            for index in range(3):
+                logger.info("Order processed.", index=index)
+            assert await shipper.drain_async(5)
+            await shipper.aclose()
+        stats = shipper.stats()
+        assert (stats["shipped"], stats["failed"]) == (0, 3)
+        assert isinstance(shipper.last_error, RuntimeError)
+        assert "HTTP 500" in str(shipper.last_error)
+
+    run(test)
+
+
+def test_aclose_ships_what_is_queued(shipping: Callable[[AsyncLokiShipper], None]) -> None:
+    """Closing the shipper pushes the records still queued, without waiting for the flush interval."""
+
+    async def test() -> None:
+        async with FakeServer() as server:
+            shipper = AsyncLokiShipper(server.url, {"application": "test"}, (), **SHIPPER_OPTIONS)
+            shipping(shipper)
+            for index in range(10):
+                logger.info("Order processed.", index=index)
+            await shipper.aclose(5)
+            assert [line["index"] for line in server.lines] == list(range(10))
+        assert shipper.stats()["shipped"] == 10  # noqa: PLR2004
+
+    run(test)
+
+
+def test_aclose_removes_the_sinks(capsys: pytest.CaptureFixture[str]) -> None:
+    """Closing an instance ships its signals, then leaves none of its handlers on the loguru logger."""
+    core: Any = logger._core  # type: ignore[attr-defined]  # noqa: SLF001
+
+    async def test() -> None:
+        async with FakeServer() as server:
+            config = SignalsConfig(
+                app_name="test", environment="test", use_singleton_design_pattern=False, loki_url=server.url
+            )
+            handlers = set(core.handlers)
+            async with AsyncSignals(config) as signals:
+                signals.add_sink(lambda _: None, level="INFO")
+                signals.info("Before closing.")
+            # the first instance also removes the default stderr handler of loguru
+            assert set(core.handlers) <= handlers
+            signals.info("After closing.")
+            assert [line["message"] for line in server.lines][-1] == "Before closing."
+
+    run(test)
+    output = capsys.readouterr().out
+    assert "Before closing." in output
+    assert "After closing." not in output
@@ -0,0 +1,46 @@
+"""Tests of the columnar archive."""
+
+from datetime import UTC, datetime
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from telemetry.archive import ArchiveSink, read_archive
+from telemetry.enums import ArchiveFormat
+
+pytest.importorskip("pyarrow")
+
+
+def record(index: int) -> dict[str, Any]:
+    """Returns a loguru-like record of a signal emitted in one of three groups."""
+    return {
+        "time": datetime.now(UTC),
+        "level": SimpleNamespace(name="INFO", no=20),
+        "message": f"Row {index} loaded.",
+        "extra": {
+            "app_name": "test",
+            "job_uuid": "job",
+            "parent_uuid": f"group-{index}",
+            "signal_group_name": f"Step {index % 3}",
+            "event_uuid": f"event-{index}",
+            "rows": index,
+        },
+    }
+
+
+@pytest.mark.parametrize("archive_format", [ArchiveFormat.PARQUET, ArchiveFormat.ARROW])
+def test_archive_round_trip(tmp_path: Path, archive_format: ArchiveFormat) -> None:
+    """Signals written over several row groups are read back, high-cardinality identifiers as plain strings."""
+    sink = ArchiveSink(tmp_path, archive_format=archive_format, row_group_size=4, flush_interval=60)
+    for index in range(10):
+        sink.put(record(index))  # type: ignore[arg-type]
+    sink.stop()
+
+    frame = read_archive(tmp_path)
+    assert frame["parent_uuid"].tolist() == [f"group-{index}" for index in range(10)]
+    assert frame["parent_uuid"].dtype != "category"
+    assert frame["signal_group_name"].dtype == "category"
+    assert frame["signal_group_name"].tolist() == [f"Step {index % 3}" for index in range(10)]
+    assert frame["level"].tolist() == ["INFO"] * 10
@@ -0,0 +1,37 @@
+"""Tests of the collector of worker process signals."""
+
+import pickle
+from typing import Any
+
+from telemetry.collector import SignalsCollector
+
+
+class FakeSignals:
+    """Stands in for the Signals instance of the collector, recording the forwarded signals."""
+
+    def __init__(self) -> None:
+        """Initializes the records."""
+        self.emitted: list[tuple[str, str]] = []
+
+    def emit_forwarded(self, level: str, message: str, fields: dict[str, Any], **kwargs: Any) -> None:  # noqa: ARG002
+        """Records a forwarded signal, rejecting unknown levels."""
+        if level == "UNKNOWN":
+            msg = f"Level {level!r} does not exist"
+            raise ValueError(msg)
+        self.emitted.append((level, message))
+
+
+def test_failed_batches_are_counted_and_skipped() -> None:
+    """A batch that cannot be unpickled or emitted does not stop the collector."""
+    signals = FakeSignals()
+    collector = SignalsCollector(signals)  # type: ignore[arg-type]
+    queue: Any = collector._queue  # noqa: SLF001
+    queue.put((1, b"not a pickle"))
+    queue.put((1, pickle.dumps([("INFO", "first", {}), ("UNKNOWN", "second", {}), ("INFO", "lost", {})])))
+    queue.put((1, pickle.dumps([("INFO", "third", {})])))
+    collector.stop()
+
+    assert signals.emitted == [("INFO", "first"), ("INFO", "third")]
+    assert collector.received == 2  # noqa: PLR2004
+    assert collector.failed == 2  # noqa: PLR2004
+    assert isinstance(collector.last_error, ValueError)
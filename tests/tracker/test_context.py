@@ -0,0 +1,97 @@
+"""Tests of the context-local group hierarchy."""
+
+import contextvars
+import threading
+from typing import TYPE_CHECKING
+
+from loguru import logger
+
+from telemetry import Signals, SignalsConfig
+from telemetry.context import GroupContext, GroupFrame
+from telemetry.enums import SignalsGroup
+
+if TYPE_CHECKING:
+    from loguru import Record
+
+
+def depth(frame: GroupFrame | None) -> int:
+    """Returns the number of frames in a hierarchy."""
+    return 0 if frame is None else 1 + depth(frame.parent)
+
+
+def test_groups_of_the_same_kind_replace_each_other() -> None:
+    """Groups started one after the other, without being ended, do not nest under each other."""
+    groups = GroupContext("test_siblings")
+    process = groups.push(SignalsGroup.PROCESS, "process", "Process")
+    for index in range(100):
+        task = groups.push(SignalsGroup.TASK, f"task-{index}", "Task")
+        for step in range(10):
+            groups.push(SignalsGroup.STEP, f"step-{index}-{step}", "Step")
+        assert task.parent is process
+    current = groups.current
+    assert current is not None
+    assert current.uuid == "step-99-9"
+    assert current.parent is task
+    assert depth(current) == 3  # noqa: PLR2004
+
+
+def test_entered_groups_of_the_same_kind_nest() -> None:
+    """A group of the same kind as an entered group nests under it, until that group is exited."""
+    groups = GroupContext("test_nested")
+    process = groups.push(SignalsGroup.PROCESS, "process", "Process")
+    outer = groups.push(SignalsGroup.TASK, "outer", "Task")
+    groups.enter(outer)
+    inner = groups.push(SignalsGroup.TASK, "inner", "Task")
+    assert inner.parent is outer
+    assert groups.push(SignalsGroup.TASK, "sibling", "Task").parent is outer
+    groups.exit(outer)
+    groups.replace(outer)
+    assert groups.push(SignalsGroup.TASK, "next", "Task").parent is process
+
+
+def test_nested_spans_of_the_same_kind_keep_their_parent() -> None:
+    """Signals of a nested span, and after it, name the enclosing span of the same kind as their parent."""
+    signals = Signals(SignalsConfig(app_name="test", environment="test", use_singleton_design_pattern=False))
+    records: list[Record] = []
+    signals.add_sink(lambda message: records.append(message.record), level="INFO")
+    try:
+        with signals.process("P", "Process."), signals.task("A", "Outer task.") as outer:
+            with signals.task("B", "Inner task.") as inner:
+                pass
+            signals.info("After the inner task.")
+            assert signals.task_uuid == outer.frame.uuid
+    finally:
+        logger.remove()
+
+    extra = {record["message"]: record["extra"] for record in records}
+    assert extra["B started."]["parent_uuid"] == outer.frame.uuid
+    assert extra["B finished."]["group_parent_uuid"] == outer.frame.uuid
+    assert inner.parent_uuid == outer.frame.uuid
+    assert extra["After the inner task."]["parent_uuid"] == outer.frame.uuid
+
+
+def test_root_frame_is_never_replaced() -> None:
+    """A group of the same kind as the inherited root frame nests under it."""
+    root = GroupFrame(uuid="root", name="Root", group=SignalsGroup.TASK)
+    groups = GroupContext("test_root", root=root)
+    task = groups.push(SignalsGroup.TASK, "task", "Task")
+    assert task.parent is root
+
+
+def test_threads_carry_the_frame_in_a_copied_context() -> None:
+    """Threads start outside of any group, unless their target runs in a copy of the current context."""
+    groups = GroupContext("test_threads")
+    process = groups.push(SignalsGroup.PROCESS, "process", "Process")
+    seen: dict[str, GroupFrame | None] = {}
+
+    def read(key: str) -> None:
+        seen[key] = groups.current
+
+    threads = [
+        threading.Thread(target=read, args=("plain",)),
+        threading.Thread(target=contextvars.copy_context().run, args=(read, "copied")),
+    ]
+    for thread in threads:
+        thread.start()
+        thread.join()
+    assert seen == {"plain": None, "copied": process}
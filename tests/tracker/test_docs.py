@@ -0,0 +1,127 @@
+"""Tests of the record of the documents shipped by DOCS signals."""
+
+import dataclasses
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import pytest
+from loguru import logger
+
+from telemetry import Signals, SignalsConfig
+from telemetry.docs import ShippedDocs
+from telemetry.shipping import BatchShipper
+
+if TYPE_CHECKING:
+    from loguru import Message, Record
+
+    from telemetry.spool import Spool
+
+URL = "http://127.0.0.1:1/loki/api/v1/push"
+
+
+class FakeLokiShipper(BatchShipper["Record"]):
+    """Loguru sink queuing records for a push that succeeds or fails as told."""
+
+    def write(self, message: "Message") -> None:
+        """Queues the record behind the message."""
+        self.put(message.record)
+
+
+class FakeLokiSignals(Signals):
+    """Signals pushing to a fake Loki, whose pushes fail while `available` is False."""
+
+    available = True
+
+    def _loki_shipper(self, url: str, spool: "Spool | None") -> BatchShipper[Any]:  # noqa: ARG002
+        """Returns the fake Loki sink."""
+        return FakeLokiShipper(self._push, queue_size=100, batch_size=100, flush_interval=0.05)
+
+    def _push(self, records: list["Record"]) -> None:  # noqa: ARG002
+        """Fails unless Loki is available."""
+        if not self.available:
+            msg = "Loki is unavailable."
+            raise ConnectionError(msg)
+
+
+def emitted(signals: Signals, *texts: str) -> list[dict[str, Any]]:
+    """Emits documents and returns the DOCS signals, once shipped."""
+    records: list[Record] = []
+    sink_id = signals.add_sink(lambda message: records.append(message.record), level="DOCS")
+    for text in texts:
+        signals.docs("Documentation.", text)
+    signals.remove_sink(sink_id)
+    signals.flush(5)
+    return [record["extra"] for record in records]
+
+
+@pytest.fixture
+def config(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> SignalsConfig:
+    """Returns the configuration of a job recording its shipped documents in a temporary directory."""
+    monkeypatch.delenv("LOKI_URL", raising=False)
+    return SignalsConfig(
+        app_name="test",
+        environment="test",
+        use_singleton_design_pattern=False,
+        loki_url=URL,
+        docs_directory=str(tmp_path),
+        docs_chunk_size=4,
+    )
+
+
+def test_documents_are_recorded_once_pushed(config: SignalsConfig) -> None:
+    """A document is sent in full until a push carrying every chunk of it succeeded, then as a reference."""
+    signals = FakeLokiSignals(config)
+    try:
+        signals.available = False
+        failed = emitted(signals, "Short", "Short")
+        assert [fields["doc_chunk"] for fields in failed] == [1, 2, 1, 2]
+        assert all("docs" in fields for fields in failed)
+
+        signals.available = True
+        pushed = emitted(signals, "Short")
+        assert [fields["doc_chunk"] for fields in pushed] == [1, 2]
+        (reference,) = emitted(FakeLokiSignals(config), "Short")
+        assert reference["doc_ref"] == pushed[0]["doc_hash"]
+    finally:
+        logger.remove()
+
+
+def test_documents_are_not_recorded_without_loki(config: SignalsConfig, tmp_path: Path) -> None:
+    """Without a Loki sink, documents are always emitted in full and nothing is recorded."""
+    signals = Signals(dataclasses.replace(config, loki_url=None))
+    try:
+        assert all("docs" in fields for fields in emitted(signals, "Short", "Short"))
+    finally:
+        logger.remove()
+    assert not any(path.is_file() for path in tmp_path.rglob("*"))
+
+
+def test_document_fields_do_not_leak_into_files(config: SignalsConfig, tmp_path: Path) -> None:
+    """The chunk and size fields of a document given as text are not carried over to the files of the same call."""
+    file = tmp_path / "notes.md"
+    file.write_text("Hi", encoding="utf-8")
+    signals = Signals(dataclasses.replace(config, loki_url=None))
+    records: list[Record] = []
+    signals.add_sink(lambda message: records.append(message.record), level="DOCS")
+    try:
+        signals.docs("Documentation.", "Short", paths=file, owner="docs")
+    finally:
+        logger.remove()
+
+    *text, notes = (record["extra"] for record in records)
+    assert [fields["doc_chunk"] for fields in text] == [1, 2]
+    assert "doc_chunk" not in notes
+    assert "doc_chunks" not in notes
+    assert notes["doc_bytes"] == 2  # noqa: PLR2004
+    assert notes["owner"] == "docs"
+
+def test_chunked_documents_need_every_chunk(tmp_path: Path) -> None:
+    """A document shipped in several signals is recorded once all of its chunks were delivered."""
+    shipped = ShippedDocs(tmp_path, "test", "test", URL)
+    shipped.delivered("fingerprint", 2, 3)
+    shipped.delivered("fingerprint", 1, 3)
+    assert "fingerprint" not in shipped
+    shipped.delivered("fingerprint", 3, 3)
+    assert "fingerprint" in shipped
+    assert "fingerprint" in ShippedDocs(tmp_path, "test", "test", URL)
+    assert "fingerprint" not in ShippedDocs(tmp_path, "test", "test", "http://elsewhere/loki/api/v1/push")
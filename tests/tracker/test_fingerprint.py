@@ -0,0 +1,76 @@
+"""Tests of the fingerprints of DataFrames."""
+
+from typing import TYPE_CHECKING, Any
+
+import pytest
+from loguru import logger
+
+from telemetry import Signals, SignalsConfig
+from telemetry.fingerprint import FrameDigest
+
+if TYPE_CHECKING:
+    from loguru import Message
+
+pd = pytest.importorskip("pandas")
+
+
+class Unprintable:
+    """Value that can be neither hashed nor turned into a string."""
+
+    def __hash__(self) -> int:
+        """Fails."""
+        msg = "Unprintable values cannot be hashed."
+        raise RuntimeError(msg)
+
+    def __str__(self) -> str:
+        """Fails."""
+        msg = "Unprintable values cannot be printed."
+        raise RuntimeError(msg)
+
+
+def fingerprint(*chunks: Any) -> str:
+    """Returns the fingerprint of a frame given as chunks."""
+    digest = FrameDigest()
+    for chunk in chunks:
+        digest.update(chunk)
+    assert digest.error is None
+    return digest.hexdigest()
+
+
+@pytest.mark.parametrize(
+    "values",
+    [
+        [[1, 2], [3], None, [], [4, [5]]],
+        [{"b": 1, "a": 2}, None, {"a": [1]}, {}, {"c": {"d": None}}],
+    ],
+)
+def test_unhashable_columns_are_fingerprinted(values: list[Any]) -> None:
+    """Columns of lists and dicts are fingerprinted, chunk by chunk as a whole."""
+    frame = pd.DataFrame({"values": values, "rows": range(len(values))})
+    assert fingerprint(frame) == fingerprint(frame.iloc[:2], frame.iloc[2:])
+    assert fingerprint(frame) != fingerprint(frame.iloc[::-1])
+
+
+def test_unhashable_values_are_compared_by_content() -> None:
+    """Equal dicts have the same fingerprint whatever their key order, and nulls are told from empty values."""
+    assert fingerprint(pd.DataFrame({"c": [{"a": 1, "b": 2}]})) == fingerprint(pd.DataFrame({"c": [{"b": 2, "a": 1}]}))
+    assert fingerprint(pd.DataFrame({"c": [[1], None]})) != fingerprint(pd.DataFrame({"c": [[1], []]}))
+
+
+def test_dataset_is_logged_without_a_fingerprint_that_failed() -> None:
+    """A frame that cannot be fingerprinted is still logged, with its profile, after a warning telling why."""
+    config = SignalsConfig(app_name="test", environment="test", use_singleton_design_pattern=False)
+    signals = Signals(config)
+    messages: list[Message] = []
+    signals.add_sink(messages.append, level="WARNING")
+    try:
+        signals.dataset("Orders loaded.", pd.DataFrame({"order": [Unprintable(), Unprintable()]}))
+    finally:
+        logger.remove()
+
+    warning, dataset = (message.record for message in messages)
+    assert warning["level"].name == "WARNING"
+    assert "cannot be hashed" in warning["message"]
+    assert dataset["message"] == "Orders loaded."
+    assert "fingerprint" not in dataset["extra"]
+    assert dataset["extra"]["profile"]["rows"] == 2  # noqa: PLR2004
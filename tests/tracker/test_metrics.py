@@ -0,0 +1,89 @@
+"""Tests of the aggregation of metrics."""
+
+import math
+import os
+import subprocess
+import sys
+from pathlib import Path
+from textwrap import dedent
+
+import pytest
+
+from telemetry.enums import MetricKind
+from telemetry.metrics import MetricsAggregator
+from telemetry.stats import Histogram
+
+
+@pytest.mark.parametrize("value", [math.inf, -math.inf, math.nan])
+@pytest.mark.parametrize("kind", list(MetricKind))
+def test_non_finite_values_are_rejected(kind: MetricKind, value: float) -> None:
+    """Infinite and NaN values raise, and leave the statistics of the metric untouched."""
+    metrics = MetricsAggregator()
+    metrics.record(None, "DATAOPS", kind, "latency", 2.0)
+    with pytest.raises(ValueError, match="finite"):
+        metrics.record(None, "DATAOPS", kind, "latency", value)
+
+    ((_, _, summaries),) = metrics.take_all()
+    summary = summaries["latency"]
+    assert all(math.isfinite(statistic) for statistic in summary.values() if isinstance(statistic, float))
+
+
+def test_histogram_percentiles_are_within_their_bucket() -> None:
+    """Percentiles of negative, zero and positive values are off by at most an eighth of their value."""
+    metrics = MetricsAggregator()
+    values = [-8.0, -1.0, 0.0, *(float(value) for value in range(1, 98))]
+    for value in values:
+        metrics.record(None, "DATAOPS", MetricKind.HISTOGRAM, "delta", value)
+
+    ((_, _, summaries),) = metrics.take_all()
+    summary = summaries["delta"]
+    assert summary["count"] == len(values)
+    assert (summary["min"], summary["max"]) == (-8.0, 97.0)
+    for percent in (50, 90, 99):
+        exact = sorted(values)[math.ceil(len(values) * percent / 100) - 1]
+        assert exact <= summary[f"p{percent}"] <= exact * 1.125
+
+
+def test_empty_histogram_summary_is_zero() -> None:
+    """The pipeline histograms report zeros before their first value."""
+    assert Histogram().summary(1e-6) == {"count": 0, "mean": 0.0, "p50": 0, "p90": 0, "p99": 0, "max": 0.0}
+
+
+EXIT_SCRIPT = """
+import multiprocessing
+import sys
+
+from telemetry import Signals, SignalsConfig
+from telemetry.collector import SignalsCollector
+from telemetry.signals import worker_signals
+
+
+def work(handle):
+    worker_signals(handle).count("rows", 2)
+
+
+if __name__ == "__main__":
+    signals = Signals(SignalsConfig(app_name="test", environment="test", use_singleton_design_pattern=False))
+    signals.add_sink(lambda message: print(message.record["extra"].get("metrics")), level="DATAOPS", format="{message}")
+    signals.count("rows", 1)
+    if sys.argv[1] == "worker":
+        with SignalsCollector(signals) as collector:
+            worker = multiprocessing.Process(target=work, args=(collector.handle(),))
+            worker.start()
+            worker.join()
+"""
+
+
+@pytest.mark.parametrize("process", ["main", "worker"])
+def test_metrics_are_emitted_at_exit(process: str, tmp_path: Path) -> None:
+    """The metrics aggregated when the interpreter, or a worker process, exits are still emitted."""
+    script = tmp_path / "job.py"
+    script.write_text(dedent(EXIT_SCRIPT))
+    source = str(Path(__file__).parents[2] / "src")
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, (source, os.environ.get("PYTHONPATH"))))}
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, str(script), process], capture_output=True, text=True, env=env, timeout=60, check=True
+    )
+    metrics = sorted(line for line in result.stdout.splitlines() if line.startswith("{'rows'"))
+    values = [1, 2] if process == "worker" else [1]
+    assert metrics == [f"{{'rows': {{'kind': 'counter', 'value': {value}, 'updates': 1}}}}" for value in values]
@@ -0,0 +1,86 @@
+"""Tests of the sampled profiles of datasets."""
+
+from typing import Any
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+
+from telemetry.profiling import DatasetProfiler  # noqa: E402  # imports numpy and pandas
+
+ROWS = 200_000
+
+
+def chunks(frame: Any, sizes: list[int]) -> list[Any]:
+    """Splits a frame into chunks of the given sizes, repeated until every row is taken."""
+    parts: list[Any] = []
+    start = 0
+    while start < len(frame):
+        size = sizes[len(parts) % len(sizes)]
+        parts.append(frame.iloc[start : start + size])
+        start += size
+    return parts
+
+
+def test_reservoir_sample_is_uniform_across_chunks() -> None:
+    """Rows of chunks of any size are equally likely to be sampled: each tenth of the dataset holds about a tenth.
+
+    With 2,000 rows sampled out of 100,000, the rows of each tenth follow a binomial law of mean 200 and standard
+    deviation 13.4: the bound of 60 is 4.5 standard deviations.
+    """
+    frame = pd.DataFrame({"row": np.arange(100_000)})
+    profiler = DatasetProfiler(sample_size=2_000, seed=7)
+    for chunk in chunks(frame, [1, 5_000, 317, 20_000, 2_500]):
+        profiler.update(chunk)
+
+    sample = profiler._sample["row"].to_numpy()  # noqa: SLF001
+    assert len(sample) == len(set(sample.tolist())) == 2_000  # noqa: PLR2004
+    tenths = np.bincount(sample // 10_000, minlength=10)
+    assert all(abs(count - 200) <= 60 for count in tenths.tolist()), tenths  # noqa: PLR2004
+    assert profiler.profile()["sample_rows"] == 2_000  # noqa: PLR2004
+
+
+def test_seeded_profiles_are_reproducible() -> None:
+    """Profilers with the same seed sample the same rows."""
+    frame = pd.DataFrame({"row": np.arange(50_000), "name": [f"order-{row % 977}" for row in range(50_000)]})
+    profiles = []
+    for _ in range(2):
+        profiler = DatasetProfiler(sample_size=1_000, seed=3)
+        for chunk in chunks(frame, [4_000]):
+            profiler.update(chunk)
+        profiles.append((profiler._sample["row"].tolist(), profiler.profile()))  # noqa: SLF001
+    assert profiles[0] == profiles[1]
+
+
+@pytest.mark.parametrize("cardinality", [100, 5_000, 50_000, ROWS])
+def test_distinct_estimates_are_within_five_percent(cardinality: int) -> None:
+    """The distinct estimate of 10,000 sampled rows out of 200,000 is within 5% of the cardinality.
+
+    Every value occurs `ROWS / cardinality` times, in a shuffled order; numbers and strings are estimated alike.
+    """
+    values = np.arange(ROWS) % cardinality
+    np.random.default_rng(1).shuffle(values)
+    frame = pd.DataFrame({"number": values, "text": values.astype(str)})
+    profiler = DatasetProfiler(sample_size=10_000, seed=0)
+    for chunk in chunks(frame, [25_000]):
+        profiler.update(chunk)
+
+    profile = profiler.profile()
+    assert profile["sample_rows"] == 10_000  # noqa: PLR2004
+    for column in ("number", "text"):
+        distinct = profile["column_profiles"][column]["distinct"]
+        assert abs(distinct - cardinality) <= 0.05 * cardinality, (column, distinct)
+
+
+def test_distinct_counts_are_exact_without_sampling() -> None:
+    """Columns are counted exactly when every row is kept, nulls aside."""
+    frame = pd.DataFrame({"value": [1, 2, 2, None, 3, 3, 3]})
+    profiler = DatasetProfiler(sample_size=None)
+    for chunk in chunks(frame, [3]):
+        profiler.update(chunk)
+
+    profile = profiler.profile()
+    assert "sample_rows" not in profile
+    assert profile["column_profiles"]["value"]["distinct"] == 3  # noqa: PLR2004
+    assert profile["column_profiles"]["value"]["nulls"] == 1
@@ -0,0 +1,93 @@
+"""Tests of the indexed queries over the signals archive."""
+
+import contextlib
+from pathlib import Path
+
+import pytest
+from loguru import logger
+
+from telemetry import Signals, SignalsConfig
+from telemetry.archive import archive_files
+from telemetry.enums import ArchiveFormat
+from telemetry.query import SignalsQuery
+
+pytest.importorskip("pyarrow")
+pytest.importorskip("pandas")
+
+
+def archived_job(directory: Path, archive_format: ArchiveFormat) -> dict[str, str]:
+    """Runs a job archiving its signals, whose Parse step fails, and returns the UUID of the job and of its groups."""
+    config = SignalsConfig(
+        app_name="test",
+        environment="test",
+        use_singleton_design_pattern=False,
+        output_format="{message}",
+        archive_directory=str(directory),
+        archive_format=archive_format,
+        archive_row_group_size=4,
+    )
+    signals = Signals(config)
+    try:
+        with signals.process("Load", "Loads the orders.") as load:
+            with signals.task("Extract", "Extracts the orders.") as extract:
+                signals.error("Source unavailable.")
+                with contextlib.suppress(RuntimeError), signals.step("Parse", "Parses the orders.") as parse:
+                    msg = "Unreadable order."
+                    raise RuntimeError(msg)
+            with signals.task("Transform", "Transforms the orders.") as transform:
+                signals.info("Orders transformed.")
+        # completes the archive file
+        signals._queues()["archive"].stop()  # noqa: SLF001
+    finally:
+        logger.remove()
+    return {
+        "job": signals.job_uuid,
+        **{span.title: str(span.frame.uuid) for span in (load, extract, parse, transform)},
+    }
+
+
+@pytest.mark.parametrize("archive_format", [ArchiveFormat.PARQUET, ArchiveFormat.ARROW])
+def test_tree_counts_the_errors_of_every_subtree(tmp_path: Path, archive_format: ArchiveFormat) -> None:
+    """The hierarchy of a job is rebuilt with the errors under each group and under its descendants."""
+    uuids = archived_job(tmp_path, archive_format)
+    tree = SignalsQuery(tmp_path).tree(uuids["job"])
+
+    assert tree["path"].tolist() == ["Load", "Load > Extract", "Load > Extract > Parse", "Load > Transform"]
+    assert tree["group_uuid"].tolist() == [uuids[title] for title in ("Load", "Extract", "Parse", "Transform")]
+    assert tree["status"].tolist() == ["finished", "finished", "failed", "finished"]
+    assert tree["errors"].tolist() == [0, 1, 1, 0]
+    assert tree["subtree_errors"].tolist() == [2, 2, 1, 0]
+
+
+@pytest.mark.parametrize("archive_format", [ArchiveFormat.PARQUET, ArchiveFormat.ARROW])
+def test_signals_are_filtered_by_parent(tmp_path: Path, archive_format: ArchiveFormat) -> None:
+    """The signals of a group are found from its UUID alone, through the job it belongs to."""
+    uuids = archived_job(tmp_path, archive_format)
+    query = SignalsQuery(tmp_path)
+
+    assert query.job_of(uuids["Parse"]) == uuids["job"]
+    assert query.job_of(uuids["job"]) == uuids["job"]
+    assert query.job_of("unknown") is None
+    signals = query.signals(parent_uuid=uuids["Extract"], columns=["level", "message"])
+    assert signals["message"].tolist() == ["Source unavailable.", "Parse started.", "Extract finished."]
+    assert query.signals(parent_uuid="unknown").empty
+
+
+def test_refresh_indexes_added_files_and_forgets_deleted_ones(tmp_path: Path) -> None:
+    """Jobs archived after the query was built are found once refreshed, and jobs whose file was deleted are gone."""
+    first = archived_job(tmp_path, ArchiveFormat.PARQUET)
+    query = SignalsQuery(tmp_path)
+    second = archived_job(tmp_path, ArchiveFormat.ARROW)
+    assert query.job_of(second["Transform"]) is None
+
+    query.refresh()
+    assert query.jobs()["job_uuid"].tolist() == [first["job"], second["job"]]
+    assert query.job_of(second["Transform"]) == second["job"]
+    # the persisted index is reused by a new query
+    assert SignalsQuery(tmp_path).jobs()["job_uuid"].tolist() == [first["job"], second["job"]]
+
+    archive_files(tmp_path)[0].unlink()
+    query.refresh()
+    assert query.jobs()["job_uuid"].tolist() == [second["job"]]
+    assert query.job_of(first["Load"]) is None
+    assert query.signals(job_uuid=first["job"]).empty
@@ -0,0 +1,107 @@
+"""Tests of the routing of signals to named sinks."""
+
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+from loguru import logger
+
+from telemetry import Signals, SignalsConfig, SignalsLevel
+from telemetry.config import SignalsRoute
+from telemetry.logger_handler import LoggerHandler
+from telemetry.routing import RoutingTable
+
+LEVELS = LoggerHandler().level_numbers
+SINKS = ("stdout", "loki", "errors")
+
+
+def record(level: str, group: str = "", **extra: Any) -> Any:
+    """Returns the parts of a loguru record read by the routing filters."""
+    return {"level": SimpleNamespace(no=LEVELS[level]), "extra": {"signal_group_name": group, **extra}}
+
+
+def test_routes_are_compiled_into_level_sets() -> None:
+    """Each sink gets the lowest level routed to it, and its filter accepts exactly the levels of its routes."""
+    table = RoutingTable(
+        (
+            SignalsRoute(sinks=("stdout",), levels=("INFO", "error")),
+            SignalsRoute(sinks=("loki", "stdout"), levels=(SignalsLevel.BUSINESS,)),
+        ),
+        LEVELS,
+        SINKS,
+    )
+    assert table.min_level("stdout") == min(LEVELS["INFO"], LEVELS["BUSINESS"])
+    assert table.min_level("loki") == LEVELS["BUSINESS"]
+    assert table.min_level("errors") is None
+
+    accepts = table.filter("stdout")
+    assert [level for level in LEVELS if accepts(record(level))] == sorted(
+        ("INFO", "ERROR", "BUSINESS"), key=list(LEVELS).index
+    )
+    assert not table.filter("loki")(record("INFO"))
+
+
+def test_levels_routed_without_criteria_skip_the_checks() -> None:
+    """Levels routed unconditionally are always accepted; other levels only pass the checks of their routes."""
+    table = RoutingTable(
+        (
+            SignalsRoute(sinks=("loki",), levels=("WARNING",)),
+            SignalsRoute(sinks=("loki",), levels=("WARNING", "DEBUG"), groups=("Load",)),
+            SignalsRoute(
+                sinks=("loki",), levels=("INFO",), predicate=lambda record: record["extra"].get("rows", 0) > 0
+            ),
+        ),
+        LEVELS,
+        SINKS,
+    )
+    accepts = table.filter("loki")
+    assert accepts(record("WARNING", group="Extract"))
+    assert accepts(record("DEBUG", group="load"))
+    assert not accepts(record("DEBUG", group="Extract"))
+    assert accepts(record("INFO", rows=3))
+    assert not accepts(record("INFO", rows=0))
+    # a route without levels matches every level
+    everything = RoutingTable((SignalsRoute(sinks=("errors",)),), LEVELS, SINKS).filter("errors")
+    assert all(everything(record(level)) for level in LEVELS)
+
+
+@pytest.mark.parametrize(
+    ("route", "error"),
+    [
+        (SignalsRoute(sinks=("stdout", "debug_file")), "unknown sinks \\['debug_file'\\]"),
+        (SignalsRoute(sinks=("stdout",), levels=("VERBOSE",)), "unknown level 'VERBOSE'"),
+    ],
+)
+def test_unknown_sinks_and_levels_are_rejected(route: SignalsRoute, error: str) -> None:
+    """A route naming a sink or a level that does not exist raises a ValueError."""
+    with pytest.raises(ValueError, match=error):
+        RoutingTable((route,), LEVELS, SINKS)
+
+
+def test_routes_only_apply_to_their_instance(tmp_path: Path) -> None:
+    """The routes of an instance neither route the signals of another instance nor filter them out of its sinks."""
+    errors = tmp_path / "errors.log"
+    routed = Signals(
+        SignalsConfig(
+            app_name="routed",
+            environment="test",
+            use_singleton_design_pattern=False,
+            output_format="{message}",
+            file_sinks={"errors": str(errors)},
+            routes=(SignalsRoute(sinks=("errors",), levels=("ERROR",)),),
+        )
+    )
+    other = Signals(SignalsConfig(app_name="other", environment="test", use_singleton_design_pattern=False))
+    messages: list[str] = []
+    other.add_sink(lambda message: messages.append(message.record["message"]), level="INFO")
+    try:
+        routed.error("Routed error.")
+        other.error("Other error.")
+        other.info("Other info.")
+        routed.flush(5)
+    finally:
+        logger.remove()
+
+    assert errors.read_text(encoding="utf-8").splitlines() == ["Routed error."]
+    assert messages == ["Other error.", "Other info."]
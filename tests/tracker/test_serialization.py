@@ -0,0 +1,57 @@
+"""Tests of the serialization of signals for Loki."""
+
+import json
+from typing import TYPE_CHECKING, Any
+
+from loguru import logger
+
+from telemetry import Signals, SignalsConfig
+from telemetry.serialization import RecordSerializer, static_fields
+
+if TYPE_CHECKING:
+    from loguru import Message, Record
+
+
+def capture() -> tuple[Signals, list["Record"]]:
+    """Builds a Signals instance whose records are captured by a sink of the user."""
+    config = SignalsConfig(app_name="test", environment="test", use_singleton_design_pattern=False)
+    signals = Signals(config)
+    records: list[Record] = []
+
+    def sink(message: "Message") -> None:
+        records.append(message.record)
+
+    signals.add_sink(sink, level="INFO", format="{message} {extra}")
+    return signals, records
+
+
+def test_static_fields_are_not_in_extra() -> None:
+    """The fields rendered once for Loki do not show in the extra of records, for instances and views alike."""
+    signals, records = capture()
+    try:
+        signals.info("Instance.")
+        signals.bind(order=1).info("View.", rows=2)
+    finally:
+        logger.remove()
+
+    assert [record["message"] for record in records] == ["Instance.", "View."]
+    for record in records:
+        assert not any(type(value).__name__ == "StaticFields" for value in record["extra"].values())
+        assert "StaticFields" not in str(record["extra"])
+
+
+def test_lines_hold_the_static_fields() -> None:
+    """Loki lines still hold the shared fields, rendered once, and the fields of the view."""
+    signals, records = capture()
+    try:
+        signals.bind(order=1).info("View.", rows=2)
+    finally:
+        logger.remove()
+
+    assert static_fields(records[0]) is not None
+    line: dict[str, Any] = json.loads(RecordSerializer(()).line(records[0]))
+    assert line["app_name"] == "test"
+    assert line["job_uuid"] == signals.job_uuid
+    assert line["order"] == 1
+    assert line["rows"] == 2  # noqa: PLR2004
+    assert "static_fields" not in line
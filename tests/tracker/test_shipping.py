@@ -0,0 +1,88 @@
+"""Tests of the batch shipper."""
+
+import json
+import threading
+import time
+from typing import TYPE_CHECKING, Any
+
+from loguru import logger
+
+from telemetry.shipping import BatchShipper, LokiEncoder
+
+if TYPE_CHECKING:
+    from loguru import Record
+
+FLUSH_INTERVAL = 0.5
+
+
+def test_flush_interval_runs_from_the_oldest_item_left() -> None:
+    """Items left behind by a full batch are not held for a flush interval of their own."""
+    release = threading.Event()
+    shipped: list[tuple[float, list[int]]] = []
+
+    def ship(batch: list[int]) -> None:
+        release.wait()
+        shipped.append((time.monotonic(), batch))
+
+    shipper = BatchShipper(ship, queue_size=100, batch_size=2, flush_interval=FLUSH_INTERVAL)
+    shipper.put(0)
+    shipper.put(1)
+    # the worker holds the first batch while three more items wait past the flush interval
+    for item in range(2, 5):
+        shipper.put(item)
+    time.sleep(FLUSH_INTERVAL * 1.2)
+    released_at = time.monotonic()
+    release.set()
+    deadline = released_at + FLUSH_INTERVAL * 2
+    while len(shipped) < 3 and time.monotonic() < deadline:  # noqa: PLR2004
+        time.sleep(0.005)
+    shipper.stop()
+
+    assert [batch for _, batch in shipped] == [[0, 1], [2, 3], [4]]
+    assert shipped[-1][0] - released_at < FLUSH_INTERVAL / 2
+
+
+def loki_records(*fields: dict[str, Any]) -> list["Record"]:
+    """Returns the loguru records of signals logged with the given fields."""
+    records: list[Record] = []
+    sink_id = logger.add(lambda message: records.append(message.record), format="{message}")
+    try:
+        for index, extra in enumerate(fields):
+            logger.bind(**extra).info(f"Line {index}.")
+    finally:
+        logger.remove(sink_id)
+    return records
+
+
+def test_label_values_beyond_the_cap_overflow() -> None:
+    """A label keeps its first values, in every batch, and the next ones share the overflow stream."""
+    encoder = LokiEncoder({"application": "test"}, ("table", "region"), max_label_values=2)
+    first = loki_records(
+        {"table": "orders", "region": "eu"},
+        {"table": "customers", "region": "eu"},
+        {"table": "invoices", "region": "eu"},
+        {"region": "us"},
+    )
+    second = loki_records({"table": "orders", "region": "eu"}, {"table": "payments", "region": "ap"})
+
+    streams = [
+        {json.loads(line)["message"]: stream["stream"] for stream in payload["streams"] for _, line in stream["values"]}
+        for payload in (json.loads(encoder.encode(first)), json.loads(encoder.encode(second)))
+    ]
+    overflow = LokiEncoder.OVERFLOW_LABEL_VALUE
+    assert overflow == "__overflow__"
+    assert streams[0] == {
+        "Line 0.": {"application": "test", "table": "orders", "region": "eu"},
+        "Line 1.": {"application": "test", "table": "customers", "region": "eu"},
+        "Line 2.": {"application": "test", "table": overflow, "region": "eu"},
+        "Line 3.": {"application": "test", "region": "us"},
+    }
+    assert streams[1] == {
+        "Line 0.": {"application": "test", "table": "orders", "region": "eu"},
+        "Line 1.": {"application": "test", "table": overflow, "region": overflow},
+    }
+    # the lines keep the actual values
+    lines = [
+        json.loads(line) for stream in json.loads(encoder.encode(second))["streams"] for _, line in stream["values"]
+    ]
+    assert {(line["table"], line["region"]) for line in lines} == {("orders", "eu"), ("payments", "ap")}
@@ -0,0 +1,65 @@
+"""Tests of Signals instances sharing the loguru logger."""
+
+from typing import TYPE_CHECKING
+
+import pytest
+from loguru import logger
+
+from telemetry import Signals, SignalsConfig
+from telemetry.serialization import static_fields
+
+if TYPE_CHECKING:
+    from loguru import Record
+
+
+def test_instances_only_reach_their_own_sinks(capsys: pytest.CaptureFixture[str]) -> None:
+    """Each instance prints its signals once, and sinks added by an instance never see the records of another."""
+    first = Signals(SignalsConfig(app_name="first", environment="test", use_singleton_design_pattern=False))
+    second = Signals(
+        SignalsConfig(
+            app_name="second", environment="prod", use_singleton_design_pattern=False, output_format="{message}"
+        )
+    )
+    records: dict[str, list[Record]] = {"first": [], "second": []}
+    try:
+        first.add_sink(lambda message: records["first"].append(message.record), level="INFO")
+        second.add_sink(lambda message: records["second"].append(message.record), level="INFO")
+        first.bind(order=1).info("From the first.")
+        second.info("From the second.")
+        logger.info("From loguru.")
+    finally:
+        logger.remove()
+
+    assert [record["message"] for record in records["first"]] == ["From the first."]
+    assert [record["message"] for record in records["second"]] == ["From the second."]
+    output = capsys.readouterr().out
+    assert output.count("From the first.") == 1
+    assert output.count("From the second.") == 1
+    assert "From loguru." not in output
+
+
+def test_bound_fields_reach_the_records_of_the_view_only() -> None:
+    """A view adds its fields to its signals, views of views merge them, and the instance is left unchanged."""
+    signals = Signals(SignalsConfig(app_name="test", environment="test", use_singleton_design_pattern=False))
+    records: list[Record] = []
+    signals.add_sink(lambda message: records.append(message.record), level="INFO")
+    try:
+        orders = signals.bind(table="orders", batch=1)
+        orders.info("View.")
+        orders.bind(batch=2).info("View of the view.")
+        orders.info("Call fields win.", table="customers")
+        signals.info("Instance.")
+    finally:
+        logger.remove()
+
+    extra = {record["message"]: record["extra"] for record in records}
+    assert (extra["View."]["table"], extra["View."]["batch"]) == ("orders", 1)
+    assert (extra["View of the view."]["table"], extra["View of the view."]["batch"]) == ("orders", 2)
+    assert extra["Call fields win."]["table"] == "customers"
+    assert "table" not in extra["Instance."]
+    assert "batch" not in extra["Instance."]
+    assert extra["View."]["job_uuid"] == extra["Instance."]["job_uuid"] == signals.job_uuid
+    assert signals._bound_fields == {}  # noqa: SLF001
+    shared = {record["message"]: getattr(static_fields(record), "fields", None) for record in records}
+    assert shared["View."] == {"app_name": "test", "job_uuid": signals.job_uuid, "table": "orders", "batch": 1}
+    assert shared["Instance."] == {"app_name": "test", "job_uuid": signals.job_uuid}
@@ -0,0 +1,216 @@
+"""Tests of the write-ahead spool and of its replayer."""
+
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from telemetry.enums import FsyncPolicy
+from telemetry.shipping import LokiShipper
+from telemetry.spool import Spool, SpoolReplayer, read_spool
+
+QUEUE_OPTIONS = {"queue_size": 10, "batch_size": 10, "flush_interval": 0.1}
+
+
+def drain(spool: Spool) -> list[bytes]:
+    """Reads and acknowledges every pending entry of a spool."""
+    payloads: list[bytes] = []
+    while (entry := spool.peek()) is not None:
+        position, payload = entry
+        payloads.append(payload)
+        spool.ack(position)
+    return payloads
+
+
+def segments(directory: Path) -> list[Path]:
+    """Returns the segment files of a spool directory, oldest first."""
+    return sorted(directory.glob("*.spool"))
+
+
+@pytest.mark.parametrize("use_mmap", [False, True])
+def test_entries_survive_a_crash(tmp_path: Path, use_mmap: bool) -> None:  # noqa: FBT001
+    """Entries appended by a process that never closed its spool are replayed by the next one."""
+    crashed = Spool(tmp_path, use_mmap=use_mmap, fsync_policy=FsyncPolicy.NEVER)
+    for index in range(5):
+        crashed.append(f"batch {index}".encode())
+    # the process dies here: the spool is neither closed nor sealed
+    del crashed
+
+    spool = Spool(tmp_path, use_mmap=use_mmap)
+    assert spool.pending == 5  # noqa: PLR2004
+    assert drain(spool) == [f"batch {index}".encode() for index in range(5)]
+    spool.close()
+
+
+def test_cursor_persists_acknowledgements(tmp_path: Path) -> None:
+    """Entries acknowledged before a restart are not replayed."""
+    spool = Spool(tmp_path)
+    for index in range(5):
+        spool.append(f"batch {index}".encode())
+    for _ in range(2):
+        entry = spool.peek()
+        assert entry is not None
+        spool.ack(entry[0])
+    spool.close()
+
+    assert list(read_spool(tmp_path)) == [b"batch 2", b"batch 3", b"batch 4"]
+    reopened = Spool(tmp_path)
+    assert reopened.pending == 3  # noqa: PLR2004
+    assert drain(reopened) == [b"batch 2", b"batch 3", b"batch 4"]
+    reopened.close()
+    assert Spool(tmp_path).pending == 0
+
+
+def test_torn_tail_is_truncated(tmp_path: Path) -> None:
+    """An entry cut short by a crash is dropped, and the segment is truncated to its last whole entry."""
+    spool = Spool(tmp_path)
+    for index in range(3):
+        spool.append(f"batch {index}".encode())
+    spool.close()
+    (segment,) = segments(tmp_path)
+    whole = segment.stat().st_size
+    with segment.open("r+b") as file:
+        file.truncate(whole - 3)
+
+    reopened = Spool(tmp_path)
+    assert segment.stat().st_size == whole - len(b"batch 2") - 8
+    assert drain(reopened) == [b"batch 0", b"batch 1"]
+    reopened.close()
+
+
+def test_checksum_rejects_corrupted_entries(tmp_path: Path) -> None:
+    """An entry failing its crc32 ends its segment: the entries after it cannot be located and are dropped."""
+    spool = Spool(tmp_path, segment_size=64)
+    for index in range(6):
+        spool.append(f"batch {index}".encode())
+    spool.close()
+    first = segments(tmp_path)[0]
+    data = bytearray(first.read_bytes())
+    # the payload of the first entry starts after its 8 bytes header
+    data[8] ^= 0xFF
+    first.write_bytes(bytes(data))
+
+    reopened = Spool(tmp_path, segment_size=64)
+    replayed = drain(reopened)
+    assert replayed
+    assert b"batch 0" not in replayed
+    assert replayed == sorted(replayed)
+    assert replayed[-1] == b"batch 5"
+    reopened.close()
+
+
+def test_checksum_is_checked_when_reading(tmp_path: Path) -> None:
+    """A sealed segment corrupted while the spool is open is skipped and its entries counted as dropped."""
+    spool = Spool(tmp_path, segment_size=40)
+    for index in range(4):
+        spool.append(f"batch {index}".encode())
+    first = segments(tmp_path)[0]
+    data = bytearray(first.read_bytes())
+    data[-1] ^= 0xFF
+    first.write_bytes(bytes(data))
+
+    replayed = drain(spool)
+    assert spool.dropped >= 1
+    assert replayed[-1] == b"batch 3"
+    assert len(replayed) + spool.dropped == 4  # noqa: PLR2004
+    spool.close()
+
+
+def test_max_bytes_drops_the_oldest_segments(tmp_path: Path) -> None:
+    """Beyond its maximum size, the spool drops its oldest entries and keeps the newest ones."""
+    spool = Spool(tmp_path, segment_size=100, max_bytes=300)
+    payloads = [f"batch {index:04d}".encode() for index in range(100)]
+    for payload in payloads:
+        spool.append(payload)
+
+    assert spool.dropped > 0
+    assert sum(path.stat().st_size for path in segments(tmp_path)) <= 300 + 100  # noqa: PLR2004
+    replayed = drain(spool)
+    assert len(replayed) + spool.dropped == len(payloads)
+    assert replayed == payloads[-len(replayed) :]
+    spool.close()
+
+
+def test_replayer_backs_off_and_replays_in_order(tmp_path: Path) -> None:
+    """Failed deliveries are retried with a growing delay, and the backlog is then replayed in order."""
+    spool = Spool(tmp_path)
+    for index in range(3):
+        spool.append(f"batch {index}".encode())
+    attempts: list[float] = []
+    delivered: list[bytes] = []
+
+    def send(payload: bytes) -> None:
+        attempts.append(time.monotonic())
+        if len(attempts) <= 3:  # noqa: PLR2004
+            msg = "Loki is unavailable."
+            raise ConnectionError(msg)
+        delivered.append(payload)
+
+    replayer = SpoolReplayer(spool, send, rate=1_000, retry_delay=0.05, max_retry_delay=1.0)
+    assert replayer.wait_idle(5)
+    replayer.stop()
+    spool.close()
+
+    assert delivered == [b"batch 0", b"batch 1", b"batch 2"]
+    assert replayer.failed == 3  # noqa: PLR2004
+    assert isinstance(replayer.last_error, ConnectionError)
+    delays = [later - earlier for earlier, later in zip(attempts, attempts[1:4], strict=False)]
+    assert delays[0] >= 0.05  # noqa: PLR2004
+    assert delays[1] >= 0.1  # noqa: PLR2004
+    assert delays[2] >= 0.2  # noqa: PLR2004
+
+
+def test_backlog_replay_is_rate_limited(tmp_path: Path) -> None:
+    """A backlog left by a previous process is replayed at no more than `rate` entries per second."""
+    spool = Spool(tmp_path)
+    for index in range(5):
+        spool.append(f"batch {index}".encode())
+    sent_at: list[float] = []
+    replayer = SpoolReplayer(spool, lambda _: sent_at.append(time.monotonic()), rate=20)
+    assert replayer.recovering
+    assert replayer.wait_idle(5)
+    replayer.stop()
+    spool.close()
+
+    assert len(sent_at) == 5  # noqa: PLR2004
+    assert sent_at[-1] - sent_at[0] >= 4 * 0.05 * 0.9
+
+
+class StalledLokiShipper(LokiShipper):
+    """Loki shipper whose pushes wait for the test to release them."""
+
+    release = threading.Event()
+
+    def _send(self, payload: bytes) -> None:  # noqa: ARG002
+        """Waits for the release instead of pushing."""
+        self.release.wait()
+
+
+def test_spool_is_closed_once_the_replayer_has_exited(tmp_path: Path) -> None:
+    """Stopping the shipper leaves the spool open while a push is still in progress."""
+    spool = Spool(tmp_path)
+    spool.append(b"batch 0")
+    closed: list[bool] = []
+    close = spool.close
+    spool.close = lambda: closed.append(True)  # type: ignore[method-assign]
+
+    shipper = StalledLokiShipper("http://127.0.0.1:1/loki/api/v1/push", {}, (), spool=spool, **QUEUE_OPTIONS)
+    shipper.stop(timeout=0.1)
+    assert not closed
+
+    StalledLokiShipper.release.set()
+    assert shipper.replayer is not None
+    assert shipper.replayer.stop(timeout=5)
+    close()
+    assert Spool(tmp_path).pending == 0
+
+
+def test_spool_is_closed_when_the_shipper_stops(tmp_path: Path) -> None:
+    """Stopping an idle shipper closes its spool."""
+    spool = Spool(tmp_path)
+    closed: list[bool] = []
+    spool.close = lambda: closed.append(True)  # type: ignore[method-assign]
+    shipper = LokiShipper("http://127.0.0.1:1/loki/api/v1/push", {}, (), spool=spool, **QUEUE_OPTIONS)
+    shipper.stop(timeout=5)
+    assert closed == [True]
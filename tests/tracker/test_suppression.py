@@ -0,0 +1,69 @@
+"""Tests of the suppression of log storms."""
+
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+from telemetry.suppression import Repeats, SignalSuppressor, message_template
+
+SOURCE_DIRECTORY = Path(__file__).parents[2] / "src"
+
+
+def test_contexts_have_windows_of_their_own() -> None:
+    """Identical signals emitted in different groups are not repeats of each other."""
+    repeats: list[Repeats] = []
+    suppressor = SignalSuppressor(repeats.append, window=60)
+    for context in ("group-1", "group-2"):
+        assert suppressor.admit("WARNING", "Disk slow.", {}, context) is not None
+        assert suppressor.admit("WARNING", "Disk slow.", {}, context) is None
+    suppressor.flush()
+    assert [(repeat.context, repeat.repeat_count) for repeat in repeats] == [("group-1", 1), ("group-2", 1)]
+
+
+def test_messages_differing_by_their_arguments_share_a_rate_limit() -> None:
+    """Formatted messages of the same template are rate limited together, and other templates keep their own bucket."""
+    suppressor = SignalSuppressor(lambda _: None, rate=0.001, burst=5)
+    admitted = [suppressor.admit("WARNING", f"Order {order} failed: '{order:x}'.", {}) for order in range(100)]
+    assert sum(fields is not None for fields in admitted) == 5  # noqa: PLR2004
+    assert suppressor.rate_limited == 95  # noqa: PLR2004
+    assert suppressor.admit("WARNING", "Disk slow.", {}) is not None
+    assert suppressor.admit("ERROR", "Order 7 failed: '7'.", {}) is not None
+
+
+def test_templates_mask_values_and_identifiers() -> None:
+    """Quoted values and words holding a digit are masked; the other words are kept."""
+    assert message_template("Order 1042 failed after 3.5 s: 'timeout'.") == "Order <*> failed after <*> s: <*>."
+    assert message_template("Job 0190a3f2-7c1e-7d4b-9a55-3e2f1c0b9d8e started.") == "Job <*> started."
+    assert message_template("Disk slow.") == "Disk slow."
+
+def test_open_windows_are_emitted_at_exit(tmp_path: Path) -> None:
+    """The repeats of a window still open when the process exits are emitted, and shipped, before it ends."""
+    output = tmp_path / "signals.log"
+    script = textwrap.dedent(
+        f"""
+        from telemetry import Signals, SignalsConfig
+
+        config = SignalsConfig(
+            app_name="test",
+            environment="test",
+            use_singleton_design_pattern=False,
+            output_format="{{message}} {{extra}}",
+            suppression_window=5,
+            file_sinks={{"file": {str(output)!r}}},
+        )
+        signals = Signals(config)
+        for _ in range(100):
+            signals.warning("Disk slow.")
+        """
+    )
+    subprocess.run(
+        [sys.executable, "-c", script],
+        check=True,
+        capture_output=True,
+        env={"PYTHONPATH": str(SOURCE_DIRECTORY)},
+        timeout=60,
+    )
+    lines = [line for line in output.read_text().splitlines() if line.startswith("Disk slow.")]
+    assert len(lines) == 2  # noqa: PLR2004
+    assert "'repeat_count': 99" in lines[1]